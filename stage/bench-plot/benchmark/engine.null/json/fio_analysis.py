@@ -1,13 +1,52 @@
 import json
 import glob
+import sys
 import numpy as np
 
+# Bytes read per slice while streaming a log
+FIO_JSON_CHUNK = 1 << 20
+
+def iter_fio_json(filepath, chunk_size=FIO_JSON_CHUNK):
+    """
+    Stream each JSON document out of a FIO log, one at a time.
+    Runs with --status-interval write many concatenated documents into one file,
+    so only the document being decoded is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    eof = False
+    with open(filepath, 'r') as f:
+        while True:
+            start = buf.find('{', pos)
+            if start < 0:
+                buf, pos = '', 0
+            else:
+                try:
+                    doc, pos = decoder.raw_decode(buf, start)
+                except ValueError:
+                    # Document still incomplete, keep it and read more
+                    buf, pos = buf[start:], 0
+                else:
+                    yield doc
+                    continue
+            if eof:
+                break
+            chunk = f.read(max(chunk_size, len(buf)))
+            eof = not chunk
+            buf += chunk
+
+    if buf[pos:].strip():
+        print(f"Warning: truncated JSON at end of {filepath}, ignoring it.", file=sys.stderr)
+
 def load_fio_json(filepath):
     """
     Load a single FIO JSON file.
+    For multi-document (--status-interval) logs the final summary is returned.
     """
-    with open(filepath, 'r') as f:
-        data = json.load(f)
+    data = {}
+    for data in iter_fio_json(filepath):
+        pass
     return data
 
 def extract_job_metrics(job):
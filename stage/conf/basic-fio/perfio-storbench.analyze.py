@@ -12,9 +12,12 @@
 [───────────────────────────────────────────────────────────────────────────────]
 [ Requires
 [ ╰───────────» python3
-[           ╰─» jinja2
+[           ╰─» jinja2 (--report-html report)
 [           ╰─» jinja2-cli
 [           ╰─» numpy
+[           ╰─» orjson (optional, faster JSON decode)
+[           ╰─» matplotlib (optional, --plot charts)
+[           ╰─» weasyprint (optional, --pdf report)
 [───────────────────────────────────────────────────────────────────────────────]
 [ References
 [ ╰───────────» ⌄unten⌄
@@ -25,15 +28,25 @@
 [───────────────────────────────────────────────────────────────────────────────]
 '''
 # Erforderlich Modules
+# numpy is needed everywhere; the pool, sqlite3, jinja2 & ctypes are imported by the
+# functions that use them so --help, --ss or an interval summary start quickly
 import argparse
-import jinja2
+import contextlib
+import fnmatch
+import functools
 import os
-import psutil
-import shutil
-import subprocess
+import signal
 import sys
 import json
 import glob
+import hashlib
+import math
+import mmap
+import re
+import select
+import struct
+import time
+import zlib
 import numpy as np
 
 # Validate src-layout import adjustment
@@ -46,83 +59,2751 @@ if not __package__:
     package_source_path = os.path.dirname(os.path.dirname(__file__))
     sys.path.insert(0, package_source_path)
 
+# Optional faster JSON backend, stdlib json is the fallback
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+_json_decoder = json.JSONDecoder()
+
+# Bytes per read when streaming fio logs, `--status-interval` output holds many docs
+FIO_JSON_CHUNK = 1 << 20
+
+# Store metric -> (direction, key path under it), what extract_job_metrics() reads
+FIO_JOB_METRICS = (
+    ('read_io_bytes', 'read', ('io_bytes',)),
+    ('read_bw', 'read', ('bw',)),
+    ('read_iops', 'read', ('iops',)),
+    ('read_latency_mean', 'read', ('lat_ns', 'mean')),
+    ('read_latency_stddev', 'read', ('lat_ns', 'stddev')),
+    ('clat_mean', 'read', ('clat_ns', 'mean')),
+    ('clat_stddev', 'read', ('clat_ns', 'stddev')),
+    ('read_clat_p99', 'read', ('clat_ns', 'percentile', '99.000000')),
+    ('write_io_bytes', 'write', ('io_bytes',)),
+    ('write_bw', 'write', ('bw',)),
+    ('write_iops', 'write', ('iops',)),
+    ('write_clat_p99', 'write', ('clat_ns', 'percentile', '99.000000')),
+)
+# Key paths extract_job_histograms() reads, per direction
+FIO_HIST_PATHS = (
+    ('clat_ns', 'bins'),
+    ('clat_ns', 'percentile'),
+    ('clat_ns', 'N'),
+    ('clat_ns', 'max'),
+    ('total_ios',),
+)
+
+
+def _fio_fields(paths):
+    """
+    PROC: nested projection (see _project()) keeping just the given key paths
+    RET: dict
+    """
+    fields = {}
+    for path in paths:
+        node = fields
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+            if node is None:
+                # a shorter path already keeps the whole subtree
+                break
+        else:
+            node[path[-1]] = None
+    return fields
+
+
+# Fields kept from each snapshot while streaming, None == keep the whole subtree; derived
+# from the extractors' paths so nothing they read is dropped on read
+FIO_DIR_FIELDS = _fio_fields([path for _, _, path in FIO_JOB_METRICS] + list(FIO_HIST_PATHS))
+FIO_JOB_FIELDS = {
+    'jobname': None,
+    'job options': None,
+    'read': FIO_DIR_FIELDS,
+    'write': FIO_DIR_FIELDS,
+}
+FIO_SNAPSHOT_FIELDS = {
+    'fio version': None,
+    'timestamp_ms': None,
+    'global options': None,
+    'jobs': FIO_JOB_FIELDS,
+}
+
+
+# Metrics rolled up across files & jobs by process_fio_logs()
+AGGREGATE_METRICS = (
+    'read_bw',
+    'read_iops',
+    'read_latency_mean',
+    'read_latency_stddev',
+    'write_bw',
+    'write_iops',
+)
+
+# Batches queued per pool worker, >1 evens out uneven file sizes
+INGEST_BATCHES_PER_WORKER = 4
+
+# Columnar metric store, one row per fio job: dimensions first, then metrics
+STORE_DIMS = (
+    ('run', 'U32'),           # parent dir, eg: log.run1 or 4k
+    ('file', 'U64'),          # log basename
+    ('host', 'U32'),
+    ('target', 'U64'),        # filename/directory the job did I/O against
+    ('jobname', 'U40'),
+    ('job', 'i4'),            # job index inside the snapshot
+    ('mode', 'U12'),          # rw / readwrite
+    ('ioengine', 'U16'),
+    ('bs', 'i8'),             # bytes
+    ('iodepth', 'i4'),
+    ('numjobs', 'i4'),
+    ('timestamp_ms', 'i8'),
+)
+STORE_METRICS = (
+    'read_io_bytes',
+    'read_bw',
+    'read_iops',
+    'read_latency_mean',
+    'read_latency_stddev',
+    'clat_mean',
+    'clat_stddev',
+    'read_clat_p99',
+    'write_io_bytes',
+    'write_bw',
+    'write_iops',
+    'write_clat_p99',
+)
+
+# Log-bucketed clat histogram per job & direction, LAT_HIST_SUB buckets per power of two
+# ns, so ~4% value resolution up to 2^36 ns (~68 s), anything slower lands in the top bucket
+LAT_HIST_SUB = 8
+LAT_HIST_OCTAVES = 36
+LAT_HIST_BUCKETS = LAT_HIST_SUB * LAT_HIST_OCTAVES
+# Geometric middle of each bucket, what a percentile reports
+LAT_HIST_VALUES = 2.0 ** ((np.arange(LAT_HIST_BUCKETS) + 0.5) / LAT_HIST_SUB)
+LAT_PERCENTILES = (50.0, 90.0, 99.0, 99.9, 99.99)
+STORE_HISTS = (
+    'read_lat_hist',
+    'write_lat_hist',
+)
+
+STORE_DTYPE = np.dtype(list(STORE_DIMS)
+                       + [(metric, 'f8') for metric in STORE_METRICS]
+                       + [(hist, 'f4', (LAT_HIST_BUCKETS,)) for hist in STORE_HISTS])
+# Fixed width text dims as (row index, name, chars), numpy cuts longer values w/o a word
+STORE_TEXT_DIMS = tuple((i, dim, STORE_DTYPE[dim].itemsize // 4)
+                        for i, (dim, kind) in enumerate(STORE_DIMS) if kind.startswith('U'))
+
+# Naming used by the batch script & bench-fio, fills dims the job options don't carry
+FIO_BATCH_LOG_RE = re.compile(r'^perfio\.(?P<host>.+)\.(?P<jobname>[^.]+)\.log\.json$')
+FIO_BENCH_LOG_RE = re.compile(r'^(?P<mode>[a-z]+)-(?P<iodepth>\d+)-(?P<numjobs>\d+)\.json$')
+FIO_SIZE_RE = re.compile(r'^(?P<num>\d+)(?P<unit>[kmgtp]?)(i?b)?$', re.IGNORECASE)
+FIO_SIZE_UNITS = {'': 0, 'k': 10, 'm': 20, 'g': 30, 't': 40, 'p': 50}
+
+# Parse cache, extracted rows keyed by log content sha256 (same as the Git LFS oid)
+PARSE_CACHE_FILE = 'parse-cache.sqlite'
+PARSE_CACHE_MAX_BYTES = 256 << 20
+# Entries are tagged w/ the store layout, adding a column invalidates old entries by itself
+PARSE_CACHE_SCHEMA = hashlib.sha256(str(STORE_DTYPE.descr).encode()).hexdigest()[:16]
+# Keeps IN (...) lists under sqlite's bound-parameter limit
+PARSE_CACHE_QUERY_CHUNK = 500
+
+# Results database, plain ANSI SQL (no upserts, no sqlite-only types) so the same
+# statements run against a columnar server later, only the connect differs
+RESULTS_DB_BATCH = 10000
+RESULTS_DB_CONFIG_DIMS = ('jobname', 'mode', 'ioengine', 'bs', 'iodepth', 'numjobs')
+RESULTS_DB_SQL_TYPES = {'U': 'VARCHAR(255)', 'i': 'BIGINT', 'f': 'DOUBLE PRECISION'}
+RESULTS_DB_AGGS = ('avg', 'min', 'max', 'sum', 'count')
+RESULTS_DB_BUCKETS = {'hour': 3600000, 'day': 86400000, 'week': 604800000}
+
+# Regression gating: per metric class, which way is worse & the least relative change
+# of the median that counts, so bytes/s, iops & ns are no longer held to one number
+REGRESS_CLASSES = {
+    'throughput': {'higher_better': True, 'min_change': 0.05},
+    'latency': {'higher_better': False, 'min_change': 0.10},
+    'variability': {'higher_better': False, 'min_change': 0.25},
+}
+REGRESS_METRIC_CLASS = {
+    'read_bw': 'throughput',
+    'read_iops': 'throughput',
+    'write_bw': 'throughput',
+    'write_iops': 'throughput',
+    'read_latency_mean': 'latency',
+    'clat_mean': 'latency',
+    'read_clat_p99': 'latency',
+    'write_clat_p99': 'latency',
+    'read_latency_stddev': 'variability',
+    'clat_stddev': 'variability',
+}
+REGRESS_ALPHA = 0.05
+# |Cliff's delta| below this is a negligible effect whatever the p-value says
+REGRESS_MIN_EFFECT = 0.147
+REGRESS_BOOTSTRAP = 2000
+REGRESS_CI = 95.0
+# Bootstrap draws held in memory at once, cells are chunked to stay under it
+REGRESS_BOOT_ELEMS = 1 << 23
+REGRESS_SEED = 20241110
+REGRESS_VERDICTS = ('regression', 'improvement', 'ok', 'insufficient')
+# Default --by cell for --query & friends, & for the --baseline gate; a nightly over many
+# hosts mustn't pool different devices into one gate cell
+QUERY_BY = ('mode', 'bs', 'iodepth', 'numjobs')
+REGRESS_BY = ('target', 'mode', 'bs', 'iodepth', 'numjobs')
+
+# fio write_{bw,lat,iops}_log rows: time (msec), value, data direction, block size, offset[, prio]
+INTERVAL_LOG_FIELDS = (
+    ('t_ms', 'u8'),
+    ('value', 'u8'),
+    ('ddir', 'u1'),
+    ('bs', 'u4'),
+    ('offset', 'u8'),
+    ('prio', 'u4'),
+)
+INTERVAL_LOG_INDEX = {name: i for i, (name, _) in enumerate(INTERVAL_LOG_FIELDS)}
+# Columns kept by default, all a bw/lat/iops plot or steady-state check needs
+INTERVAL_LOG_COLUMNS = ('t_ms', 'value', 'ddir')
+# Bytes of log text parsed per step, the working set is ~2x this per worker
+INTERVAL_LOG_CHUNK = 32 << 20
+# Steady-state checks, same spec syntax as fio's ss= option (eg: bw_slope:1%, iops:10%)
+SS_SPEC = 'bw_slope:1%'
+SS_DUR_S = 10
+SS_RAMP_S = 5
+# Sample period series are resampled to, fio evaluates ss once a second too
+SS_PERIOD_MS = 1000
+# Only what snapshot_series() needs from each --status-interval snapshot
+SS_DIR_FIELDS = {'io_bytes': None, 'total_ios': None, 'lat_ns': {'mean': None}}
+SS_SNAPSHOT_FIELDS = {'timestamp_ms': None, 'jobs': {'read': SS_DIR_FIELDS, 'write': SS_DIR_FIELDS}}
+SS_RESULT_DTYPE = np.dtype([
+    ('source', 'U64'),
+    ('converged', '?'),
+    ('samples', 'i8'),
+    ('runtime_s', 'f8'),
+    ('ss_start_s', 'f8'),
+    ('sufficient_s', 'f8'),
+    ('mean', 'f8'),
+    ('stddev', 'f8'),
+    ('min', 'f8'),
+    ('max', 'f8'),
+])
+
+INTERVAL_SUMMARY_DTYPE = np.dtype([
+    ('t_ms', 'u8'),
+    ('count', 'u4'),
+    ('min', 'f8'),
+    ('max', 'f8'),
+    ('mean', 'f8'),
+])
+
+# Charts drawn straight from the store, matplotlib (optional) is only imported by the renderer
+PLOT_KINDS = ('qd2d', 'surface3d', 'latency')
+PLOT_OUT = 'output.plots'
+PLOT_MANIFEST = '.plot-manifest.json'
+# w/o a read_/write_ prefix the direction follows each chart's mode, mixed modes chart reads
+PLOT_METRIC = 'iops'
+PLOT_LAT_METRIC = 'clat_p99'
+PLOT_WRITE_MODES = ('write', 'randwrite', 'trimwrite')
+# Time buckets per latency-over-time chart
+PLOT_POINTS = 1000
+PLOT_SIZE_IN = (12, 6)
+PLOT_DPI = 100
+# Bump when the drawing code changes, every chart's hash changes w/ it
+PLOT_VERSION = 1
+# Charts queued per pool worker, same idea as INGEST_BATCHES_PER_WORKER
+PLOT_BATCHES_PER_WORKER = 4
+PLOT_LOG_UNITS = {'clat': 'clat (ns)', 'slat': 'slat (ns)', 'lat': 'lat (ns)', 'bw': 'bw (KiB/s)', 'iops': 'IOPS'}
+PLOT_LOG_RE = re.compile(r'_(?P<kind>clat|slat|lat|bw|iops)\.')
+
+# Incremental HTML/PDF report, one section per host & target, rebuilt only when its inputs change
+REPORT_OUT = 'report'
+REPORT_MANIFEST = '.report-manifest.json'
+REPORT_TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT_PAGE_J2 = 'perfio-storbench.report.html.j2'
+REPORT_SECTION_J2 = 'perfio-storbench.report-section.html.j2'
+REPORT_SECTION_BY = ('host', 'target')
+REPORT_WORKLOAD_BY = ('mode', 'bs')
+REPORT_CELL_BY = ('iodepth', 'numjobs')
+REPORT_METRICS = ('read_iops', 'read_bw', 'read_clat_p99', 'write_iops', 'write_bw', 'write_clat_p99')
+REPORT_CHARTS = ('qd2d', 'surface3d')
+REPORT_VERDICT_COLUMNS = ('mode', 'bs', 'iodepth', 'numjobs', 'metric', 'base_median', 'cand_median',
+                          'change_pct', 'p_value', 'verdict')
+
+# Run-to-run diff: every run is aligned to the first on these dims, ioengine is left
+# out so an engine swap still lines up (& shows in the options diff)
+DIFF_KEYS = ('host', 'target', 'jobname', 'job', 'mode', 'bs', 'iodepth', 'numjobs')
+# Tail percentiles of the merged clat histograms, diffed alongside STORE_METRICS
+DIFF_PERCENTILES = (50.0, 99.0, 99.9)
+DIFF_OPTION_FIELDS = {'global options': None, 'jobs': {'jobname': None, 'job options': None}}
+# Per-run output paths, always differ & say nothing about the workload
+DIFF_IGNORE_OPTIONS = ('output', 'write_bw_log', 'write_lat_log', 'write_iops_log', 'write_hist_log')
+DIFF_OPTION_DTYPE = np.dtype([
+    ('run', 'U64'),
+    ('file', 'U128'),
+    ('jobname', 'U40'),
+    ('option', 'U32'),
+    ('base', 'U64'),
+    ('cand', 'U64'),
+])
+DIFF_TOP = 50
+
+# Columnar run archive: per table & column, zlib'd chunks of ARCHIVE_CHUNK_ROWS rows, byte
+# shuffled first so like bytes of neighbouring values sit together, json index in the footer
+#   PIOARC01 | chunk ... chunk | index json | u64 index length | PIOARC01
+ARCHIVE_MAGIC = b'PIOARC01'
+ARCHIVE_EXT = '.pioa'
+ARCHIVE_FORMAT = 1
+ARCHIVE_LEVEL = 6
+ARCHIVE_CHUNK_ROWS = {'store': 4096, 'interval': 1 << 20}
+# Stored as the difference to the previous row (per chunk), time stamps shrink to a few bits
+ARCHIVE_DELTA_COLUMNS = ('t_ms',)
+ARCHIVE_INTERVAL_DTYPE = np.dtype([('source', 'u2')] + [(name, dict(INTERVAL_LOG_FIELDS)[name])
+                                                       for name in INTERVAL_LOG_COLUMNS])
+ARCHIVE_LOG_RE = re.compile(r'_(clat|slat|lat|bw|iops)\.\d+\.log$')
+
+# Watch mode: logs are folded into running aggregates per WATCH_BY group as they land
+WATCH_BY = ('host', 'target', 'mode', 'bs', 'iodepth', 'numjobs')
+WATCH_PATTERN = '*.json'
+# Polling fallback period
+WATCH_POLL_S = 2.0
+# fio rewrites its log every --status-interval (5s in batch.sh) until it exits & closes it; w/o
+# that close event (polling, logs already there at start) a log counts as finished once untouched this long
+WATCH_SETTLE_S = 15.0
+# linux/inotify.h, struct inotify_event is wd, mask, cookie, len then the name
+WATCH_IN_CLOSE_WRITE = 0x00000008
+WATCH_IN_MOVED_TO = 0x00000080
+WATCH_IN_EVENT = struct.Struct('iIII')
+WATCH_IN_READ = 64 << 10
+
+# Tracing & profiling (--trace, --profile), off by default; a disabled span costs one global check
+TRACE_OUT = 'perfio-storbench.trace.json'
+# SIGPROF sampling rate, ITIMER_PROF counts cpu time so idle waits never show as samples
+TRACE_PROFILE_HZ = 97
+TRACE_PROFILE_DEPTH = 64
+# Rows in the slowest files & hottest frames tables
+TRACE_TOP = 15
+TRACE_SUMMARY_DTYPE = np.dtype([
+    ('span', 'U40'), ('cat', 'U8'), ('count', np.int64), ('total_ms', np.float64),
+    ('mean_ms', np.float64), ('max_ms', np.float64), ('pct', np.float64), ('mb', np.float64),
+    ('mb_s', np.float64), ('alloc_blocks', np.int64),
+])
+TRACE_FILE_DTYPE = np.dtype([
+    ('file', 'U160'), ('ms', np.float64), ('mb', np.float64), ('jobs', np.int64), ('alloc_blocks', np.int64),
+])
+TRACE_FRAME_DTYPE = np.dtype([('frame', 'U96'), ('self', np.int64), ('total', np.int64), ('pct', np.float64)])
+
+# Set by trace_start(): t0, span events & stack sample counts, None == tracing off
+_TRACE = None
+_TRACE_OFF = contextlib.nullcontext()
+
+
+def trace_start(profile_hz=None):
+    """
+    PROC: start recording spans, w/ profile_hz also sample the python stack on SIGPROF
+    RET: None
+    """
+    global _TRACE
+    _TRACE = {'t0': time.perf_counter_ns(), 'pid': os.getpid(), 'events': [], 'samples': {},
+              'profile_hz': profile_hz}
+    if profile_hz:
+        # Pool workers don't inherit the itimer, profile w/ --workers 1 to see parse internals
+        signal.signal(signal.SIGPROF, _trace_sample)
+        signal.setitimer(signal.ITIMER_PROF, 1.0 / profile_hz, 1.0 / profile_hz)
+
+def _trace_sample(signum, frame):
+    """
+    PROC: SIGPROF handler, count the interrupted stack as root;...;leaf frames
+    RET: None
+    """
+    trace = _TRACE
+    if trace is None:
+        return
+    stack = []
+    while frame is not None and len(stack) < TRACE_PROFILE_DEPTH:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    key = ";".join(reversed(stack))
+    trace['samples'][key] = trace['samples'].get(key, 0) + 1
+
+def trace_span(name, cat='stage', **args):
+    """
+    PROC: time a block, eg: with trace_span('load_fio_json', 'file', read=path): ...
+
+    PARAMS:
+    - name, cat: span name & category, as shown by chrome://tracing or ui.perfetto.dev
+    - args: kept on the span, a `read` path also gets its size recorded as bytes read
+
+    RET: context manager, the shared no-op one while tracing is off
+    """
+    if _TRACE is None:
+        return _TRACE_OFF
+    return _trace_span(name, cat, args)
+
+@contextlib.contextmanager
+def _trace_span(name, cat, args):
+    """
+    PROC: the recording side of trace_span(), duration, bytes read & net allocated blocks
+    RET: generator-based context manager
+    """
+    trace = _TRACE
+    blocks = sys.getallocatedblocks()
+    start = time.perf_counter_ns()
+    try:
+        yield args
+    finally:
+        end = time.perf_counter_ns()
+        args['alloc_blocks'] = sys.getallocatedblocks() - blocks
+        if 'read' in args:
+            try:
+                args['bytes'] = os.path.getsize(args['read'])
+            except OSError:
+                pass
+        # perf_counter is CLOCK_MONOTONIC, so spans shipped back from pool workers line up too
+        trace['events'].append({'name': name, 'cat': cat, 'ph': 'X', 'pid': os.getpid(), 'tid': os.getpid(),
+                                'ts': (start - trace['t0']) / 1000, 'dur': (end - start) / 1000, 'args': args})
+
+def traced(cat='stage'):
+    """
+    PROC: decorator, each call is one span named after the function
+    RET: decorator
+    """
+    def wrap(fn):
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            if _TRACE is None:
+                return fn(*args, **kwargs)
+            with _trace_span(fn.__name__, cat, {}):
+                return fn(*args, **kwargs)
+        return call
+    return wrap
+
+def _trace_batch(fn, batch):
+    """
+    PROC: pool side of a traced fan-out, the worker's forked copy of the trace starts empty
+    RET: (fn(batch), spans recorded in this worker)
+    """
+    if _TRACE is None:
+        return fn(batch), []
+    _TRACE['events'] = []
+    with _trace_span(fn.__name__, 'batch', {'files': len(batch)}):
+        result = fn(batch)
+    return result, _TRACE['events']
+
+def trace_summary(events):
+    """
+    PROC: per span name totals, pct is of the traced wall time
+    RET: structured array, TRACE_SUMMARY_DTYPE, slowest total first
+    """
+    if not events:
+        return np.zeros(0, dtype=TRACE_SUMMARY_DTYPE)
+    wall = max(e['ts'] + e['dur'] for e in events) - min(e['ts'] for e in events)
+    spans = {}
+    for e in events:
+        spans.setdefault((e['name'], e['cat']), []).append(e)
+    rows = []
+    for (name, cat), group in spans.items():
+        durs = [e['dur'] / 1000 for e in group]
+        mb = sum(e['args'].get('bytes', 0) for e in group) / 1048576
+        rows.append((name, cat, len(group), sum(durs), sum(durs) / len(durs), max(durs),
+                     100.0 * sum(durs) * 1000 / max(wall, 1), mb, mb / max(sum(durs) / 1000, 1e-9),
+                     sum(e['args'].get('alloc_blocks', 0) for e in group)))
+    table = np.array(rows, dtype=TRACE_SUMMARY_DTYPE)
+    return table[np.argsort(-table['total_ms'], kind='stable')]
+
+def trace_files(events, top=TRACE_TOP):
+    """
+    PROC: per file totals over its 'file' spans (read + extract), eg: one slow or huge log
+    RET: structured array, TRACE_FILE_DTYPE, slowest first
+    """
+    files = {}
+    for e in events:
+        if e['cat'] != 'file':
+            continue
+        path = e['args'].get('read') or e['args'].get('file')
+        ms, size, jobs, blocks = files.get(path, (0.0, 0, 0, 0))
+        files[path] = (ms + e['dur'] / 1000, size + e['args'].get('bytes', 0),
+                       jobs + e['args'].get('jobs', 0), blocks + e['args'].get('alloc_blocks', 0))
+    rows = sorted(((path, ms, size / 1048576, jobs, blocks) for path, (ms, size, jobs, blocks) in files.items()),
+                  key=lambda row: -row[1])
+    return np.array(rows[:top], dtype=TRACE_FILE_DTYPE)
+
+def trace_frames(samples, top=TRACE_TOP):
+    """
+    PROC: hottest frames of the sampled stacks, self == leaf samples, total == anywhere on the stack
+    RET: structured array, TRACE_FRAME_DTYPE, most self samples first
+    """
+    count = sum(samples.values())
+    frames = {}
+    for stack, n in samples.items():
+        names = stack.split(";")
+        for name in set(names):
+            own, total = frames.get(name, (0, 0))
+            frames[name] = (own + (n if name == names[-1] else 0), total + n)
+    rows = sorted(((name, own, total, 100.0 * own / max(count, 1)) for name, (own, total) in frames.items()),
+                  key=lambda row: (-row[1], -row[2]))
+    return np.array(rows[:top], dtype=TRACE_FRAME_DTYPE)
+
+def trace_stop(path=TRACE_OUT):
+    """
+    PROC: stop tracing, write chrome trace-event json to path & sampled stacks next to it
+          as <path>.folded (flamegraph.pl, speedscope)
+    RET: (trace_summary(), trace_files(), trace_frames()) tables
+    """
+    global _TRACE
+    trace, _TRACE = _TRACE, None
+    if trace['profile_hz']:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+    events = trace['events']
+    names = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': pid,
+              'args': {'name': 'analyze' if pid == trace['pid'] else f"worker {pid}"}}
+             for pid in sorted({e['pid'] for e in events})]
+    with open(path + '.tmp', 'w') as out:
+        json.dump({'traceEvents': names + events, 'displayTimeUnit': 'ms'}, out, default=str)
+    os.replace(path + '.tmp', path)
+    if trace['samples']:
+        with open(os.path.splitext(path)[0] + '.folded', 'w') as out:
+            for stack, n in sorted(trace['samples'].items(), key=lambda item: -item[1]):
+                out.write(f"{stack} {n}\n")
+    return trace_summary(events), trace_files(events), trace_frames(trace['samples'])
+
+def _project(node, fields):
+    """
+    PROC: trim a decoded JSON node down to the keys named in fields
+    RET: trimmed node, lists are trimmed element-wise
+    """
+    if fields is None:
+        return node
+    if isinstance(node, list):
+        return [_project(item, fields) for item in node]
+    if isinstance(node, dict):
+        return {k: _project(node[k], sub) for k, sub in fields.items() if k in node}
+    return node
+
+def _decode_fio_doc(buf, start, eof):
+    """
+    PROC: decode the top-level JSON doc beginning at buf[start]
+    RET: (doc, end), (None, start) while the doc is still incomplete, or (None, next)
+         when buf[start] opens no doc (eg: fio chatter holding a '{'), next being
+         the following line that opens one
+    """
+    # fio pretty-prints, so a top-level doc opens w/ '{\n' and closes w/ '}' at column 0,
+    # JSON strings can't hold a raw newline so '\n}' is always structural
+    if buf.startswith('{\n', start):
+        end = buf.find('\n}', start)
+        if end >= 0:
+            try:
+                return _json_loads(buf[start:end + 2]), end + 2
+            except ValueError:
+                pass
+        elif not eof:
+            return None, start
+
+    # Compact or odd layout, let the stdlib scanner find the real end
+    try:
+        return _json_decoder.raw_decode(buf, start)
+    except ValueError:
+        pass
+    # Once a later line opens a doc this one can't just be short of data, skip it
+    resume = buf.find('\n{', start + 1)
+    return None, (resume + 1 if resume >= 0 else start)
+
+def iter_fio_json(filepath, fields=FIO_SNAPSHOT_FIELDS, chunk_size=FIO_JSON_CHUNK):
+    """
+    PROC: stream each JSON snapshot from a fio log, one at a time
+
+    PARAMS:
+    - filepath: fio `--output-format=json` log, single or `--status-interval` multi-doc
+    - fields: projection of keys to keep per snapshot, None keeps the full tree
+    - chunk_size: bytes per read, memory stays ~ one snapshot + one chunk
+
+    RET: generator of snapshot dicts, last one is the end-of-run summary
+    """
+    buf = ''
+    pos = 0
+    eof = False
+    with open(filepath, 'r') as f:
+        while True:
+            start = buf.find('{', pos)
+            if start < 0:
+                # Only whitespace or fio chatter left, drop it
+                buf, pos = '', 0
+            else:
+                doc, end = _decode_fio_doc(buf, start, eof)
+                if doc is not None:
+                    pos = end
+                    yield _project(doc, fields)
+                    continue
+                if end > start:
+                    print(f"WARN: skipped non-JSON text in {filepath}", file=sys.stderr)
+                    pos = end
+                    continue
+                buf, pos = buf[start:], 0
+
+            if eof:
+                break
+            # Grow reads w/ the pending doc so oversized snapshots stay linear-time
+            chunk = f.read(max(chunk_size, len(buf)))
+            eof = not chunk
+            buf += chunk
+
+    if buf[pos:].strip():
+        # fio was killed mid-write, the earlier snapshots are still good
+        print(f"WARN: truncated JSON at end of {filepath}, ignoring tail", file=sys.stderr)
 
 def load_fio_json(filepath):
     """
-    PROC: load the JSON
-    RET: data
+    PROC: load the JSON, final snapshot wins for `--status-interval` multi-doc logs
+    RET: data
+    """
+    data = {}
+    with trace_span('load_fio_json', 'file', read=filepath):
+        for data in iter_fio_json(filepath):
+            pass
+    return data
+
+def extract_job_metrics(job):
+    """
+    Extract common perf metrics from a single job entry
+    TODO: adjust metrics into conf vars array
+    """
+    metrics = {}
+
+    # Read 'em, then same deal for writes; latency eval overall stats are (lat_ns), and
+    # because we love numbers, clat_ns mean/stddev/p99 too (FIO_JOB_METRICS)
+    for metric, direction, path in FIO_JOB_METRICS:
+        node = job.get(direction, {})
+        for key in path:
+            node = node.get(key, 0) if isinstance(node, dict) else 0
+        metrics[metric] = node
+
+    # TODO: wrap the metrics calls w/ error|fail state codes
+    # TODO: basic exception handler raise func is limited, go find the lib from summer 2018
+    # TODO: how can we live with outselves w/o syslog & ES APM trace loggers?!
+    return metrics
+
+def latency_bucket(values_ns):
+    """
+    PROC: map latencies (ns) to histogram bucket indexes
+    RET: int array
+    """
+    values = np.maximum(np.asarray(values_ns, dtype=np.float64), 1.0)
+    return np.minimum((np.log2(values) * LAT_HIST_SUB).astype(np.int64), LAT_HIST_BUCKETS - 1)
+
+def fio_latency_hist(clat):
+    """
+    PROC: bin one direction's clat_ns block into the log-bucketed histogram
+          - 'bins' (json+ output): exact per-latency io counts
+          - 'percentile' (plain json): mass between percentile points lands at the
+            upper point, the tail past the last point lands at 'max'
+
+    RET: float array[LAT_HIST_BUCKETS] of io counts, zeros when nothing was recorded
+    """
+    hist = np.zeros(LAT_HIST_BUCKETS, dtype=np.float64)
+    bins = clat.get('bins')
+    if bins:
+        np.add.at(hist, latency_bucket([float(k) for k in bins]), [float(v) for v in bins.values()])
+        return hist
+
+    points = sorted((float(p), float(v)) for p, v in clat.get('percentile', {}).items())
+    total = float(clat.get('N', 0) or 0)
+    if not points or total <= 0:
+        return hist
+    pcts = np.array([p for p, _ in points] + [100.0])
+    values = np.array([v for _, v in points] + [float(clat.get('max', points[-1][1]) or points[-1][1])])
+    mass = np.diff(np.concatenate(([0.0], pcts))) / 100.0 * total
+    np.add.at(hist, latency_bucket(values), mass)
+    return hist
+
+def extract_job_histograms(job):
+    """
+    PROC: per direction clat histograms for a single job entry
+    RET: dict of hist name -> float array[LAT_HIST_BUCKETS]
+    """
+    hists = {}
+    for direction in ('read', 'write'):
+        io = job.get(direction, {})
+        clat = dict(io.get('clat_ns', {}))
+        # Older fio has no clat N, total_ios is the same population
+        clat.setdefault('N', io.get('total_ios', 0))
+        hists[f'{direction}_lat_hist'] = fio_latency_hist(clat)
+    return hists
+
+def hist_percentiles(hist, percentiles=LAT_PERCENTILES):
+    """
+    PROC: percentiles of the population a histogram (or a stack of them) describes
+    RET: array[..., len(percentiles)] of ns values, 0 for empty histograms
+    """
+    hist = np.asarray(hist, dtype=np.float64)
+    cum = np.cumsum(hist, axis=-1)
+    total = cum[..., -1:]
+    targets = total * (np.asarray(percentiles, dtype=np.float64) / 100.0)
+    # First bucket where the running count reaches each target
+    index = (cum[..., None, :] < targets[..., :, None]).sum(axis=-1)
+    values = LAT_HIST_VALUES[np.minimum(index, LAT_HIST_BUCKETS - 1)]
+    return np.where(total > 0, values, 0.0)
+
+def parse_fio_size(value):
+    """
+    PROC: fio size string to bytes, eg: 4k, 4K, 1M, 4096, first of 'rd,wr' pairs
+    RET: int bytes, 0 when unparsable
+    """
+    match = FIO_SIZE_RE.match(str(value).split(',')[0].strip())
+    if not match:
+        return 0
+    return int(match.group('num')) << FIO_SIZE_UNITS[match.group('unit').lower()]
+
+def format_fio_size(nbytes):
+    """
+    PROC: bytes to the shortest exact fio size string, eg: 512, 4k, 1m
+    RET: str
+    """
+    nbytes = int(nbytes)
+    for unit, shift in sorted(FIO_SIZE_UNITS.items(), key=lambda item: -item[1]):
+        if shift and nbytes and not nbytes % (1 << shift):
+            return f"{nbytes >> shift}{unit}"
+    return str(nbytes)
+
+def _path_dims(filepath):
+    """
+    PROC: workload dims implied by the log path
+          - perfio.${HOSTNAME}.${job}.log.json from the batch script
+          - <target>/<bs>/<mode>-<iodepth>-<numjobs>.json from bench-fio
+    RET: dict of dims
+    """
+    run = os.path.basename(os.path.dirname(os.path.abspath(filepath)))
+    name = os.path.basename(filepath)
+    dims = {'run': run, 'file': name}
+
+    match = FIO_BATCH_LOG_RE.match(name)
+    if match:
+        dims.update(match.groupdict())
+
+    match = FIO_BENCH_LOG_RE.match(name)
+    if match:
+        dims['mode'] = match.group('mode')
+        dims['iodepth'] = int(match.group('iodepth'))
+        dims['numjobs'] = int(match.group('numjobs'))
+        dims['bs'] = parse_fio_size(run)
+        dims['target'] = os.path.basename(os.path.dirname(os.path.dirname(os.path.abspath(filepath))))
+    return dims
+
+def _job_row(path_dims, data, index, job):
+    """
+    PROC: one store row for a job, job options win over path naming
+    RET: tuple in STORE_DTYPE field order
+    """
+    options = dict(data.get('global options', {}))
+    options.update(job.get('job options', {}))
+    metrics = extract_job_metrics(job)
+    hists = extract_job_histograms(job)
+
+    bs = parse_fio_size(options['bs']) if 'bs' in options else path_dims.get('bs', 0)
+    target = options.get('filename', options.get('directory', '')).split(':')[0]
+    return (
+        path_dims['run'],
+        path_dims['file'],
+        path_dims.get('host', ''),
+        target or path_dims.get('target', ''),
+        job.get('jobname', path_dims.get('jobname', '')),
+        index,
+        options.get('rw', options.get('readwrite', path_dims.get('mode', ''))),
+        options.get('ioengine', ''),
+        bs,
+        int(options.get('iodepth', path_dims.get('iodepth', 1))),
+        int(options.get('numjobs', path_dims.get('numjobs', 1))),
+        int(data.get('timestamp_ms', 0)),
+    ) + tuple(float(metrics.get(metric, 0) or 0) for metric in STORE_METRICS) \
+      + tuple(hists[hist] for hist in STORE_HISTS)
+
+def _warn_truncated(filepath, rows):
+    """
+    PROC: warn about text dims wider than STORE_DIMS allows, cut to width two targets
+          or jobs sharing a prefix would fold into one cell
+    """
+    for i, dim, width in STORE_TEXT_DIMS:
+        for value in sorted({row[i] for row in rows if len(row[i]) > width}):
+            print(f"WARN: {dim} cut to {width} chars in the store: {value!r} in {filepath}", file=sys.stderr)
+
+def _ingest_fio_batch(filepaths):
+    """
+    PROC: parse a batch of json logs & extract job metrics, runs in pool workers
+    RET: (structured array of store rows, rows per file)
+    """
+    # A structured array pickles as one flat buffer, workers ship back bytes not lists
+    rows = []
+    counts = []
+    for filepath in filepaths:
+        path_dims = _path_dims(filepath)
+        data = load_fio_json(filepath)
+        jobs = data.get('jobs', [])
+        with trace_span('extract_job_metrics', 'file', file=filepath, jobs=len(jobs)):
+            for index, job in enumerate(jobs):
+                rows.append(_job_row(path_dims, data, index, job))
+        _warn_truncated(filepath, rows[len(rows) - len(jobs):])
+        counts.append(len(jobs))
+    return np.array(rows, dtype=STORE_DTYPE), np.array(counts, dtype=np.int64)
+
+def _batch_fio_files(filepaths, workers):
+    """
+    PROC: split file list into contiguous batches, a few per worker for load balance
+    RET: list of lists of filepaths
+    """
+    per_batch = max(1, -(-len(filepaths) // (workers * INGEST_BATCHES_PER_WORKER)))
+    return [filepaths[i:i + per_batch] for i in range(0, len(filepaths), per_batch)]
+
+@traced()
+def _parse_fio_files(filepaths, workers):
+    """
+    PROC: parse logs in-process or across a pool
+    RET: (store rows, rows per file) in filepaths order
+    """
+    if not workers:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(filepaths))
+
+    if workers <= 1:
+        return _ingest_fio_batch(filepaths)
+
+    # Fan parse+extract out across the pool, stitch partials back in batch order
+    from concurrent.futures import ProcessPoolExecutor
+    batches = _batch_fio_files(filepaths, workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if _TRACE is None:
+            partials = list(pool.map(_ingest_fio_batch, batches))
+        else:
+            traced_batches = list(pool.map(_trace_batch, [_ingest_fio_batch] * len(batches), batches))
+            partials = [partial for partial, _ in traced_batches]
+            for _, events in traced_batches:
+                _TRACE['events'].extend(events)
+    return (np.concatenate([rows for rows, _ in partials]),
+            np.concatenate([counts for _, counts in partials]))
+
+@traced()
+def build_metric_store(directory_path, workers=1, recursive=False, cache=None,
+                       cache_max_bytes=PARSE_CACHE_MAX_BYTES):
+    """
+    PROC: parse every json log under dir path into the columnar store
+
+    PARAMS:
+    - directory_path: dir holding fio json logs
+    - workers: process pool size for parsing, 1 == in-process, 0|None == all cores
+    - recursive: walk sub-dirs too, eg: a whole bench-fio <target>/<bs>/ tree
+    - cache: parse cache dir, unchanged logs skip the parse entirely, None == off
+    - cache_max_bytes: LRU size bound for the parse cache
+
+    RET: structured array, STORE_DTYPE, one row per job
+    """
+    # aka LogGlobbing(), sorted so row order is the same for any worker count
+    pattern = f"{directory_path}/**/*.json" if recursive else f"{directory_path}/*.json"
+    filepaths = sorted(glob.glob(pattern, recursive=recursive))
+    if not cache:
+        return _parse_fio_files(filepaths, workers)[0]
+
+    conn = open_parse_cache(cache)
+    try:
+        per_file, pending = parse_cache_lookup(conn, filepaths)
+        rows, counts = _parse_fio_files(list(pending), workers)
+        parsed = dict(zip(pending, np.split(rows, np.cumsum(counts)[:-1])))
+        parse_cache_update(conn, parsed, pending, cache_max_bytes)
+    finally:
+        conn.close()
+
+    per_file.update(parsed)
+    if not filepaths:
+        return np.zeros(0, dtype=STORE_DTYPE)
+    return np.concatenate([per_file[filepath] for filepath in filepaths])
+
+def open_parse_cache(cache_dir):
+    """
+    PROC: open (or create) the sqlite parse cache, WAL so analyzers can share it
+    RET: sqlite3 connection
+    """
+    import sqlite3
+    os.makedirs(cache_dir, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(cache_dir, PARSE_CACHE_FILE), timeout=60)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS files (
+            path     TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            size     INTEGER NOT NULL,
+            oid      TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS entries (
+            oid    TEXT NOT NULL,
+            schema TEXT NOT NULL,
+            rows   BLOB NOT NULL,
+            nbytes INTEGER NOT NULL,
+            atime  REAL NOT NULL,
+            PRIMARY KEY (oid, schema)
+        );
+        CREATE INDEX IF NOT EXISTS entries_atime ON entries (atime);
+    """)
+    return conn
+
+def _file_oid(filepath):
+    """
+    PROC: sha256 of the log content, matches the Git LFS pointer oid
+    RET: hex digest
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(FIO_JSON_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _chunked(items, size=PARSE_CACHE_QUERY_CHUNK):
+    """
+    PROC: slice a list into fixed size pieces
+    RET: generator of lists
+    """
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+@traced()
+def parse_cache_lookup(conn, filepaths):
+    """
+    PROC: resolve logs against the parse cache
+          - mtime+size unchanged since last seen: trust the recorded oid, no read
+          - otherwise: hash the content, a copied or touched log still hits
+
+    RET: ({filepath: store rows} for hits, {filepath: (mtime_ns, size, oid)} for misses)
+    """
+    known = {}
+    abspaths = {filepath: os.path.abspath(filepath) for filepath in filepaths}
+    for chunk in _chunked(list(abspaths.values())):
+        marks = ','.join('?' * len(chunk))
+        for path, mtime_ns, size, oid in conn.execute(
+                f'SELECT path, mtime_ns, size, oid FROM files WHERE path IN ({marks})', chunk):
+            known[path] = (mtime_ns, size, oid)
+
+    stats = {}
+    for filepath in filepaths:
+        st = os.stat(filepath)
+        seen = known.get(abspaths[filepath])
+        if seen and seen[:2] == (st.st_mtime_ns, st.st_size):
+            stats[filepath] = seen
+        else:
+            stats[filepath] = (st.st_mtime_ns, st.st_size, _file_oid(filepath))
+
+    blobs = {}
+    oids = sorted({stat[2] for stat in stats.values()})
+    for chunk in _chunked(oids):
+        marks = ','.join('?' * len(chunk))
+        for oid, blob in conn.execute(
+                f'SELECT oid, rows FROM entries WHERE schema = ? AND oid IN ({marks})',
+                [PARSE_CACHE_SCHEMA] + chunk):
+            blobs[oid] = blob
+
+    hits = {}
+    pending = {}
+    for filepath, stat in stats.items():
+        if stat[2] not in blobs:
+            pending[filepath] = stat
+            continue
+        rows = np.frombuffer(blobs[stat[2]], dtype=STORE_DTYPE).copy()
+        hits[filepath] = _restamp_rows(rows, filepath)
+
+    # LRU bookkeeping + remember new paths/stats that resolved by content
+    now = time.time()
+    with conn:
+        conn.executemany('UPDATE entries SET atime = ? WHERE oid = ? AND schema = ?',
+                         [(now, oid, PARSE_CACHE_SCHEMA) for oid in blobs])
+        conn.executemany('INSERT OR REPLACE INTO files (path, mtime_ns, size, oid) VALUES (?, ?, ?, ?)',
+                         [(abspaths[filepath],) + stats[filepath] for filepath in hits
+                          if known.get(abspaths[filepath]) != stats[filepath]])
+    return hits, pending
+
+def _restamp_rows(rows, filepath):
+    """
+    PROC: cached rows are keyed by content, re-apply the dims that come from the path
+    RET: rows
+    """
+    path_dims = _path_dims(filepath)
+    rows['run'] = path_dims['run']
+    rows['file'] = path_dims['file']
+    if 'host' in path_dims:
+        rows['host'] = path_dims['host']
+    return rows
+
+@traced()
+def parse_cache_update(conn, parsed, stats, max_bytes=PARSE_CACHE_MAX_BYTES):
+    """
+    PROC: store freshly parsed rows, then evict least recently used entries over max_bytes
+
+    PARAMS:
+    - parsed: {filepath: store rows}
+    - stats: {filepath: (mtime_ns, size, oid)} from parse_cache_lookup()
+
+    RET: none
+    """
+    if not parsed:
+        return
+    now = time.time()
+    with conn:
+        conn.executemany('INSERT OR REPLACE INTO entries (oid, schema, rows, nbytes, atime) VALUES (?, ?, ?, ?, ?)',
+                         [(stats[filepath][2], PARSE_CACHE_SCHEMA, rows.tobytes(), rows.nbytes, now)
+                          for filepath, rows in parsed.items()])
+        conn.executemany('INSERT OR REPLACE INTO files (path, mtime_ns, size, oid) VALUES (?, ?, ?, ?)',
+                         [(os.path.abspath(filepath),) + stats[filepath] for filepath in parsed])
+
+    total = conn.execute('SELECT COALESCE(SUM(nbytes), 0) FROM entries').fetchone()[0]
+    if total <= max_bytes:
+        return
+    victims = []
+    for oid, schema, nbytes in conn.execute('SELECT oid, schema, nbytes FROM entries ORDER BY atime'):
+        if total <= max_bytes:
+            break
+        victims.append((oid, schema))
+        total -= nbytes
+    with conn:
+        conn.executemany('DELETE FROM entries WHERE oid = ? AND schema = ?', victims)
+        conn.execute('DELETE FROM files WHERE oid NOT IN (SELECT oid FROM entries)')
+
+def save_metric_store(store, path):
+    """
+    PROC: persist the store as a plain .npy
+    RET: none
+    """
+    np.save(path, store, allow_pickle=False)
+
+def load_metric_store(path, mmap=True):
+    """
+    PROC: load a saved store, mmap'd by default so slicing doesn't read it all
+    RET: structured array
+    """
+    return np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False)
+
+def results_db_schema():
+    """
+    PROC: DDL for the results db, metric columns follow STORE_METRICS
+          - hosts, targets (per host), job_configs (hash keyed workload dims)
+          - job_metrics: one row per job per log, the store row w/o histograms
+    RET: list of statements
+    """
+    metric_cols = ',\n'.join(f"    {metric} DOUBLE PRECISION" for metric in STORE_METRICS)
+    config_cols = ',\n'.join(f"    {dim} {RESULTS_DB_SQL_TYPES[STORE_DTYPE[dim].kind]}"
+                             for dim in RESULTS_DB_CONFIG_DIMS)
+    return [
+        """CREATE TABLE IF NOT EXISTS hosts (
+    host_id INTEGER PRIMARY KEY,
+    host VARCHAR(255) NOT NULL UNIQUE
+)""",
+        """CREATE TABLE IF NOT EXISTS targets (
+    target_id INTEGER PRIMARY KEY,
+    host_id INTEGER NOT NULL REFERENCES hosts (host_id),
+    target VARCHAR(1024) NOT NULL,
+    UNIQUE (host_id, target)
+)""",
+        f"""CREATE TABLE IF NOT EXISTS job_configs (
+    config_id INTEGER PRIMARY KEY,
+    config_hash CHAR(40) NOT NULL UNIQUE,
+{config_cols}
+)""",
+        f"""CREATE TABLE IF NOT EXISTS job_metrics (
+    run VARCHAR(255) NOT NULL,
+    file VARCHAR(255) NOT NULL,
+    job INTEGER NOT NULL,
+    timestamp_ms BIGINT NOT NULL,
+    target_id INTEGER NOT NULL REFERENCES targets (target_id),
+    config_id INTEGER NOT NULL REFERENCES job_configs (config_id),
+{metric_cols}
+)""",
+        # A log is target + run + file + fio's timestamp, run/file alone repeat across
+        # targets & nights in the bench-fio layout (eg: 4k/randread-1-1.json)
+        "DROP INDEX IF EXISTS job_metrics_file",
+        "CREATE INDEX IF NOT EXISTS job_metrics_log ON job_metrics (target_id, run, file, timestamp_ms)",
+        "CREATE INDEX IF NOT EXISTS job_metrics_config_ts ON job_metrics (config_id, timestamp_ms)",
+        "CREATE INDEX IF NOT EXISTS job_metrics_target_ts ON job_metrics (target_id, timestamp_ms)",
+        "CREATE INDEX IF NOT EXISTS job_configs_dims ON job_configs (mode, bs, iodepth, numjobs)",
+    ]
+
+def open_results_db(path):
+    """
+    PROC: open (or create) the sqlite results db
+    RET: sqlite3 connection
+    """
+    import sqlite3
+    conn = sqlite3.connect(path, timeout=60)
+    # sqlite-only tuning; the DDL is sqlite flavoured too, ids are INTEGER PRIMARY KEY rowid
+    # aliases so another engine needs identity columns, the queries themselves are ANSI
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    with conn:
+        for statement in results_db_schema():
+            conn.execute(statement)
+    return conn
+
+def _results_db_ids(conn, table, key_cols, keys, extra=None):
+    """
+    PROC: id per natural key, inserting the missing ones (select-then-insert, no upsert)
+
+    PARAMS:
+    - keys: list of key tuples in key_cols order
+    - extra: {key: tuple of more column values} for new rows, column names after key_cols
+
+    RET: {key tuple: id}
+    """
+    id_col = {'hosts': 'host_id', 'targets': 'target_id', 'job_configs': 'config_id'}[table]
+    cols = ', '.join(key_cols)
+    ids = {tuple(row[:-1]): row[-1] for row in conn.execute(f"SELECT {cols}, {id_col} FROM {table}")}
+    missing = [key for key in dict.fromkeys(keys) if key not in ids]
+    if missing:
+        names = list(key_cols) + (list(RESULTS_DB_CONFIG_DIMS) if extra else [])
+        marks = ', '.join('?' * len(names))
+        conn.executemany(f"INSERT INTO {table} ({', '.join(names)}) VALUES ({marks})",
+                         [key + (extra[key] if extra else ()) for key in missing])
+        ids.update((tuple(row[:-1]), row[-1]) for row in conn.execute(f"SELECT {cols}, {id_col} FROM {table}"))
+    return ids
+
+@traced()
+def results_db_load(conn, store, batch=RESULTS_DB_BATCH):
+    """
+    PROC: bulk load store rows in one transaction, a log already present (same target,
+          run, file & fio timestamp) is replaced so re-loading the same logs doesn't
+          duplicate, other targets & earlier nights are left alone
+
+    PARAMS:
+    - store: structured array, STORE_DTYPE (histograms are not kept)
+    - batch: rows per executemany
+
+    RET: rows inserted
+    """
+    if not len(store):
+        return 0
+    hosts = store['host'].tolist()
+    targets = store['target'].tolist()
+    config_vals = list(zip(*(store[dim].tolist() for dim in RESULTS_DB_CONFIG_DIMS)))
+    config_hash = {vals: hashlib.sha1(repr(vals).encode()).hexdigest() for vals in set(config_vals)}
+
+    with conn:
+        host_ids = _results_db_ids(conn, 'hosts', ('host',), [(h,) for h in hosts])
+        target_ids = _results_db_ids(conn, 'targets', ('host_id', 'target'),
+                                     [(host_ids[(h,)], t) for h, t in zip(hosts, targets)])
+        config_ids = _results_db_ids(conn, 'job_configs', ('config_hash',),
+                                     [(config_hash[vals],) for vals in config_vals],
+                                     extra={(digest,): vals for vals, digest in config_hash.items()})
+
+        logs = sorted(set(zip([target_ids[(host_ids[(h,)], t)] for h, t in zip(hosts, targets)],
+                              store['run'].tolist(), store['file'].tolist(), store['timestamp_ms'].tolist())))
+        conn.executemany('DELETE FROM job_metrics WHERE target_id = ? AND run = ? AND file = ? AND timestamp_ms = ?',
+                         logs)
+
+        cols = ['run', 'file', 'job', 'timestamp_ms', 'target_id', 'config_id'] + list(STORE_METRICS)
+        sql = f"INSERT INTO job_metrics ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+        metrics = [store[metric].tolist() for metric in STORE_METRICS]
+        dims = [store[dim].tolist() for dim in ('run', 'file', 'job', 'timestamp_ms')]
+        for start in range(0, len(store), batch):
+            stop = min(start + batch, len(store))
+            conn.executemany(sql, [
+                tuple(col[i] for col in dims)
+                + (target_ids[(host_ids[(hosts[i],)], targets[i])], config_ids[(config_hash[config_vals[i]],)])
+                + tuple(col[i] for col in metrics)
+                for i in range(start, stop)])
+    return len(store)
+
+def _results_db_column(name):
+    """
+    PROC: whitelist a dim/metric name to its qualified column, nothing else reaches the SQL text
+    RET: str
+    """
+    if name in STORE_METRICS or name in ('run', 'file', 'job', 'timestamp_ms'):
+        return f"m.{name}"
+    if name in RESULTS_DB_CONFIG_DIMS:
+        return f"c.{name}"
+    if name == 'host':
+        return "h.host"
+    if name == 'target':
+        return "t.target"
+    raise SystemExit(f"ERROR: unknown results db column: {name}")
+
+def results_db_query(conn, metric, by, where=None, agg='avg', since_ms=None, until_ms=None, bucket=None):
+    """
+    PROC: historical comparison / trend query straight off the indexes, no json rescans
+
+    PARAMS:
+    - metric: STORE_METRICS column
+    - by: list of dims to group by, eg: ['host', 'mode', 'iodepth']
+    - where: {dim: value or list of values}
+    - agg: one of RESULTS_DB_AGGS
+    - since_ms, until_ms: timestamp_ms bounds
+    - bucket: hour, day or week, adds a leading 'bucket_ms' time column for trends
+
+    RET: structured array of the group keys + count + metric, sorted by keys
+    """
+    if agg not in RESULTS_DB_AGGS:
+        raise SystemExit(f"ERROR: results db agg must be one of {', '.join(RESULTS_DB_AGGS)}")
+    by = [by] if isinstance(by, str) else list(by)
+    select = [_results_db_column(dim) for dim in by]
+    out_dtype = [(dim, STORE_DTYPE[dim] if dim in STORE_DTYPE.names else 'U255') for dim in by]
+    params = []
+    if bucket:
+        select.insert(0, f"CAST(m.timestamp_ms / {RESULTS_DB_BUCKETS[bucket]} AS BIGINT) * {RESULTS_DB_BUCKETS[bucket]}")
+        out_dtype.insert(0, ('bucket_ms', 'i8'))
+
+    clauses = []
+    for dim, want in (where or {}).items():
+        want = want if isinstance(want, (list, tuple, set)) else [want]
+        want = [parse_fio_size(w) if dim == 'bs' else w for w in want]
+        clauses.append(f"{_results_db_column(dim)} IN ({', '.join('?' * len(want))})")
+        params.extend(want)
+    if since_ms is not None:
+        clauses.append("m.timestamp_ms >= ?")
+        params.append(int(since_ms))
+    if until_ms is not None:
+        clauses.append("m.timestamp_ms < ?")
+        params.append(int(until_ms))
+
+    keys = ', '.join(select)
+    sql = f"""SELECT {keys + ', ' if keys else ''}COUNT(*), {agg.upper()}({_results_db_column(metric)})
+FROM job_metrics m
+JOIN job_configs c ON c.config_id = m.config_id
+JOIN targets t ON t.target_id = m.target_id
+JOIN hosts h ON h.host_id = t.host_id"""
+    if clauses:
+        sql += "\nWHERE " + " AND ".join(clauses)
+    if keys:
+        sql += f"\nGROUP BY {keys}\nORDER BY {keys}"
+
+    rows = conn.execute(sql, params).fetchall()
+    out_dtype += [('count', 'i8'), (metric, 'f8')]
+    return np.array([tuple(row[:-1]) + (row[-1] or 0.0,) for row in rows if row[-2]], dtype=out_dtype)
+
+def store_filter(store, **where):
+    """
+    PROC: select rows by dimension values, eg: store_filter(s, mode='randread', bs='4k')
+          a list/tuple/set value matches any of its members
+    RET: structured array of the matching rows
+    """
+    mask = np.ones(len(store), dtype=bool)
+    for dim, want in where.items():
+        if isinstance(want, (list, tuple, set)):
+            want = [parse_fio_size(w) if dim == 'bs' else w for w in want]
+            mask &= np.isin(store[dim], want)
+        else:
+            mask &= store[dim] == (parse_fio_size(want) if dim == 'bs' else want)
+    return store[mask]
+
+def _group_runs(store, by, values=None):
+    """
+    PROC: sort rows by the dims in by (then values), find where each group starts
+    RET: (order, sorted key columns, group starts, group sizes)
+    """
+    sort_keys = [store[dim] for dim in reversed(by)]
+    order = np.lexsort(([values] if values is not None else []) + sort_keys)
+    keys = [np.asarray(store[dim])[order] for dim in by]
+
+    change = np.zeros(len(order), dtype=bool)
+    change[0] = True
+    for col in keys:
+        change[1:] |= col[1:] != col[:-1]
+    starts = np.flatnonzero(change)
+    counts = np.diff(np.append(starts, len(order)))
+    return order, keys, starts, counts
+
+def store_groupby(store, by, metric, agg='mean'):
+    """
+    PROC: group rows by one or more dims & reduce a metric column per group
+
+    PARAMS:
+    - by: dim name or list of dim names
+    - metric: store column to reduce
+    - agg: mean, sum, min, max, std, median or pNN (eg: p99, p99.9) of the values
+
+    RET: structured array of the group keys + 'count' + metric, sorted by keys
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    out_dtype = [(dim, store.dtype[dim]) for dim in by] + [('count', 'i8'), (metric, 'f8')]
+    if not len(store):
+        return np.zeros(0, dtype=out_dtype)
+
+    # Sort by keys then value, so each group is a contiguous & ordered run
+    values = np.asarray(store[metric], dtype=np.float64)
+    order, keys, starts, counts = _group_runs(store, by, values)
+    values = values[order]
+
+    if agg == 'sum':
+        result = np.add.reduceat(values, starts)
+    elif agg == 'mean':
+        result = np.add.reduceat(values, starts) / counts
+    elif agg == 'min':
+        result = values[starts]
+    elif agg == 'max':
+        result = values[starts + counts - 1]
+    elif agg == 'std':
+        mean = np.add.reduceat(values, starts) / counts
+        result = np.sqrt(np.add.reduceat((values - np.repeat(mean, counts)) ** 2, starts) / counts)
+    elif agg == 'median' or agg.startswith('p'):
+        # Linear interpolation inside each sorted run, same as np.percentile
+        q = 50.0 if agg == 'median' else float(agg[1:])
+        pos = starts + (counts - 1) * (q / 100.0)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, starts + counts - 1)
+        result = values[lo] + (values[hi] - values[lo]) * (pos - lo)
+    else:
+        raise ValueError(f"unknown aggregation: {agg}")
+
+    grouped = np.zeros(len(starts), dtype=out_dtype)
+    for dim, col in zip(by, keys):
+        grouped[dim] = col[starts]
+    grouped['count'] = counts
+    grouped[metric] = result
+    return grouped
+
+def store_latency_percentiles(store, by, hist='read_lat_hist', percentiles=LAT_PERCENTILES):
+    """
+    PROC: merge job histograms per group & report true percentiles of the merged
+          population, not a mean of per-job means
+
+    PARAMS:
+    - by: dim name or list of dim names, empty == one group for the whole store
+    - hist: store histogram column, read_lat_hist or write_lat_hist
+
+    RET: structured array of the group keys + 'count' + 'ios' + one column per percentile
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    names = [f"p{p:g}" for p in percentiles]
+    out_dtype = [(dim, store.dtype[dim]) for dim in by] + [('count', 'i8'), ('ios', 'f8')] \
+        + [(name, 'f8') for name in names]
+    if not len(store):
+        return np.zeros(0, dtype=out_dtype)
+
+    hists = np.asarray(store[hist], dtype=np.float64)
+    if by:
+        order, keys, starts, counts = _group_runs(store, by)
+        merged = np.add.reduceat(hists[order], starts, axis=0)
+    else:
+        keys, starts, counts = [], np.zeros(1, dtype=np.int64), np.array([len(store)])
+        merged = hists.sum(axis=0, keepdims=True)
+
+    grouped = np.zeros(len(starts), dtype=out_dtype)
+    for dim, col in zip(by, keys):
+        grouped[dim] = col[starts]
+    grouped['count'] = counts
+    grouped['ios'] = merged.sum(axis=1)
+    values = hist_percentiles(merged, percentiles)
+    for i, name in enumerate(names):
+        grouped[name] = values[:, i]
+    return grouped
+
+def _interval_dtype(columns):
+    """
+    PROC: compact record dtype for the chosen interval log columns
+    RET: np.dtype
+    """
+    fields = dict(INTERVAL_LOG_FIELDS)
+    return np.dtype([(name, fields[name]) for name in columns])
+
+def _interval_log_chunks(mm, chunk_size, size=None):
+    """
+    PROC: split a mapped log (its first size bytes) into newline aligned byte ranges &
+          count rows in each
+    RET: list of (start, end, rows)
+    """
+    size = len(mm) if size is None else size
+    chunks = []
+    start = 0
+    while start < size:
+        end = size if start + chunk_size >= size else mm.rfind(b'\n', start, start + chunk_size) + 1
+        if end <= start:
+            # One line longer than a chunk, take it whole
+            end = mm.find(b'\n', start + chunk_size)
+            end = size if end < 0 else end + 1
+        view = np.frombuffer(mm, dtype=np.uint8, count=end - start, offset=start)
+        rows = int(np.count_nonzero(view == 10)) + (view[-1] != 10)
+        del view
+        chunks.append((start, end, rows))
+        start = end
+    return chunks
+
+def _interval_bad_line(block):
+    """
+    PROC: slow path once a block failed to parse, first line w/ a non number field
+    RET: byte offset inside block, None when every line parses
+    """
+    pos = 0
+    for line in block.split(b'\n'):
+        try:
+            if line or pos < len(block):
+                for field in line.split(b','):
+                    float(field)
+        except ValueError:
+            return pos
+        pos += len(line) + 1
+    return None
+
+def _parse_interval_block(block, ncols, columns, filepath='', offset=0):
+    """
+    PROC: vectorized parse of whole log lines, C speed via np.fromstring, a bad line
+          is reported w/ its file & byte offset (block starts at offset in filepath)
+    RET: structured array of the chosen columns
+    """
+    # Commas per line, newlines become commas below so a short & a long row would cancel out
+    view = np.frombuffer(block, dtype=np.uint8)
+    starts = np.concatenate(([0], np.flatnonzero(view == 10) + 1))
+    starts = starts[:-1] if starts[-1] == len(block) else starts
+    ragged = np.flatnonzero(np.add.reduceat(view == 44, starts, dtype=np.int32) != ncols - 1)
+    bad = int(starts[ragged[0]]) if len(ragged) else None
+    if bad is None:
+        try:
+            values = np.fromstring(block.replace(b'\n', b','), dtype=np.float64, sep=',')
+        except ValueError:
+            bad = _interval_bad_line(block)
+    if bad is not None:
+        line = block[bad:bad + 80].split(b'\n', 1)[0]
+        raise ValueError(f"{filepath}: bad fio interval log line at byte {offset + bad}, "
+                         f"expected {ncols} numbers: {line!r}")
+    values = values.reshape(-1, ncols)
+    rows = np.zeros(len(values), dtype=_interval_dtype(columns))
+    for name in columns:
+        index = INTERVAL_LOG_INDEX[name]
+        if index < ncols:
+            rows[name] = values[:, index]
+    return rows
+
+def _parse_interval_chunk(filepath, start, end, ncols, columns):
+    """
+    PROC: map the log & parse one byte range of it, runs in pool workers
+    RET: structured array of the chosen columns
+    """
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _parse_interval_block(mm[start:end], ncols, columns, filepath, start)
+
+@traced()
+def load_fio_interval_log(filepath, columns=INTERVAL_LOG_COLUMNS, chunk_size=INTERVAL_LOG_CHUNK,
+                          workers=1, out=None):
+    """
+    PROC: parse a fio write_bw_log / write_lat_log / write_iops_log file
+
+    PARAMS:
+    - columns: which of INTERVAL_LOG_FIELDS to keep, fewer == smaller records
+    - chunk_size: bytes of text per parse step, bounds the working set
+    - workers: process pool size, chunks parse in parallel, 1 == in-process
+    - out: optional .npy path, results land in a memmap instead of RAM
+
+    RET: structured array (or memmap) of compact typed records
+    """
+    dtype = _interval_dtype(columns)
+    if not os.path.getsize(filepath):
+        return np.zeros(0, dtype=dtype)
+
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # fio still writing (or killed mid line) leaves a partial last line, only whole ones count
+        size = mm.rfind(b'\n') + 1
+        if size < len(mm):
+            print(f"WARN: dropped incomplete last line of {filepath} at byte {size}", file=sys.stderr)
+        if not size:
+            return np.zeros(0, dtype=dtype)
+        ncols = mm[:mm.find(b'\n')].count(b',') + 1
+        chunks = _interval_log_chunks(mm, chunk_size, size)
+        total = sum(rows for _, _, rows in chunks)
+        if out:
+            result = np.lib.format.open_memmap(out, mode='w+', dtype=dtype, shape=(total,))
+        else:
+            result = np.empty(total, dtype=dtype)
+
+        if not workers:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(chunks) < 2:
+            parts = (_parse_interval_block(mm[start:end], ncols, columns, filepath, start)
+                     for start, end, _ in chunks)
+            row = _fill_interval_rows(result, parts)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+                parts = pool.map(_parse_interval_chunk, *zip(*[(filepath, start, end, ncols, columns)
+                                                               for start, end, _ in chunks]))
+                row = _fill_interval_rows(result, parts)
+
+    if row != total:
+        raise ValueError(f"{filepath}: parsed {row} rows, expected {total}")
+    if out:
+        result.flush()
+    return result
+
+def _fill_interval_rows(result, parts):
+    """
+    PROC: copy parsed chunks into the preallocated result as they arrive
+    RET: rows written
+    """
+    row = 0
+    for part in parts:
+        result[row:row + len(part)] = part
+        row += len(part)
+    return row
+
+def downsample_interval_log(log, points=1000, ddir=None):
+    """
+    PROC: min/max/mean per time bucket, keeps spikes visible when plotting long runs
+
+    PARAMS:
+    - log: records from load_fio_interval_log(), time ordered as fio writes them
+    - points: number of time buckets
+    - ddir: 0 read, 1 write, 2 trim, None == every direction
+
+    RET: structured array, INTERVAL_SUMMARY_DTYPE, one row per non-empty bucket
+    """
+    if ddir is not None:
+        log = log[log['ddir'] == ddir]
+    if not len(log):
+        return np.zeros(0, dtype=INTERVAL_SUMMARY_DTYPE)
+
+    t_ms = np.asarray(log['t_ms'], dtype=np.int64)
+    values = np.asarray(log['value'], dtype=np.float64)
+    order = np.argsort(t_ms, kind='stable')
+    t_ms, values = t_ms[order], values[order]
+
+    width = max(1, -(-(int(t_ms[-1]) - int(t_ms[0]) + 1) // points))
+    bucket = (t_ms - t_ms[0]) // width
+    starts = np.flatnonzero(np.diff(bucket, prepend=-1))
+    counts = np.diff(np.append(starts, len(values)))
+
+    summary = np.zeros(len(starts), dtype=INTERVAL_SUMMARY_DTYPE)
+    summary['t_ms'] = t_ms[0] + bucket[starts] * width
+    summary['count'] = counts
+    summary['min'] = np.minimum.reduceat(values, starts)
+    summary['max'] = np.maximum.reduceat(values, starts)
+    summary['mean'] = np.add.reduceat(values, starts) / counts
+    return summary
+
+def interval_series(log, period_ms=SS_PERIOD_MS, ddir=None, combine='sum'):
+    """
+    PROC: resample interval log records onto a regular time grid, periods w/o any
+          record are dropped rather than read as 0
+          - sum: per-period mean of each direction summed across directions, rw jobs
+                 log read & write rows & their bw/iops add up
+          - mean: per-period mean over all records, directions weighted by their
+                  record counts, for lat/clat/slat logs where a sum means nothing
+
+    RET: (t_ms array of period starts, value array)
+    """
+    if ddir is not None:
+        log = log[log['ddir'] == ddir]
+    if not len(log):
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    t_ms = np.asarray(log['t_ms'], dtype=np.int64)
+    period = (t_ms - t_ms.min()) // period_ms
+    if combine == 'mean':
+        sums = np.bincount(period, weights=np.asarray(log['value'], dtype=np.float64))
+        counts = np.bincount(period)
+        present = counts > 0
+        values = sums[present] / counts[present]
+    elif combine == 'sum':
+        slot = period * 3 + np.minimum(np.asarray(log['ddir'], dtype=np.int64), 2)
+        sums = np.bincount(slot, weights=np.asarray(log['value'], dtype=np.float64))
+        counts = np.bincount(slot)
+        means = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+        values = np.pad(means, (0, -len(means) % 3)).reshape(-1, 3).sum(axis=1)
+        present = np.pad(counts, (0, -len(counts) % 3)).reshape(-1, 3).sum(axis=1) > 0
+        values = values[present]
+    else:
+        raise ValueError(f"unknown interval combine: {combine}")
+    return t_ms.min() + np.flatnonzero(present) * period_ms, values
+
+def snapshot_series(filepath, metric='bw'):
+    """
+    PROC: per-interval series from a `--status-interval` multi-doc json log, each
+          snapshot is cumulative so an interval is the diff of two neighbours
+
+    PARAMS:
+    - metric: bw (bytes/s), iops, or lat (mean ns of the I/Os in that interval)
+
+    RET: (t_ms array of interval ends, value array)
+    """
+    points = []
+    for snap in iter_fio_json(filepath, fields=SS_SNAPSHOT_FIELDS):
+        io_bytes = ios = lat_sum = 0.0
+        for job in snap.get('jobs', []):
+            for direction in ('read', 'write'):
+                io = job.get(direction, {})
+                io_bytes += io.get('io_bytes', 0)
+                ios += io.get('total_ios', 0)
+                lat_sum += io.get('lat_ns', {}).get('mean', 0) * io.get('total_ios', 0)
+        points.append((snap.get('timestamp_ms', 0), io_bytes, ios, lat_sum))
+    if len(points) < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    t_ms, io_bytes, ios, lat_sum = (np.array(col, dtype=np.float64) for col in zip(*points))
+    # Repeated timestamps (eg: final summary right after the last interval) carry no interval
+    keep = np.diff(t_ms) > 0
+    dt = np.diff(t_ms)[keep] / 1000.0
+    d_ios = np.diff(ios)[keep]
+    if metric == 'bw':
+        values = np.diff(io_bytes)[keep] / dt
+    elif metric == 'iops':
+        values = d_ios / dt
+    elif metric == 'lat':
+        values = np.divide(np.diff(lat_sum)[keep], d_ios, out=np.zeros_like(d_ios), where=d_ios > 0)
+    else:
+        raise ValueError(f"unknown series metric: {metric}")
+    return t_ms[1:][keep].astype(np.int64), values
+
+def parse_ss_spec(spec):
+    """
+    PROC: fio ss= syntax to (metric, test, limit, relative)
+          - <metric>_slope:<limit>[%]: least squares slope per second of the window
+          - <metric>:<limit>[%]: every sample within limit of the window mean
+    RET: tuple
+    """
+    name, _, limit = spec.partition(':')
+    metric, _, slope = name.partition('_')
+    relative = limit.endswith('%')
+    limit = float(limit.rstrip('%'))
+    return metric, 'slope' if slope == 'slope' else 'range', limit / 100.0 if relative else limit, relative
+
+def detect_steady_state(t_ms, values, spec=SS_SPEC, dur_s=SS_DUR_S, ramp_s=SS_RAMP_S):
+    """
+    PROC: offline version of fio's steady-state check, every window of dur_s after
+          ramp_s is tested at once w/ cumulative sums & sliding views
+
+    PARAMS:
+    - t_ms, values: regular series, eg: from interval_series() or snapshot_series()
+    - spec: fio ss= string, eg: bw_slope:1%, iops:10%
+    - dur_s: steady-state window length
+    - ramp_s: leading seconds never considered
+
+    RET: dict w/ converged flag, when steady state began, the shortest runtime that
+         would have been sufficient & stats over the steady part only
+    """
+    _, test, limit, relative = parse_ss_spec(spec)
+    t_ms = np.asarray(t_ms, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    result = {'converged': False, 'samples': len(values), 'runtime_s': 0.0,
+              'ss_start_s': float('nan'), 'sufficient_s': float('nan'),
+              'mean': 0.0, 'stddev': 0.0, 'min': 0.0, 'max': 0.0}
+    if len(values) < 2:
+        return result
+
+    period_s = float(np.median(np.diff(t_ms))) / 1000.0
+    elapsed_s = (t_ms - t_ms[0]) / 1000.0 + period_s
+    result['runtime_s'] = float(elapsed_s[-1])
+    window = max(2, int(round(dur_s / period_s)))
+    first = int(np.searchsorted(elapsed_s, ramp_s, side='right'))
+    if len(values) - first < window:
+        return _ss_stats(result, values[first:])
+
+    # Window sums from prefix sums, x is the sample index inside the window
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    cxsum = np.concatenate(([0.0], np.cumsum(np.arange(len(values)) * values)))
+    starts = np.arange(first, len(values) - window + 1)
+    sum_y = csum[starts + window] - csum[starts]
+    mean = sum_y / window
+
+    if test == 'slope':
+        sum_xy = cxsum[starts + window] - cxsum[starts] - starts * sum_y
+        sum_x = window * (window - 1) / 2.0
+        sum_xx = (window - 1) * window * (2 * window - 1) / 6.0
+        slope = (window * sum_xy - sum_x * sum_y) / (window * sum_xx - sum_x ** 2) / period_s
+        spread = np.abs(slope)
+    else:
+        views = np.lib.stride_tricks.sliding_window_view(values, window)[starts]
+        spread = np.maximum(views.max(axis=1) - mean, mean - views.min(axis=1))
+
+    bound = limit * np.abs(mean) if relative else limit
+    passing = np.flatnonzero(spread <= bound)
+    if not len(passing):
+        return _ss_stats(result, values[first:])
+
+    begin = starts[passing[0]]
+    result['converged'] = True
+    result['ss_start_s'] = float(elapsed_s[begin] - period_s)
+    result['sufficient_s'] = float(elapsed_s[begin + window - 1])
+    return _ss_stats(result, values[begin:])
+
+def _ss_stats(result, steady):
+    """
+    PROC: fill mean/stddev/min/max over the steady (or post ramp) samples
+    RET: result
+    """
+    if len(steady):
+        result.update(mean=float(steady.mean()), stddev=float(steady.std()),
+                      min=float(steady.min()), max=float(steady.max()))
+    return result
+
+@traced()
+def steady_state_table(sources, spec=SS_SPEC, dur_s=SS_DUR_S, ramp_s=SS_RAMP_S):
+    """
+    PROC: steady-state check per source
+          - *.json: --status-interval snapshot series for the spec's metric
+          - anything else: fio interval log (bw/lat/iops per the file)
+
+    RET: structured array, SS_RESULT_DTYPE
+    """
+    metric = parse_ss_spec(spec)[0]
+    rows = []
+    for source in sources:
+        if source.endswith('.json'):
+            t_ms, values = snapshot_series(source, metric)
+        else:
+            kind = ARCHIVE_LOG_RE.search(source)
+            combine = 'mean' if kind and kind.group(1).endswith('lat') else 'sum'
+            t_ms, values = interval_series(load_fio_interval_log(source), combine=combine)
+        found = detect_steady_state(t_ms, values, spec, dur_s, ramp_s)
+        rows.append((os.path.basename(source),) + tuple(found[name] for name in SS_RESULT_DTYPE.names[1:]))
+    return np.array(rows, dtype=SS_RESULT_DTYPE)
+
+def _plot_label(*parts):
+    """
+    PROC: file name safe chart label
+    RET: str
+    """
+    return re.sub(r'[^A-Za-z0-9._-]+', '-', '_'.join(str(part) for part in parts)).strip('-')
+
+def _plot_metric(metric, mode):
+    """
+    PROC: store metric to chart for a mode, direction-less names get write_ for write
+          only modes & read_ otherwise
+    RET: str
+    """
+    if metric in STORE_DTYPE.names:
+        return metric
+    return f"{'write' if str(mode) in PLOT_WRITE_MODES else 'read'}_{metric}"
+
+def plot_specs(store, kinds=PLOT_KINDS, metric=PLOT_METRIC, lat_metric=PLOT_LAT_METRIC,
+               interval_logs=(), points=PLOT_POINTS):
+    """
+    PROC: build chart specs from parsed results, no fio json is read here
+          - qd2d: metric bars + lat_metric line per iodepth, per target/bs/mode/numjobs
+          - surface3d: metric over the iodepth x numjobs grid, per target/bs/mode
+          - latency: min/mean/max over time per fio interval log
+
+    PARAMS:
+    - store: metric store, eg: load_metric_store(--load-store)
+    - metric, lat_metric: store metrics, see PLOT_METRIC for direction-less names
+    - interval_logs: fio interval log paths for the latency charts
+
+    RET: list of spec dicts {'name', 'kind', 'title', 'labels', 'data'}, data holds
+         small numpy arrays only so specs pickle cheap to the render pool
+    """
+    specs = []
+    if len(store) and ('qd2d' in kinds or 'surface3d' in kinds):
+        order, _, starts, counts = _group_runs(store, ['target', 'bs', 'mode'])
+        for start, count in zip(starts, counts):
+            rows = store[order[start:start + count]]
+            first = rows[0]
+            target = str(first['target']) or str(first['run'])
+            label = _plot_label(os.path.basename(target), format_fio_size(first['bs']), first['mode'])
+            title = f"{target} {first['mode']} bs={format_fio_size(first['bs'])}"
+            y_metric = _plot_metric(metric, first['mode'])
+            y_lat_metric = _plot_metric(lat_metric, first['mode'])
+
+            if 'qd2d' in kinds:
+                for numjobs in np.unique(rows['numjobs']):
+                    cell = rows[rows['numjobs'] == numjobs]
+                    bars = store_groupby(cell, 'iodepth', y_metric)
+                    line = store_groupby(cell, 'iodepth', y_lat_metric)
+                    specs.append({'name': f"{label}_nj{numjobs}_qd2d.png", 'kind': 'qd2d',
+                                  'title': f"{title} numjobs={numjobs}", 'labels': (y_metric, y_lat_metric),
+                                  'data': {'x': bars['iodepth'], 'y': bars[y_metric], 'lat': line[y_lat_metric]}})
+
+            if 'surface3d' in kinds:
+                grid = store_groupby(rows, ['iodepth', 'numjobs'], y_metric)
+                iodepths = np.unique(grid['iodepth'])
+                numjobs = np.unique(grid['numjobs'])
+                # A surface needs at least a 2x2 grid, a single row is a qd2d chart
+                if len(iodepths) > 1 and len(numjobs) > 1:
+                    z = np.full((len(numjobs), len(iodepths)), np.nan)
+                    z[np.searchsorted(numjobs, grid['numjobs']), np.searchsorted(iodepths, grid['iodepth'])] = grid[y_metric]
+                    specs.append({'name': f"{label}_surface3d.png", 'kind': 'surface3d', 'title': title,
+                                  'labels': (y_metric,), 'data': {'x': iodepths, 'y': numjobs, 'z': z}})
+
+    if 'latency' in kinds:
+        for filepath in interval_logs:
+            summary = downsample_interval_log(load_fio_interval_log(filepath), points)
+            if not len(summary):
+                continue
+            name = os.path.basename(filepath)
+            match = PLOT_LOG_RE.search(name)
+            t_s = (summary['t_ms'] - summary['t_ms'][0]) / 1000.0
+            specs.append({'name': f"{_plot_label(name)}_latency.png", 'kind': 'latency', 'title': name,
+                          'labels': (PLOT_LOG_UNITS[match.group('kind')] if match else 'value',),
+                          'data': {'t': t_s, 'min': summary['min'], 'mean': summary['mean'], 'max': summary['max']}})
+    return specs
+
+def plot_spec_hash(spec):
+    """
+    PROC: digest of everything a chart is drawn from, unchanged digest == skip the render
+    RET: hex str
+    """
+    digest = hashlib.sha256(f"{PLOT_VERSION}|{spec['kind']}|{spec['title']}|{spec['labels']}".encode())
+    for key in sorted(spec['data']):
+        values = np.ascontiguousarray(spec['data'][key])
+        digest.update(f"|{key}|{values.dtype.str}|{values.shape}|".encode())
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+def _plot_backend():
+    """
+    PROC: import matplotlib w/ the headless Agg backend
+    RET: matplotlib.pyplot
+    """
+    try:
+        import matplotlib
+    except ImportError:
+        raise SystemExit("ERROR: --plot needs matplotlib, eg: pip install matplotlib")
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+def render_chart(spec, out_dir):
+    """
+    PROC: draw one chart spec to out_dir/<name>, runs in pool workers
+    RET: (name, seconds)
+    """
+    plt = _plot_backend()
+    start = time.perf_counter()
+    data = spec['data']
+    fig = plt.figure(figsize=PLOT_SIZE_IN, dpi=PLOT_DPI)
+    try:
+        if spec['kind'] == 'qd2d':
+            ax = fig.add_subplot()
+            pos = np.arange(len(data['x']))
+            ax.bar(pos, data['y'], color='tab:blue')
+            ax.set_xticks(pos, [str(x) for x in data['x']])
+            ax.set_xlabel('iodepth')
+            ax.set_ylabel(spec['labels'][0])
+            lat_ax = ax.twinx()
+            lat_ax.plot(pos, data['lat'], color='tab:orange', marker='o')
+            lat_ax.set_ylabel(spec['labels'][1])
+        elif spec['kind'] == 'surface3d':
+            # Grid positions, not values, iodepth steps are powers of two
+            ax = fig.add_subplot(projection='3d')
+            x, y = np.meshgrid(np.arange(len(data['x'])), np.arange(len(data['y'])))
+            ax.plot_surface(x, y, np.ma.masked_invalid(data['z']), cmap='viridis')
+            ax.set_xticks(np.arange(len(data['x'])), [str(v) for v in data['x']])
+            ax.set_yticks(np.arange(len(data['y'])), [str(v) for v in data['y']])
+            ax.set_xlabel('iodepth')
+            ax.set_ylabel('numjobs')
+            ax.set_zlabel(spec['labels'][0])
+        elif spec['kind'] == 'latency':
+            ax = fig.add_subplot()
+            ax.fill_between(data['t'], data['min'], data['max'], color='tab:blue', alpha=0.25, linewidth=0)
+            ax.plot(data['t'], data['mean'], color='tab:blue', linewidth=1)
+            ax.set_xlabel('seconds')
+            ax.set_ylabel(spec['labels'][0])
+        else:
+            raise ValueError(f"unknown chart kind: {spec['kind']}")
+        ax.set_title(spec['title'])
+        fig.savefig(os.path.join(out_dir, spec['name']))
+    finally:
+        plt.close(fig)
+    return spec['name'], time.perf_counter() - start
+
+@traced()
+def render_charts(specs, out_dir=PLOT_OUT, workers=1):
+    """
+    PROC: render chart specs across a process pool, charts whose input hash matches
+          out_dir/PLOT_MANIFEST & whose file still exists are skipped
+
+    PARAMS:
+    - specs: from plot_specs()
+    - workers: pool size, 1 == in-process, 0|None == all cores
+
+    RET: (written, skipped, seconds)
+    """
+    start = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, PLOT_MANIFEST)
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    todo = []
+    for spec in specs:
+        digest = plot_spec_hash(spec)
+        if manifest.get(spec['name']) == digest and os.path.exists(os.path.join(out_dir, spec['name'])):
+            continue
+        todo.append((spec, digest))
+
+    if not workers:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(todo))
+    if workers <= 1:
+        for spec, _ in todo:
+            render_chart(spec, out_dir)
+    else:
+        # matplotlib import is the fixed cost per worker, chunk so it's paid once each
+        chunk = max(1, -(-len(todo) // (workers * PLOT_BATCHES_PER_WORKER)))
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(render_chart, [spec for spec, _ in todo], [out_dir] * len(todo), chunksize=chunk))
+
+    # Only recorded once drawn, a failed render is retried next time
+    for spec, digest in todo:
+        manifest[spec['name']] = digest
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return len(todo), len(specs) - len(todo), time.perf_counter() - start
+
+def _report_slices(store, by):
+    """
+    PROC: split a store into its groups by dims
+    RET: dict {key tuple: rows}, in key order
+    """
+    if store is None or not len(store):
+        return {}
+    order, keys, starts, counts = _group_runs(store, list(by))
+    return {tuple(col[start].item() for col in keys): store[order[start:start + count]]
+            for start, count in zip(starts, counts)}
+
+def _report_cell(name, value):
+    """
+    PROC: table cell text
+    RET: str
+    """
+    if name == 'bs':
+        return format_fio_size(value)
+    if isinstance(value, (float, np.floating)):
+        return f"{value:.2f}"
+    return str(value)
+
+def report_section_hash(rows, base_rows, salt):
     """
-    with open(filepath, 'r') as f:
-        data = json.load(f)
-    return data
+    PROC: digest of a section's inputs: its store rows, the baseline rows it's judged
+          against & a salt covering the templates, metrics & thresholds
+    RET: hex str
+    """
+    digest = hashlib.sha256(salt.encode())
+    digest.update(np.ascontiguousarray(rows).tobytes())
+    if base_rows is not None:
+        digest.update(b'|baseline|')
+        digest.update(np.ascontiguousarray(base_rows).tobytes())
+    return digest.hexdigest()
 
-def extract_job_metrics(job):
+def report_section_context(key, rows, base_rows=None, thresholds=None):
     """
-    Extract common perf metrics from a single job entry
-    TODO: adjust metrics into conf vars array
+    PROC: template context & chart specs for one host/target section
+          - per workload (mode, bs): chart specs + REPORT_METRICS per iodepth/numjobs cell
+          - w/ base_rows: regression_report() verdicts, only the changed cells listed
+
+    RET: (context dict, chart specs), chart names carry the section slug
     """
-    metrics = {}
+    slug = _plot_label(*(part for part in key if part))
+    workloads = []
+    specs = []
+    for (mode, bs), cell_rows in _report_slices(rows, REPORT_WORKLOAD_BY).items():
+        grouped = [store_groupby(cell_rows, REPORT_CELL_BY, metric) for metric in REPORT_METRICS]
+        table = [[_report_cell(dim, grouped[0][dim][i]) for dim in REPORT_CELL_BY]
+                 + [str(grouped[0]['count'][i])]
+                 + [_report_cell(metric, group[metric][i]) for metric, group in zip(REPORT_METRICS, grouped)]
+                 for i in range(len(grouped[0]))]
+        charts = plot_specs(cell_rows, REPORT_CHARTS)
+        for spec in charts:
+            spec['name'] = f"{slug}_{spec['name']}"
+        specs += charts
+        workloads.append({'title': f"{mode} bs={_report_cell('bs', bs)}",
+                          'columns': list(REPORT_CELL_BY) + ['count'] + list(REPORT_METRICS),
+                          'rows': table,
+                          'charts': [f"charts/{spec['name']}" for spec in charts]})
 
-    # Read 'em
-    read = job.get('read', {})
-    metrics['read_io_bytes'] = read.get('io_bytes', 0)
-    metrics['read_bw'] = read.get('bw', 0)
-    metrics['read_iops'] = read.get('iops', 0)
+    verdicts = None
+    regressions = 0
+    if base_rows is not None:
+        report = regression_report(base_rows, rows, list(REPORT_WORKLOAD_BY + REPORT_CELL_BY), thresholds=thresholds)
+        changed = report[np.isin(report['verdict'], ('regression', 'improvement'))]
+        regressions = int(np.count_nonzero(changed['verdict'] == 'regression'))
+        verdicts = {'columns': REPORT_VERDICT_COLUMNS, 'cells': len(report),
+                    'rows': [[_report_cell(name, row[name]) for name in REPORT_VERDICT_COLUMNS] for row in changed]}
 
-    # For latency eval, overall stats are (lat_ns)
-    lat_ns = read.get('lat_ns', {})
-    metrics['read_latency_mean'] = lat_ns.get('mean', 0)
-    metrics['read_latency_stddev'] = lat_ns.get('stddev', 0)
+    context = {'slug': slug, 'title': ' '.join(str(part) for part in key if part),
+               'workloads': workloads, 'verdicts': verdicts, 'regressions': regressions}
+    return context, specs
 
-    # Also, because we love numbers, we get the mean and stddev
-    metrics['clat_mean'] = read.get('clat_ns', {}).get('mean', 0)
-    metrics['clat_stddev'] = read.get('clat_ns', {}).get('stddev', 0)
+def _report_pdf(html_path, pdf_path):
+    """
+    PROC: print the assembled html to pdf w/ weasyprint
+    RET: none
+    """
+    # weasyprint raises OSError when pango & friends aren't installed
+    try:
+        import weasyprint
+    except (ImportError, OSError) as err:
+        raise SystemExit(f"ERROR: --pdf needs weasyprint w/ its pango libs: {err}")
+    weasyprint.HTML(filename=html_path).write_pdf(pdf_path)
 
-    # Same deal but for write based workloads
-    write = job.get('write', {})
-    metrics['write_io_bytes'] = write.get('io_bytes', 0)
-    metrics['write_bw'] = write.get('bw', 0)
-    metrics['write_iops'] = write.get('iops', 0)
+@traced()
+def _report_prune_charts(chart_dir, sections):
+    """
+    PROC: drop chart images (& their render manifest entries) no section links to any
+          more, eg: a section or workload gone from the store; sections from a manifest
+          that predates the 'charts' list keep everything under their slug
+    RET: number of charts removed
+    """
+    keep = {name for entry in sections.values() for name in entry.get('charts', ())}
+    prefixes = tuple(f"{slug}_" for slug, entry in sections.items() if 'charts' not in entry)
+    orphans = [name for name in os.listdir(chart_dir)
+               if name.endswith('.png') and name not in keep and not (prefixes and name.startswith(prefixes))]
+    for name in orphans:
+        os.remove(os.path.join(chart_dir, name))
+    manifest_path = os.path.join(chart_dir, PLOT_MANIFEST)
+    if orphans and os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        for name in orphans:
+            manifest.pop(name, None)
+        with open(manifest_path + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(manifest_path + '.tmp', manifest_path)
+    return len(orphans)
 
-    # TODO: wrap the metrics calls w/ error|fail state codes
-    # TODO: basic exception handler raise func is limited, go find the lib from summer 2018
-    # TODO: how can we live with outselves w/o syslog & ES APM trace loggers?!
-    return metrics
+def build_report(store, out_dir=REPORT_OUT, baseline=None, thresholds=None, workers=1, pdf=False):
+    """
+    PROC: incremental html (& pdf) report, one section per REPORT_SECTION_BY key
+          - each section's input digest is kept in out_dir/REPORT_MANIFEST, sections
+            whose digest is unchanged keep their rendered fragment & charts
+          - fragments & charts of sections (or workloads) no longer in the store go
+          - the page is re-assembled from fragments, the pdf re-printed, only when
+            any section changed
+
+    PARAMS:
+    - store: metric store of the run set to report
+    - baseline: optional baseline store, adds regression verdicts per section
+    - thresholds: {class: min_change} overrides for the verdicts
+    - workers: chart render pool size
 
-def process_fio_logs(directory_path):
+    RET: (sections built, sections reused, regressions or None w/o baseline, seconds)
     """
-    PROC: all json logs in dir path
-    RET: dict of aggregated lists of metrics
-    """
-    # data struct for accumulation metrics across files
-    aggregated_metrics = {
-        'read_bw': [],
-        'read_iops': [],
-        'read_latency_mean': [],
-        'read_latency_stddev': [],
-        'write_bw': [],
-        'write_iops': [],
-	# TODO: more, especially rollups
-    }
+    start = time.perf_counter()
+    os.makedirs(os.path.join(out_dir, 'sections'), exist_ok=True)
+    manifest_path = os.path.join(out_dir, REPORT_MANIFEST)
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    old_sections = manifest.get('sections', {})
 
-    # aka LogGlobbing()
-    for filepath in glob.glob(f"{directory_path}/*.json"):
-        data = load_fio_json(filepath)
-        jobs = data.get('jobs', [])
+    import jinja2
+    env = jinja2.Environment(loader=jinja2.FileSystemLoader(REPORT_TEMPLATE_DIR), autoescape=True,
+                             trim_blocks=True, lstrip_blocks=True)
+    salt = hashlib.sha256()
+    for name in (REPORT_PAGE_J2, REPORT_SECTION_J2):
+        with open(os.path.join(REPORT_TEMPLATE_DIR, name), 'rb') as f:
+            salt.update(f.read())
+    salt = f"{salt.hexdigest()}|{REPORT_METRICS}|{REPORT_CHARTS}|{PLOT_VERSION}|{sorted((thresholds or {}).items())}"
+
+    base_sections = _report_slices(baseline, REPORT_SECTION_BY)
+    sections = {}
+    specs = []
+    built = 0
+    for key, rows in _report_slices(store, REPORT_SECTION_BY).items():
+        slug = _plot_label(*(part for part in key if part))
+        base_rows = None if baseline is None else base_sections.get(key, baseline[:0])
+        digest = report_section_hash(rows, base_rows, salt)
+        fragment = os.path.join(out_dir, 'sections', f"{slug}.html")
+        old = old_sections.get(slug)
+        if old and old['hash'] == digest and os.path.exists(fragment):
+            sections[slug] = old
+            continue
+
+        context, section_specs = report_section_context(key, rows, base_rows, thresholds)
+        specs += section_specs
+        with open(fragment, 'w') as f:
+            f.write(env.get_template(REPORT_SECTION_J2).render(**context))
+        sections[slug] = {'hash': digest, 'title': context['title'], 'rows': len(rows),
+                          'regressions': context['regressions'], 'charts': [spec['name'] for spec in section_specs]}
+        built += 1
+
+    # Charts of rebuilt sections only, render_charts() skips any whose data didn't move anyway
+    render_charts(specs, os.path.join(out_dir, 'charts'), workers)
+    for slug in set(old_sections) - set(sections):
+        try:
+            os.remove(os.path.join(out_dir, 'sections', f"{slug}.html"))
+        except FileNotFoundError:
+            pass
+    _report_prune_charts(os.path.join(out_dir, 'charts'), sections)
+
+    regressions = None if baseline is None else sum(entry['regressions'] for entry in sections.values())
+    page_digest = hashlib.sha256('|'.join(f"{slug}:{entry['hash']}" for slug, entry in sections.items()).encode()).hexdigest()
+    index_path = os.path.join(out_dir, 'index.html')
+    pdf_path = os.path.join(out_dir, 'report.pdf')
+    page_changed = manifest.get('page') != page_digest or not os.path.exists(index_path)
+    if page_changed:
+        page_sections = []
+        for slug, entry in sections.items():
+            with open(os.path.join(out_dir, 'sections', f"{slug}.html"), 'r') as f:
+                page_sections.append({'slug': slug, 'title': entry['title'], 'html': f.read()})
+        with open(index_path, 'w') as f:
+            f.write(env.get_template(REPORT_PAGE_J2).render(
+                title='PerfIO-StorBench Report', generated=time.strftime('%Y-%m-%d %H:%M:%S'),
+                sections=page_sections, rows=sum(entry['rows'] for entry in sections.values()),
+                regressions=regressions))
+    if pdf and (page_changed or not os.path.exists(pdf_path)):
+        _report_pdf(index_path, pdf_path)
+
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump({'page': page_digest, 'sections': sections}, f, indent=1)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return built, len(sections) - built, regressions, time.perf_counter() - start
+
+def job_options(filepath):
+    """
+    PROC: effective options per job of a log, global options overlaid w/ the job's own
+    RET: dict {jobname: {option: value}}
+    """
+    data = {}
+    for data in iter_fio_json(filepath, DIFF_OPTION_FIELDS):
+        pass
+    global_options = data.get('global options', {})
+    options = {}
+    for job in data.get('jobs', []):
+        merged = dict(global_options)
+        merged.update(job.get('job options', {}))
+        options[job.get('jobname', '')] = {k: v for k, v in merged.items() if k not in DIFF_IGNORE_OPTIONS}
+    return options
+
+def _run_files(run_dir, recursive=False):
+    """
+    PROC: json logs of a run dir keyed by their path relative to it
+    RET: dict {relpath: path}
+    """
+    pattern = os.path.join(run_dir, '**', '*.json') if recursive else os.path.join(run_dir, '*.json')
+    return {os.path.relpath(path, run_dir): path for path in glob.glob(pattern, recursive=recursive)}
+
+@traced()
+def options_diff(run_dirs, recursive=False, workers=1):
+    """
+    PROC: diff the effective job options of same-named logs in each run dir vs the first
+    RET: structured array, DIFF_OPTION_DTYPE, one row per changed/added/removed option
+    """
+    ref_files = _run_files(run_dirs[0], recursive)
+    pairs = []
+    for run_dir in run_dirs[1:]:
+        files = _run_files(run_dir, recursive)
+        pairs += [(run_dir, rel, ref_files[rel], files[rel]) for rel in sorted(files) if rel in ref_files]
+
+    paths = sorted({path for pair in pairs for path in pair[2:]})
+    if not workers:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(paths) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            parsed = dict(zip(paths, pool.map(job_options, paths, chunksize=max(1, len(paths) // (workers * 4)))))
+    else:
+        parsed = {path: job_options(path) for path in paths}
+
+    rows = []
+    for run_dir, rel, ref_path, path in pairs:
+        base, cand = parsed[ref_path], parsed[path]
+        for jobname in sorted(set(base) | set(cand)):
+            base_opts, cand_opts = base.get(jobname, {}), cand.get(jobname, {})
+            for option in sorted(set(base_opts) | set(cand_opts)):
+                if base_opts.get(option) != cand_opts.get(option):
+                    rows.append((run_dir, rel, jobname, option,
+                                 str(base_opts.get(option, '<unset>')), str(cand_opts.get(option, '<unset>'))))
+    return np.array(rows, dtype=DIFF_OPTION_DTYPE)
+
+def _diff_table(store, metrics=STORE_METRICS, percentiles=DIFF_PERCENTILES):
+    """
+    PROC: one row per DIFF_KEYS cell: metric means & tail percentiles of the
+          cell's merged clat histograms
+    RET: (cell keys structured array, values [cells, names], names)
+    """
+    by = list(DIFF_KEYS)
+    key_dtype = [(dim, STORE_DTYPE[dim]) for dim in by]
+    names = list(metrics) + [f"{hist[:-5]}_p{p:g}" for hist in STORE_HISTS for p in percentiles]
+    if not len(store):
+        return np.zeros(0, dtype=key_dtype), np.zeros((0, len(names))), names
+
+    order, keys, starts, counts = _group_runs(store, by)
+    cells = np.zeros(len(starts), dtype=key_dtype)
+    for dim, col in zip(by, keys):
+        cells[dim] = col[starts]
+    columns = [np.add.reduceat(np.asarray(store[metric], dtype=np.float64)[order], starts) / counts
+               for metric in metrics]
+    for hist in STORE_HISTS:
+        merged = np.add.reduceat(np.asarray(store[hist], dtype=np.float64)[order], starts, axis=0)
+        columns += list(hist_percentiles(merged, percentiles).T)
+    return cells, np.column_stack(columns), names
+
+def _diff_higher_better(name):
+    """
+    PROC: which way is better for a diffed metric, tail percentiles are latency
+    RET: bool
+    """
+    klass = REGRESS_METRIC_CLASS.get(name, 'latency' if '_lat_p' in name else 'throughput')
+    return REGRESS_CLASSES[klass]['higher_better']
+
+@traced()
+def run_diff(stores, runs, metrics=STORE_METRICS, percentiles=DIFF_PERCENTILES):
+    """
+    PROC: align each run's store to the first (reference) on DIFF_KEYS & diff every metric
+          - delta, ratio & change % per aligned cell & metric, all in one array op per run
+          - impact better/worse by metric class, eg: p99 up is worse, iops up is better
+          - metrics zero on both sides (eg: write_* of a read job) are dropped
+
+    PARAMS:
+    - stores: metric stores, one per run, first is the reference
+    - runs: run labels, same order
+
+    RET: (diff rows ranked by |change %|, cells present on one side only)
+    """
+    ref_cells, ref_values, names = _diff_table(stores[0], metrics, percentiles)
+    key_dtype = ref_cells.dtype
+    out_dtype = [('run', 'U64')] + [(dim, key_dtype[dim]) for dim in key_dtype.names] \
+        + [('metric', 'U24'), ('base', 'f8'), ('cand', 'f8'), ('delta', 'f8'), ('ratio', 'f8'),
+           ('change_pct', 'f8'), ('impact', 'U8')]
+    unmatched_dtype = [('run', 'U64'), ('only_in', 'U8')] + [(dim, key_dtype[dim]) for dim in key_dtype.names]
+    sign = np.where([_diff_higher_better(name) for name in names], 1.0, -1.0)
+
+    parts = []
+    unmatched = []
+    for store, run in zip(stores[1:], runs[1:]):
+        cells, values, _ = _diff_table(store, metrics, percentiles)
+        _, ref_idx, cand_idx = np.intersect1d(ref_cells, cells, assume_unique=True, return_indices=True)
+        base = ref_values[ref_idx]
+        cand = values[cand_idx]
+        delta = cand - base
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(base != 0, cand / base, np.nan)
+        better = sign * delta
+
+        count, width = base.shape
+        part = np.zeros(count * width, dtype=out_dtype)
+        part['run'] = run
+        for dim in key_dtype.names:
+            part[dim] = np.repeat(ref_cells[dim][ref_idx], width)
+        part['metric'] = np.tile(names, count)
+        part['base'] = base.ravel()
+        part['cand'] = cand.ravel()
+        part['delta'] = delta.ravel()
+        part['ratio'] = ratio.ravel()
+        part['change_pct'] = (ratio.ravel() - 1.0) * 100.0
+        part['impact'] = np.where(better.ravel() > 0, 'better', np.where(better.ravel() < 0, 'worse', 'same'))
+        parts.append(part[(base.ravel() != 0) | (cand.ravel() != 0)])
+
+        for side, missing in (('base', np.setdiff1d(ref_cells, cells, assume_unique=True)),
+                              ('cand', np.setdiff1d(cells, ref_cells, assume_unique=True))):
+            rows = np.zeros(len(missing), dtype=unmatched_dtype)
+            rows['run'] = run
+            rows['only_in'] = side
+            for dim in key_dtype.names:
+                rows[dim] = missing[dim]
+            unmatched.append(rows)
+
+    report = np.concatenate(parts) if parts else np.zeros(0, dtype=out_dtype)
+    # Appearing from zero has no ratio, that's as big a change as it gets
+    magnitude = np.where(np.isnan(report['change_pct']), np.inf, np.abs(report['change_pct']))
+    report = report[np.argsort(-magnitude, kind='stable')]
+    unmatched = np.concatenate(unmatched) if unmatched else np.zeros(0, dtype=unmatched_dtype)
+    return report, unmatched
+
+def _archive_unit(dtype):
+    """
+    PROC: byte shuffle width of a column, the element size (a char for unicode)
+    RET: int
+    """
+    base = dtype.base
+    return 4 if base.kind == 'U' else base.itemsize
+
+def _archive_encode(values, name, unit, level):
+    """
+    PROC: one column chunk to compressed bytes: delta (ARCHIVE_DELTA_COLUMNS), shuffle, zlib
+    RET: bytes
+    """
+    values = np.ascontiguousarray(values)
+    if name in ARCHIVE_DELTA_COLUMNS and values.dtype.kind in 'iu':
+        values = np.diff(values, prepend=values.dtype.type(0))
+    raw = values.view(np.uint8)
+    if unit > 1:
+        raw = raw.reshape(-1, unit).T
+    return zlib.compress(np.ascontiguousarray(raw).tobytes(), level)
+
+def _archive_decode(blob, column, rows):
+    """
+    PROC: compressed bytes back to a column chunk of rows values
+    RET: array
+    """
+    dtype = np.dtype((np.dtype(column['dtype']), tuple(column['shape']))) if column['shape'] else np.dtype(column['dtype'])
+    raw = np.frombuffer(zlib.decompress(blob), dtype=np.uint8)
+    unit = column['unit']
+    if unit > 1:
+        raw = raw.reshape(unit, -1).T
+    values = np.ascontiguousarray(raw).reshape(-1).view(dtype.base).reshape((rows,) + dtype.shape)
+    if column['name'] in ARCHIVE_DELTA_COLUMNS and values.dtype.kind in 'iu':
+        values = np.cumsum(values, dtype=values.dtype)
+    return values
+
+def write_archive(path, tables, meta=None, level=ARCHIVE_LEVEL):
+    """
+    PROC: write structured arrays as one chunked, compressed, columnar archive
+
+    PARAMS:
+    - tables: {name: structured array}, eg: {'store': store, 'interval': series}
+    - meta: extra json-able info kept in the index, eg: source dir, interval log names
+
+    RET: bytes written
+    """
+    index = {'format': ARCHIVE_FORMAT, 'codec': 'zlib', 'meta': meta or {}, 'tables': {}}
+    with open(path + '.tmp', 'wb') as f:
+        f.write(ARCHIVE_MAGIC)
+        for table, rows in tables.items():
+            chunk_rows = ARCHIVE_CHUNK_ROWS.get(table, ARCHIVE_CHUNK_ROWS['store'])
+            columns = []
+            for name in rows.dtype.names:
+                dtype = rows.dtype[name]
+                column = {'name': name, 'dtype': dtype.base.str, 'shape': list(dtype.shape),
+                          'unit': _archive_unit(dtype), 'chunks': []}
+                for start in range(0, len(rows), chunk_rows):
+                    blob = _archive_encode(rows[name][start:start + chunk_rows], name, column['unit'], level)
+                    column['chunks'].append([f.tell(), len(blob)])
+                    f.write(blob)
+                columns.append(column)
+            index['tables'][table] = {'rows': len(rows), 'chunk_rows': chunk_rows, 'columns': columns}
+        footer = json.dumps(index, separators=(',', ':')).encode()
+        f.write(footer)
+        f.write(len(footer).to_bytes(8, 'little'))
+        f.write(ARCHIVE_MAGIC)
+        size = f.tell()
+    os.replace(path + '.tmp', path)
+    return size
+
+def open_archive(path):
+    """
+    PROC: mmap an archive & read its index footer, no column data is touched
+    RET: dict {'path', 'mm', 'index'}, close w/ close_archive()
+    """
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    tail = len(ARCHIVE_MAGIC) + 8
+    if len(mm) < 2 * len(ARCHIVE_MAGIC) + 8 or mm[:len(ARCHIVE_MAGIC)] != ARCHIVE_MAGIC \
+            or mm[-len(ARCHIVE_MAGIC):] != ARCHIVE_MAGIC:
+        mm.close()
+        raise SystemExit(f"ERROR: not a perfio archive: {path}")
+    length = int.from_bytes(mm[-tail:-len(ARCHIVE_MAGIC)], 'little')
+    index = json.loads(mm[len(mm) - tail - length:len(mm) - tail])
+    if index.get('format') != ARCHIVE_FORMAT:
+        mm.close()
+        raise SystemExit(f"ERROR: unsupported archive format {index.get('format')}: {path}")
+    return {'path': path, 'mm': mm, 'index': index}
+
+def close_archive(archive):
+    """
+    PROC: unmap an archive
+    RET: none
+    """
+    archive['mm'].close()
+
+def archive_column(archive, name, table='store', start=0, stop=None):
+    """
+    PROC: one column over a row range, only the chunks overlapping it are decompressed
+    RET: array
+    """
+    info = archive['index']['tables'][table]
+    column = next((col for col in info['columns'] if col['name'] == name), None)
+    if column is None:
+        raise SystemExit(f"ERROR: no column {name} in archive table {table}")
+    rows, chunk_rows = info['rows'], info['chunk_rows']
+    stop = rows if stop is None else min(stop, rows)
+    start = max(0, min(start, stop))
+    first, last = start // chunk_rows, -(-stop // chunk_rows)
+    parts = []
+    for i in range(first, last):
+        offset, length = column['chunks'][i]
+        parts.append(_archive_decode(archive['mm'][offset:offset + length], column,
+                                     min(chunk_rows, rows - i * chunk_rows)))
+    if not parts:
+        return _archive_decode(zlib.compress(b''), column, 0)
+    values = np.concatenate(parts) if len(parts) > 1 else parts[0]
+    return values[start - first * chunk_rows:stop - first * chunk_rows]
+
+def archive_rows(archive, table='store', columns=None, start=0, stop=None):
+    """
+    PROC: structured rows of a table, only the named columns & the row range are decoded
+    RET: structured array
+    """
+    info = archive['index']['tables'][table]
+    names = list(columns or [col['name'] for col in info['columns']])
+    values = {name: archive_column(archive, name, table, start, stop) for name in names}
+    dtype = np.dtype([(name, values[name].dtype, values[name].shape[1:]) for name in names])
+    rows = np.zeros(len(values[names[0]]) if names else 0, dtype=dtype)
+    for name in names:
+        rows[name] = values[name]
+    return rows
+
+def archive_store(path, columns=None):
+    """
+    PROC: metric store out of an archive, a subset of columns loads a lot faster
+    RET: structured array, STORE_DTYPE when columns is None
+    """
+    archive = open_archive(path)
+    try:
+        return archive_rows(archive, 'store', columns)
+    finally:
+        close_archive(archive)
+
+@traced()
+def archive_run(run_dir, path, workers=1, recursive=False, level=ARCHIVE_LEVEL, cache=None,
+                cache_max_bytes=PARSE_CACHE_MAX_BYTES):
+    """
+    PROC: pack a run dir into one archive: the metric store (metrics & clat histograms)
+          plus every fio interval log in it as a 'interval' table keyed by source
+          - cache, cache_max_bytes: parse cache, see build_metric_store()
+
+    RET: (bytes in, bytes out)
+    """
+    store = build_metric_store(run_dir, workers=workers, recursive=recursive, cache=cache,
+                               cache_max_bytes=cache_max_bytes)
+    pattern = os.path.join(run_dir, '**', '*') if recursive else os.path.join(run_dir, '*')
+    files = glob.glob(pattern, recursive=recursive)
+    json_logs = [p for p in files if p.endswith('.json')]
+    interval_logs = sorted(p for p in files if ARCHIVE_LOG_RE.search(p))
+
+    parts = []
+    for source, filepath in enumerate(interval_logs):
+        log = load_fio_interval_log(filepath, workers=workers)
+        part = np.zeros(len(log), dtype=ARCHIVE_INTERVAL_DTYPE)
+        part['source'] = source
+        for name in INTERVAL_LOG_COLUMNS:
+            part[name] = log[name]
+        parts.append(part)
+    tables = {'store': store}
+    if parts:
+        tables['interval'] = np.concatenate(parts)
+    meta = {'source': os.path.abspath(run_dir), 'created_ms': int(time.time() * 1000),
+            'interval_logs': [os.path.relpath(p, run_dir) for p in interval_logs]}
+    size = write_archive(path, tables, meta, level)
+    return sum(os.path.getsize(p) for p in json_logs + interval_logs), size
+
+@traced()
+def is_archive(path):
+    """
+    PROC: whether a file is a perfio archive, by its magic whatever it's named
+    RET: bool
+    """
+    with open(path, 'rb') as f:
+        return f.read(len(ARCHIVE_MAGIC)) == ARCHIVE_MAGIC
+
+def load_saved_store(paths):
+    """
+    PROC: store from a saved .npy or archives, comma list of archives is concatenated
+    RET: structured array
+    """
+    paths = [path for path in paths.split(',') if path]
+    if len(paths) == 1 and not is_archive(paths[0]):
+        return load_metric_store(paths[0])
+    return load_archives(paths)
+
+def load_baseline_store(baseline, workers=1, recursive=False, cache=None, cache_max_bytes=PARSE_CACHE_MAX_BYTES):
+    """
+    PROC: --baseline run set: a logs dir, a saved .npy store or a comma list of archives;
+          a gate w/ nothing to compare against must fail, not pass
+
+    RET: structured array, STORE_DTYPE, never empty
+    """
+    paths = [path for path in baseline.split(',') if path]
+    missing = [path for path in paths if not os.path.exists(path)]
+    if not paths or missing:
+        raise SystemExit(f"ERROR: baseline not found: {', '.join(missing) or baseline}")
+    if len(paths) == 1 and os.path.isdir(paths[0]):
+        store = build_metric_store(paths[0], workers=workers, recursive=recursive, cache=cache,
+                                   cache_max_bytes=cache_max_bytes)
+    else:
+        store = load_saved_store(baseline)
+    if not len(store):
+        hint = ", try -r" if os.path.isdir(paths[0]) and not recursive else ""
+        raise SystemExit(f"ERROR: baseline has no fio jobs: {baseline}{hint}")
+    return store
+
+def archive_run_id(archive):
+    """
+    PROC: when an archive's run was packed, from its meta, eg: 20261018-124703; the
+          file's mtime for an archive w/o created_ms
+    RET: str
+    """
+    created_ms = archive['index']['meta'].get('created_ms') or os.path.getmtime(archive['path']) * 1000
+    return time.strftime('%Y%m%d-%H%M%S', time.gmtime(created_ms / 1000.0))
+
+def load_archives(paths, columns=None):
+    """
+    PROC: metric stores of many archives as one, eg: a year of nightly runs for a diff
+          or --baseline; every nightly logs to the same dirs, so each archive's run dim
+          is stamped <archive_run_id()>/<run> on load to tell them apart
+    RET: structured array
+    """
+    stores = []
+    for path in paths:
+        archive = open_archive(path)
+        try:
+            rows = archive_rows(archive, 'store', columns)
+            run_id = archive_run_id(archive)
+        finally:
+            close_archive(archive)
+        if 'run' in rows.dtype.names:
+            width = rows.dtype['run'].itemsize // 4
+            runs = np.char.add(f"{run_id}/", rows['run'])
+            if len(runs) and np.char.str_len(runs).max() > width:
+                print(f"WARN: run cut to {width} chars in the store: {path}", file=sys.stderr)
+            rows['run'] = runs
+        stores.append(rows)
+    return np.concatenate(stores) if stores else np.zeros(0, dtype=STORE_DTYPE)
+
+def running_stats(metrics=AGGREGATE_METRICS):
+    """
+    PROC: empty mergeable aggregate: count, mean & M2 (Welford) plus min/max per metric
+          & the summed clat histograms as the percentile sketch
+    RET: dict
+    """
+    width = len(metrics)
+    return {'metrics': tuple(metrics),
+            'count': 0,
+            'mean': np.zeros(width),
+            'm2': np.zeros(width),
+            'min': np.full(width, np.inf),
+            'max': np.full(width, -np.inf),
+            'hists': {hist: np.zeros(LAT_HIST_BUCKETS) for hist in STORE_HISTS}}
+
+def running_merge(into, other):
+    """
+    PROC: fold one aggregate into another, Chan et al. pairwise update, so a batch of
+          rows or a whole other aggregate (another host, shard, day) costs O(1) per metric
+    RET: into, updated in place
+    """
+    n_a, n_b = into['count'], other['count']
+    if not n_b:
+        return into
+    total = n_a + n_b
+    delta = other['mean'] - into['mean']
+    into['mean'] = into['mean'] + delta * (n_b / total)
+    into['m2'] = into['m2'] + other['m2'] + delta ** 2 * (n_a * n_b / total)
+    into['count'] = total
+    np.minimum(into['min'], other['min'], out=into['min'])
+    np.maximum(into['max'], other['max'], out=into['max'])
+    for hist, counts in other['hists'].items():
+        into['hists'][hist] += counts
+    return into
+
+def running_update(stats, rows):
+    """
+    PROC: fold store rows into an aggregate, the batch is summarized & merged once
+    RET: stats, updated in place
+    """
+    if not len(rows):
+        return stats
+    values = np.column_stack([np.asarray(rows[metric], dtype=np.float64) for metric in stats['metrics']])
+    mean = values.mean(axis=0)
+    batch = {'count': len(rows),
+             'mean': mean,
+             'm2': ((values - mean) ** 2).sum(axis=0),
+             'min': values.min(axis=0),
+             'max': values.max(axis=0),
+             'hists': {hist: np.asarray(rows[hist], dtype=np.float64).sum(axis=0) for hist in stats['hists']}}
+    return running_merge(stats, batch)
+
+def running_result(stats):
+    """
+    PROC: current mean & population stddev per metric, same as compute_statistics()
+          over every row folded in so far
+    RET: dict {metric: (avg, stddev)}
+    """
+    if not stats['count']:
+        return {metric: (0, 0) for metric in stats['metrics']}
+    stddev = np.sqrt(np.maximum(stats['m2'], 0) / stats['count'])
+    return {metric: (float(avg), float(dev)) for metric, avg, dev in zip(stats['metrics'], stats['mean'], stddev)}
+
+def watch_state(by=WATCH_BY, metrics=AGGREGATE_METRICS):
+    """
+    PROC: running aggregates for the whole stream & per workload group
+    RET: dict {'by', 'total', 'groups': {key tuple: running_stats()}, 'files'}
+    """
+    return {'by': tuple(by), 'metrics': tuple(metrics), 'total': running_stats(metrics), 'groups': {}, 'files': set()}
+
+def watch_fold(state, rows):
+    """
+    PROC: fold store rows into the total & their groups' aggregates
+    RET: list of group keys touched
+    """
+    running_update(state['total'], rows)
+    if not len(rows):
+        return []
+    touched = []
+    order, keys, starts, counts = _group_runs(rows, list(state['by']))
+    for start, count in zip(starts, counts):
+        key = tuple(col[start].item() for col in keys)
+        group = state['groups'].setdefault(key, running_stats(state['metrics']))
+        running_update(group, rows[order[start:start + count]])
+        touched.append(key)
+    return touched
+
+def watch_table(state, hist='read_lat_hist', percentiles=LAT_PERCENTILES):
+    """
+    PROC: current per group statistics, no rescan: mean/stddev per metric & the
+          sketch's percentiles
+    RET: structured array
+    """
+    names = [f"p{p:g}" for p in percentiles]
+    dtype = [(dim, STORE_DTYPE[dim]) for dim in state['by']] + [('count', 'i8')] \
+        + [(f"{metric}_{agg}", 'f8') for metric in state['metrics'] for agg in ('mean', 'std')] \
+        + [(name, 'f8') for name in names]
+    table = np.zeros(len(state['groups']), dtype=dtype)
+    for row, key in zip(table, sorted(state['groups'])):
+        group = state['groups'][key]
+        for dim, value in zip(state['by'], key):
+            row[dim] = value
+        row['count'] = group['count']
+        for metric, (avg, dev) in running_result(group).items():
+            row[f"{metric}_mean"], row[f"{metric}_std"] = avg, dev
+        for name, value in zip(names, hist_percentiles(group['hists'][hist], percentiles)):
+            row[name] = value
+    return table
+
+def _inotify_watch(directory):
+    """
+    PROC: inotify fd watching dir for finished writes & renames into it, via libc
+    RET: fd, None when inotify isn't available (non-linux, limits hit, etc)
+    """
+    import ctypes
+    import ctypes.util
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_IN_CLOSE_WRITE | WATCH_IN_MOVED_TO) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+def _inotify_names(fd, timeout):
+    """
+    PROC: names from pending inotify events, waits up to timeout seconds for some
+    RET: list of names
+    """
+    if not select.select([fd], [], [], timeout)[0]:
+        return []
+    try:
+        buf = os.read(fd, WATCH_IN_READ)
+    except BlockingIOError:
+        return []
+    names = []
+    pos = 0
+    while pos + WATCH_IN_EVENT.size <= len(buf):
+        _, _, _, length = WATCH_IN_EVENT.unpack_from(buf, pos)
+        start = pos + WATCH_IN_EVENT.size
+        names.append(os.fsdecode(buf[start:start + length].rstrip(b'\0')))
+        pos = start + length
+    return names
+
+def _log_mtimes(directory):
+    """
+    PROC: mtime of each non-empty file in dir
+    RET: dict {name: mtime}
+    """
+    mtimes = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file():
+                stat = entry.stat()
+                if stat.st_size:
+                    mtimes[entry.name] = stat.st_mtime
+    return mtimes
+
+def _settled_names(directory, settle_s):
+    """
+    PROC: names of non-empty files untouched for settle_s, ie: their fio has exited
+    RET: dict {name: mtime}
+    """
+    now = time.time()
+    return {name: mtime for name, mtime in _log_mtimes(directory).items() if now - mtime >= settle_s}
+
+def watch_fio_logs(directory_path, state, workers=1, on_update=None, idle_s=None, poll_s=WATCH_POLL_S,
+                   settle_s=WATCH_SETTLE_S):
+    """
+    PROC: fold the finished logs already in dir, then each new one once fio is done w/ it
+          - a --status-interval log is rewritten until fio exits, only its final doc is folded
+          - inotify close-after-write (fio exits) & moved-in when available, else polling
+          - w/o a close event a log is finished once untouched for settle_s, so are logs
+            already there but touched within settle_s, their close may predate the watch
+          - a file is folded once, rewrites of an already folded log are ignored
+          - a log w/o jobs is retried once it changes again
 
-        for job in jobs:
-            metrics = extract_job_metrics(job)
+    PARAMS:
+    - state: from watch_state(), carried across calls
+    - on_update: called w/ (state, path, rows, touched group keys) after each folded file
+    - idle_s: stop after this long w/o a new file, None == until interrupted
+
+    RET: state
+    """
+    # Watch before the scan, a log closed in between still queues its event
+    fd = _inotify_watch(directory_path)
+    if fd is None:
+        print(f"WARN: inotify unavailable, polling {directory_path} every {poll_s}s", file=sys.stderr)
+    now = time.time()
+    mtimes = _log_mtimes(directory_path)
+    settled = {name: mtime for name, mtime in mtimes.items() if now - mtime >= settle_s}
+    # Too fresh to tell if fio is done, re-checked every period until settled or closed
+    pending = {name for name in mtimes if name not in settled and fnmatch.fnmatch(name, WATCH_PATTERN)}
+    existing = sorted(os.path.join(directory_path, name) for name in settled if fnmatch.fnmatch(name, WATCH_PATTERN))
+    if existing:
+        rows, counts = _parse_fio_files(existing, workers)
+        watch_fold(state, rows)
+        state['files'].update(path for path, count in zip(existing, counts) if count)
+
+    # Logs w/o jobs by mtime, so polling doesn't reparse them every period
+    empty = {name: settled[name] for name in settled
+             if fnmatch.fnmatch(name, WATCH_PATTERN) and os.path.join(directory_path, name) not in state['files']}
+    last = time.monotonic()
+    try:
+        while idle_s is None or time.monotonic() - last < idle_s:
+            if fd is not None:
+                names = _inotify_names(fd, poll_s)
+                if pending:
+                    ready = _settled_names(directory_path, settle_s)
+                    names = list(names) + [name for name in pending if name in ready]
+            else:
+                time.sleep(poll_s)
+                names = [name for name, mtime in _settled_names(directory_path, settle_s).items()
+                         if empty.get(name) != mtime]
+            for name in sorted(set(names)):
+                pending.discard(name)
+                path = os.path.join(directory_path, name)
+                if not fnmatch.fnmatch(name, WATCH_PATTERN) or path in state['files'] or not os.path.isfile(path):
+                    continue
+                rows, _ = _ingest_fio_batch([path])
+                if not len(rows):
+                    empty[name] = os.stat(path).st_mtime
+                    continue
+                touched = watch_fold(state, rows)
+                state['files'].add(path)
+                last = time.monotonic()
+                if on_update:
+                    on_update(state, path, rows, touched)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if fd is not None:
+            os.close(fd)
+    return state
 
-            aggregated_metrics['read_bw'].append(metrics.get('read_bw', 0))
-            aggregated_metrics['read_iops'].append(metrics.get('read_iops', 0))
-            aggregated_metrics['read_latency_mean'].append(metrics.get('read_latency_mean', 0))
-            aggregated_metrics['read_latency_stddev'].append(metrics.get('read_latency_stddev', 0))
+@traced()
+def process_fio_logs(directory_path, workers=1, watch=False, on_update=None, idle_s=None):
+    """
+    PROC: all json logs in dir path
 
-            aggregated_metrics['write_bw'].append(metrics.get('write_bw', 0))
-            aggregated_metrics['write_iops'].append(metrics.get('write_iops', 0))
+    PARAMS:
+    - directory_path: dir holding fio json logs
+    - workers: process pool size for parsing, 1 == in-process, 0|None == all cores
+    - watch: keep going, folding new logs into running aggregates as they're written,
+             eg: log/ while perfio-storbench.batch.sh runs
+    - on_update, idle_s: see watch_fio_logs()
 
-    return aggregated_metrics
+    RET: dict of aggregated lists of metrics, w/ watch the watch_state() aggregates
+    """
+    if watch:
+        return watch_fio_logs(directory_path, watch_state(), workers, on_update, idle_s)
+    # TODO: more, especially rollups
+    store = build_metric_store(directory_path, workers=workers)
+    return {metric: store[metric].tolist() for metric in AGGREGATE_METRICS}
 
+@traced()
 def compute_statistics(metric_values):
     """
     PROC: Compute AVG & STD_DEV for list values
@@ -132,37 +2813,672 @@ def compute_statistics(metric_values):
     stddev = np.std(metric_values)
     return avg, stddev
 
-def compare_to_baseline(test_stats, baseline_stats, stddev_threshold):
+@traced()
+def compare_to_baseline(test_stats, baseline_stats, *, thresholds=None):
     """
-    PROC: compare stats to baselines
+    PROC: compare stats to baselines, flag a metric when its avg is worse than the
+          baseline by more than its class' min_change (REGRESS_CLASSES)
 
     PARAMS:
     - test_stats: dict of keys, eg: 'read_bw', 'read_latency_stddev', etc
     - baseline_stats: initially a dict of baseline avgs, TODO: add baseline stddev to dict
-    - stddev_threshold: var defining test-fail flag if result is > STDDEV thresh
+    - thresholds: {class: min_change} overrides, eg: {'latency': 0.15}
 
-    RET: dict containing each flagged metric from STDDEV threshhold overage evaluation
+    RET: dict containing each metric w/ its change vs baseline & flag
     """
     comparison_results = {}
     for metric, (avg, stddev) in test_stats.items():
         baseline_value = baseline_stats.get(metric)
-
-        flag = stddev >= stddev_threshold
+        change, flag = _baseline_change(metric, avg, baseline_value, thresholds)
         comparison_results[metric] = {
             "test_avg": avg,
             "test_stddev": stddev,
             "baseline": baseline_value,
+            "change": change,
             "flagged": flag
         }
 
     return comparison_results
 
-def main():
+def _baseline_change(metric, value, baseline_value, thresholds=None):
+    """
+    PROC: relative change vs a baseline & whether it's worse than the class threshold
+    RET: (change or None, flagged)
+    """
+    if not baseline_value:
+        return None, False
+    change = (value - baseline_value) / abs(baseline_value)
+    klass = REGRESS_CLASSES.get(REGRESS_METRIC_CLASS.get(metric))
+    if klass is None:
+        return change, False
+    min_change = (thresholds or {}).get(REGRESS_METRIC_CLASS[metric], klass['min_change'])
+    worse = -change if klass['higher_better'] else change
+    return change, bool(worse > min_change)
+
+def _regress_cells(base, cand, by, metric):
+    """
+    PROC: align baseline & candidate rows into per-workload cells of one metric,
+          padded to a (cells, n) matrix per side
+
+    RET: (keys structured array, base matrix, base counts, cand matrix, cand counts)
+    """
+    both = np.concatenate([np.asarray(base[by + [metric]]), np.asarray(cand[by + [metric]])])
+    side = np.repeat([0, 1], [len(base), len(cand)])
+    order, keys, starts, counts = _group_runs(both, by)
+    cell = np.repeat(np.arange(len(starts)), counts)
+    side = side[order]
+    values = np.asarray(both[metric], dtype=np.float64)[order]
+
+    key_rows = np.zeros(len(starts), dtype=[(dim, both.dtype[dim]) for dim in by])
+    for dim, col in zip(by, keys):
+        key_rows[dim] = col[starts]
+
+    mats = []
+    for flag in (0, 1):
+        pick = side == flag
+        n = np.bincount(cell[pick], minlength=len(starts))
+        mat = np.full((len(starts), max(int(n.max(initial=0)), 1)), np.nan)
+        first = np.concatenate(([0], np.cumsum(n)[:-1]))
+        slot = np.arange(pick.sum()) - np.repeat(first, n)
+        mat[cell[pick], slot] = values[pick]
+        mats += [mat, n]
+    return (key_rows,) + tuple(mats)
+
+def _row_medians(sorted_mat, n):
+    """
+    PROC: median per row of a row-sorted, NaN padded matrix holding n values per row
+    RET: array
+    """
+    n = np.broadcast_to(n, sorted_mat.shape[:-1])
+    lo = np.maximum((n - 1) // 2, 0)[..., None]
+    hi = np.maximum(n // 2, 0)[..., None]
+    return (np.take_along_axis(sorted_mat, lo, -1) + np.take_along_axis(sorted_mat, hi, -1))[..., 0] / 2.0
+
+def mann_whitney(base, n_base, cand, n_cand):
+    """
+    PROC: Mann-Whitney U per row, normal approximation w/ tie & continuity correction,
+          ranks for every cell at once from one sort of (cell, value)
+
+    PARAMS:
+    - base, cand: NaN padded (cells, n) matrices
+    - n_base, n_cand: values per row
+
+    RET: (U of cand over base, two sided p-value, Cliff's delta cand vs base)
+    """
+    cells = len(base)
+    vals = np.concatenate([base, cand], axis=1)
+    is_cand = np.concatenate([np.zeros(base.shape, bool), np.ones(cand.shape, bool)], axis=1)
+    valid = ~np.isnan(vals)
+    row = np.broadcast_to(np.arange(cells)[:, None], vals.shape)[valid]
+    vals, is_cand = vals[valid], is_cand[valid]
+
+    order = np.lexsort((vals, row))
+    row, vals, is_cand = row[order], vals[order], is_cand[order]
+    # Tie runs share the mean of their ranks, ranks restart at 1 in each cell
+    change = np.ones(len(vals), dtype=bool)
+    change[1:] = (row[1:] != row[:-1]) | (vals[1:] != vals[:-1])
+    tie_start = np.flatnonzero(change)
+    tie_len = np.diff(np.append(tie_start, len(vals)))
+    cell_start = np.searchsorted(row, np.arange(cells))
+    pos = np.arange(len(vals)) - cell_start[row]
+    tie_pos = np.repeat(pos[tie_start], tie_len)
+    ranks = tie_pos + (np.repeat(tie_len, tie_len) + 1) / 2.0
+
+    n_b = n_base.astype(np.float64)
+    n_c = n_cand.astype(np.float64)
+    rank_sum = np.bincount(row[is_cand], weights=ranks[is_cand], minlength=cells)
+    u_cand = rank_sum - n_c * (n_c + 1) / 2.0
+
+    n = n_b + n_c
+    ties = np.bincount(row[tie_start], weights=tie_len.astype(np.float64) ** 3 - tie_len, minlength=cells)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = np.sqrt(n_b * n_c / 12.0 * ((n + 1) - ties / (n * (n - 1))))
+        z = (np.abs(u_cand - n_b * n_c / 2.0) - 0.5) / sigma
+        p_value = np.where(sigma > 0, np.vectorize(math.erfc, otypes=[np.float64])(np.maximum(z, 0) / np.sqrt(2.0)), 1.0)
+        cliffs = np.where(n_b * n_c > 0, 2.0 * u_cand / (n_b * n_c) - 1.0, 0.0)
+    return u_cand, p_value, cliffs
+
+def bootstrap_median_diff(base, n_base, cand, n_cand, rounds=REGRESS_BOOTSTRAP, ci=REGRESS_CI,
+                          seed=REGRESS_SEED):
+    """
+    PROC: percentile bootstrap CI of median(cand) - median(base) per row, resampling
+          every cell together & chunked by REGRESS_BOOT_ELEMS
+
+    RET: (ci low, ci high) arrays
+    """
+    rng = np.random.default_rng(seed)
+    lo = np.full(len(base), np.nan)
+    hi = np.full(len(base), np.nan)
+    width = base.shape[1] + cand.shape[1]
+    step = max(1, REGRESS_BOOT_ELEMS // (rounds * width))
+    tail = (100.0 - ci) / 2.0
+    for start in range(0, len(base), step):
+        cut = slice(start, start + step)
+        meds = []
+        for mat, n in ((base[cut], n_base[cut]), (cand[cut], n_cand[cut])):
+            # Draw indexes < n of each row, pad slots past n stay NaN & sort last
+            draw = (rng.random((len(mat), rounds, mat.shape[1])) * np.maximum(n, 1)[:, None, None]).astype(np.int64)
+            sample = np.take_along_axis(mat[:, None, :], draw, -1)
+            sample = np.where(np.arange(mat.shape[1]) >= n[:, None, None], np.nan, sample)
+            meds.append(_row_medians(np.sort(sample, axis=-1), n[:, None]))
+        diff = meds[1] - meds[0]
+        lo[cut], hi[cut] = np.percentile(diff, [tail, 100.0 - tail], axis=1)
+    return lo, hi
+
+@traced()
+def regression_report(base, cand, by, metrics=None, thresholds=None, alpha=REGRESS_ALPHA,
+                      rounds=REGRESS_BOOTSTRAP):
+    """
+    PROC: candidate run set vs baseline run set, per metric & workload cell
+          - Mann-Whitney U p-value & Cliff's delta effect size
+          - bootstrap CI on the difference of medians
+          - regression when significant, non negligible, CI clear of 0 & the median
+            moved the wrong way by more than the class min_change
+          - the CI is only computed for cells passing the other tests, NaN elsewhere
+
+    PARAMS:
+    - base, cand: metric stores (STORE_DTYPE)
+    - by: dims defining a cell, eg: ['mode', 'bs', 'iodepth', 'numjobs']
+    - metrics: defaults to every metric in REGRESS_METRIC_CLASS
+    - thresholds: {class: min_change} overrides
+
+    RET: structured array, one row per (cell, metric), worst regressions first
+    """
+    metrics = list(metrics or REGRESS_METRIC_CLASS)
+    dims = [(dim, STORE_DTYPE[dim]) for dim in by]
+    out_dtype = dims + [('metric', 'U24'), ('n_base', 'i4'), ('n_cand', 'i4'),
+                        ('base_median', 'f8'), ('cand_median', 'f8'), ('change_pct', 'f8'),
+                        ('ci_lo_pct', 'f8'), ('ci_hi_pct', 'f8'), ('p_value', 'f8'),
+                        ('cliffs_delta', 'f8'), ('verdict', 'U12')]
+    parts = []
+    for metric in metrics:
+        klass = REGRESS_CLASSES[REGRESS_METRIC_CLASS[metric]]
+        min_change = (thresholds or {}).get(REGRESS_METRIC_CLASS[metric], klass['min_change'])
+        keys, b_mat, n_b, c_mat, n_c = _regress_cells(base, cand, list(by), metric)
+        if not len(keys):
+            continue
+        b_med = _row_medians(np.sort(b_mat, axis=1), n_b)
+        c_med = _row_medians(np.sort(c_mat, axis=1), n_c)
+        _, p_value, cliffs = mann_whitney(b_mat, n_b, c_mat, n_c)
+
+        scale = np.where(b_med != 0, np.abs(b_med), 1.0)
+        change = (c_med - b_med) / scale
+        sign = -1.0 if klass['higher_better'] else 1.0
+        # Bootstrap only cells the rank test & effect size already single out, the
+        # rest can't become significant & the resampling dominates the runtime
+        screened = (p_value < alpha) & (np.abs(cliffs) >= REGRESS_MIN_EFFECT) & (np.abs(change) > min_change)
+        ci_lo = np.full(len(keys), np.nan)
+        ci_hi = np.full(len(keys), np.nan)
+        if screened.any():
+            ci_lo[screened], ci_hi[screened] = bootstrap_median_diff(b_mat[screened], n_b[screened],
+                                                                     c_mat[screened], n_c[screened], rounds)
+        significant = screened & ((ci_lo > 0) | (ci_hi < 0))
+        verdict = np.where(significant & (sign * change > min_change), 'regression',
+                  np.where(significant & (-sign * change > min_change), 'improvement', 'ok'))
+        verdict = np.where((n_b < 2) | (n_c < 2), 'insufficient', verdict)
+
+        part = np.zeros(len(keys), dtype=out_dtype)
+        for dim, _ in dims:
+            part[dim] = keys[dim]
+        part['metric'] = metric
+        part['n_base'], part['n_cand'] = n_b, n_c
+        part['base_median'], part['cand_median'] = b_med, c_med
+        part['change_pct'] = 100.0 * change
+        part['ci_lo_pct'], part['ci_hi_pct'] = 100.0 * ci_lo / scale, 100.0 * ci_hi / scale
+        part['p_value'] = p_value
+        part['cliffs_delta'] = cliffs
+        part['verdict'] = verdict
+        # Only cells present on both sides say anything
+        parts.append(part[(n_b > 0) & (n_c > 0)])
+
+    if not parts:
+        return np.zeros(0, dtype=out_dtype)
+    report = np.concatenate(parts)
+    rank = np.array([REGRESS_VERDICTS.index(v) for v in report['verdict']])
+    return report[np.lexsort((-np.abs(report['change_pct']), rank))]
+
+def parse_args(argv=None):
+    """
+    PROC: basic options parser workflow
+    RET: argparse namespace
+    """
+    parser = argparse.ArgumentParser(description='Options for PerfIO-StorBench fio log analysis.')
+
+    parser.add_argument('logs_directory',
+                        nargs='?',
+                        type=str,
+                        default=os.environ.get('PERFIO_LOG_DIR', 'log'),
+                        help='Directory holding fio json logs, PERFIO_LOG_DIR overrides the default. [default: %(default)s]')
+
+    parser.add_argument('--workers',
+                        '-w',
+                        type=int,
+                        default=1,
+                        help='Parser processes, 0 uses every core. [default: 1]')
+
+    parser.add_argument('--recursive',
+                        '-r',
+                        action='store_true',
+                        default=False,
+                        help='Also read json logs in sub-dirs. [default: unset]')
+
+    parser.add_argument('--cache',
+                        type=str,
+                        default=None,
+                        help='Parse cache dir, unchanged logs are not re-parsed. [default: unset]')
+
+    parser.add_argument('--cache-max-mb',
+                        type=int,
+                        default=PARSE_CACHE_MAX_BYTES >> 20,
+                        help='Parse cache size bound, LRU evicted. [default: %(default)s]')
+
+    parser.add_argument('--save-store',
+                        type=str,
+                        default=None,
+                        help='Write the parsed metric store to this .npy file. [default: unset]')
+
+    parser.add_argument('--load-store',
+                        type=str,
+                        default=None,
+                        help=f"Read a saved .npy metric store, or comma list of {ARCHIVE_EXT} archives, instead of parsing logs. [default: unset]")
+
+    parser.add_argument('--archive',
+                        type=str,
+                        default=None,
+                        help=f"Pack the logs dir (metrics, clat histograms & interval logs) into this {ARCHIVE_EXT} archive. [default: unset]")
+
+    parser.add_argument('--watch',
+                        action='store_true',
+                        default=False,
+                        help='Keep folding new json logs in the logs dir into running stats, vs --baseline when set. [default: unset]')
+
+    parser.add_argument('--watch-idle',
+                        type=float,
+                        default=None,
+                        help='Stop --watch after this many seconds w/o a new log. [default: unset]')
+
+    parser.add_argument('--query',
+                        type=str,
+                        default=None,
+                        help='Metric to report per group, eg: read_clat_p99. [default: unset]')
+
+    parser.add_argument('--by',
+                        type=str,
+                        default=None,
+                        help=f"Comma list of dims to group --query by, or the --baseline gate's cells. "
+                             f"[default: {','.join(QUERY_BY)}, {','.join(REGRESS_BY)} for --baseline]")
+
+    parser.add_argument('--where',
+                        type=str,
+                        action='append',
+                        default=[],
+                        help='Row filter DIM=VAL[,VAL], repeatable, eg: --where mode=randread --where bs=4k')
+
+    parser.add_argument('--lat-pct',
+                        type=str,
+                        choices=('read', 'write'),
+                        default=None,
+                        help='Report merged clat percentiles per --by group. [default: unset]')
+
+    parser.add_argument('--interval-log',
+                        type=str,
+                        action='append',
+                        default=[],
+                        help='fio bw/lat/iops interval log to summarize, repeatable. [default: unset]')
+
+    parser.add_argument('--downsample',
+                        type=int,
+                        default=20,
+                        help='Time buckets per --interval-log summary. [default: 20]')
+
+    parser.add_argument('--plot',
+                        type=str,
+                        default=None,
+                        help=f"Render charts from the parsed results, comma list of {', '.join(PLOT_KINDS)} or all. [default: unset]")
+
+    parser.add_argument('--plot-out',
+                        type=str,
+                        default=PLOT_OUT,
+                        help='Chart output dir, holds the chart hash manifest. [default: %(default)s]')
+
+    parser.add_argument('--plot-metric',
+                        type=str,
+                        default=PLOT_METRIC,
+                        help='Store metric for qd2d bars & surface3d height, w/o a read_/write_ prefix the '
+                             'direction follows the mode. [default: %(default)s]')
+
+    parser.add_argument('--report-html',
+                        type=str,
+                        default=None,
+                        help='Build the incremental html report in this dir, w/ verdicts when --baseline is set. [default: unset]')
+
+    parser.add_argument('--pdf',
+                        action='store_true',
+                        default=False,
+                        help='Also print the --report-html report to report.pdf, needs weasyprint. [default: unset]')
+
+    parser.add_argument('--diff',
+                        type=str,
+                        nargs='+',
+                        default=None,
+                        help='Run dirs to diff, first is the reference, eg: --diff fio.hist/log.run1 fio.hist/log.run2. [default: unset]')
+
+    parser.add_argument('--top',
+                        type=int,
+                        default=DIFF_TOP,
+                        help='Largest --diff changes printed, the report file has them all. [default: %(default)s]')
+
+    parser.add_argument('--ss',
+                        type=str,
+                        default=None,
+                        help='Steady-state check per log, fio ss= syntax, eg: bw_slope:1%%, iops:10%%. [default: unset]')
+
+    parser.add_argument('--ss-dur',
+                        type=float,
+                        default=SS_DUR_S,
+                        help='Steady-state window seconds. [default: %(default)s]')
+
+    parser.add_argument('--ss-ramp',
+                        type=float,
+                        default=SS_RAMP_S,
+                        help='Leading seconds skipped by the steady-state check. [default: %(default)s]')
+
+    parser.add_argument('--db',
+                        type=str,
+                        default=None,
+                        help='sqlite results db, parsed logs are bulk loaded into it. [default: unset]')
+
+    parser.add_argument('--db-query',
+                        type=str,
+                        default=None,
+                        help='Metric to report per --by group from the --db history, no logs read. [default: unset]')
+
+    parser.add_argument('--db-bucket',
+                        type=str,
+                        choices=tuple(RESULTS_DB_BUCKETS),
+                        default=None,
+                        help='Add a time bucket to --db-query for trends. [default: unset]')
+
+    parser.add_argument('--since',
+                        type=str,
+                        default=None,
+                        help='Only --db-query results at or after this date, YYYY-MM-DD. [default: unset]')
+
+    parser.add_argument('--baseline',
+                        type=str,
+                        default=None,
+                        help='Baseline run set, a logs dir, saved .npy store or archives; regressions vs it are reported per --by cell & exit 1 when any is found, or when no cell can be compared. [default: unset]')
+
+    parser.add_argument('--threshold',
+                        type=str,
+                        action='append',
+                        default=[],
+                        help=f"Min relative change per metric class, CLASS=FRACTION, repeatable; classes: {', '.join(REGRESS_CLASSES)}. [default: throughput=0.05, latency=0.10, variability=0.25]")
+
+    parser.add_argument('--agg',
+                        type=str,
+                        default='mean',
+                        help='Group reduction: mean, sum, min, max, std, median, pNN. [default: mean]')
+
+    parser.add_argument('--trace',
+                        type=str,
+                        nargs='?',
+                        const=TRACE_OUT,
+                        default=None,
+                        help=f"Time every stage & file, write chrome trace-event json & print a summary table. [default: unset, {TRACE_OUT} w/o a path]")
+
+    parser.add_argument('--profile',
+                        type=int,
+                        nargs='?',
+                        const=TRACE_PROFILE_HZ,
+                        default=None,
+                        help=f"Also sample the python stack this many times per cpu second, implies --trace. [default: unset, {TRACE_PROFILE_HZ} w/o a rate]")
+
+    return parser.parse_args(argv)
+
+def _parse_where(items):
+    """
+    PROC: --where DIM=VAL[,VAL] strings to store_filter() kwargs
+    RET: dict
+    """
+    where = {}
+    for item in items:
+        dim, _, raw = item.partition('=')
+        if dim not in STORE_DTYPE.names:
+            raise SystemExit(f"ERROR: unknown dim in --where: {dim}")
+        values = raw.split(',')
+        if STORE_DTYPE[dim].kind == 'i' and dim != 'bs':
+            values = [int(v) for v in values]
+        where[dim] = values[0] if len(values) == 1 else values
+    return where
+
+def _parse_by(value, default):
+    """
+    PROC: --by comma list, the caller's default when unset
+    RET: list
+    """
+    by = [dim for dim in value.split(',') if dim] if value else list(default)
+    unknown = [dim for dim in by if dim not in STORE_DTYPE.names]
+    if unknown:
+        raise SystemExit(f"ERROR: unknown dim in --by: {', '.join(unknown)}")
+    return by
+
+def format_store_table(rows):
+    """
+    PROC: render structured rows as an aligned text table
+    RET: str
+    """
+    names = rows.dtype.names
+    cells = [[f"{v:.2f}" if isinstance(v, float) else str(v) for v in row.tolist()] for row in rows]
+    widths = [max([len(n)] + [len(c[i]) for c in cells]) for i, n in enumerate(names)]
+    lines = ["  ".join(n.ljust(w) for n, w in zip(names, widths)).rstrip()]
+    lines += ["  ".join(c.ljust(w) for c, w in zip(cell, widths)).rstrip() for cell in cells]
+    return "\n".join(lines)
+
+def main(argv=None):
     # TODO: import usual argparser/confparse stuff from rfc1918 shared libs
-    # TODO: put logs dir var into arg parse && conf file
-    # Process... the... logs...
-    logs_directory = "path/to/logs"
-    aggregated_metrics = process_fio_logs(logs_directory)
+    # TODO: put logs dir var into conf file
+    args = parse_args(argv)
+    if not (args.trace or args.profile):
+        return run_analysis(args)
+
+    # Whole run under one span, the trace is written even when a gate exits non-zero
+    trace_start(args.profile)
+    try:
+        with trace_span('main', 'run'):
+            return run_analysis(args)
+    finally:
+        path = args.trace or TRACE_OUT
+        summary, files, frames = trace_stop(path)
+        print(format_store_table(summary), file=sys.stderr)
+        if len(files):
+            print(f"\n{format_store_table(files)}", file=sys.stderr)
+        if len(frames):
+            print(f"\n{format_store_table(frames)}", file=sys.stderr)
+        print(f"trace in [{path}]" + (f", sampled stacks in [{os.path.splitext(path)[0]}.folded]" if len(frames) else ""),
+              file=sys.stderr)
+
+def run_analysis(args):
+    """
+    PROC: everything main() does once the args are parsed
+    RET: None, gates raise SystemExit(1)
+    """
+    # Steady-state over interval logs, or the snapshot series of each json log
+    if args.ss:
+        sources = args.interval_log or sorted(glob.glob(f"{args.logs_directory}/*.json"))
+        table = steady_state_table(sources, args.ss, args.ss_dur, args.ss_ramp)
+        print(format_store_table(table))
+        unsettled = table['source'][~table['converged']]
+        if len(unsettled):
+            print(f"WARN: never reached steady state ({args.ss}): {', '.join(unsettled)}")
+        return
+
+    # Per-interval logs are their own thing, summarize & bail
+    if args.interval_log and not args.plot:
+        for filepath in args.interval_log:
+            log = load_fio_interval_log(filepath, workers=args.workers)
+            print(f"{filepath}: {len(log)} rows")
+            print(format_store_table(downsample_interval_log(log, args.downsample)))
+        return
+
+    # History from the results db, no logs involved
+    if args.db_query:
+        if not args.db:
+            raise SystemExit("ERROR: --db-query needs --db")
+        conn = open_results_db(args.db)
+        try:
+            since_ms = time.mktime(time.strptime(args.since, '%Y-%m-%d')) * 1000 if args.since else None
+            by = _parse_by(args.by, QUERY_BY)
+            agg = {'mean': 'avg'}.get(args.agg, args.agg)
+            print(format_store_table(results_db_query(conn, args.db_query, by, _parse_where(args.where),
+                                                      agg, since_ms, bucket=args.db_bucket)))
+        finally:
+            conn.close()
+        return
+
+    # Run-to-run diff, job options & metrics of every run vs the first
+    if args.diff:
+        if len(args.diff) < 2:
+            raise SystemExit("ERROR: --diff needs at least two run dirs")
+        where = _parse_where(args.where)
+        stores = [store_filter(build_metric_store(run_dir, workers=args.workers, recursive=args.recursive,
+                                                  cache=args.cache, cache_max_bytes=args.cache_max_mb << 20), **where)
+                  for run_dir in args.diff]
+        changed = options_diff(args.diff, args.recursive, args.workers)
+        report, unmatched = run_diff(stores, args.diff)
+        with open("perfio-storbench.diff-report.out", "w") as out:
+            for title, rows in (("job options", changed), ("metrics", report), ("unmatched", unmatched)):
+                out.write(f"# {title}\n{format_store_table(rows)}\n\n")
+        if len(changed):
+            print(format_store_table(changed))
+        print(format_store_table(report[:args.top]))
+        print(f"{len(changed)} option changes, {len(report)} metric deltas, {len(unmatched)} unmatched cells, "
+              f"see report in [perfio-storbench.diff-report.out]")
+        return
+
+    thresholds = {}
+    for item in args.threshold:
+        klass, _, value = item.partition('=')
+        if klass not in REGRESS_CLASSES:
+            raise SystemExit(f"ERROR: unknown metric class in --threshold: {klass}")
+        thresholds[klass] = float(value)
+
+    # Long-lived: running stats over logs as they land, vs the baseline's when given
+    if args.watch:
+        baseline_stats = None
+        if args.baseline:
+            base = load_baseline_store(args.baseline, args.workers, args.recursive)
+            # Same WATCH_BY groups as the live side, a 4k randread is only held to 4k randread
+            baseline_stats = watch_state()
+            watch_fold(baseline_stats, base)
+
+        def on_update(state, path, rows, touched):
+            stats = running_result(state['total'])
+            line = ", ".join(f"{metric} = {avg:.2f}±{dev:.2f}" for metric, (avg, dev) in stats.items())
+            print(f"{os.path.basename(path)}: {len(rows)} jobs, {state['total']['count']} total: {line}")
+            if baseline_stats is None:
+                return
+            for key in touched:
+                if key not in baseline_stats['groups']:
+                    continue
+                base_avg = {metric: avg for metric, (avg, _) in running_result(baseline_stats['groups'][key]).items()}
+                group_stats = running_result(state['groups'][key])
+                compared = compare_to_baseline(group_stats, base_avg, thresholds=thresholds)
+                flagged = [metric for metric, result in compared.items() if result['flagged']]
+                if flagged:
+                    print(f"WARN: {'/'.join(map(str, key))} worse than baseline: {', '.join(flagged)}")
+
+        state = process_fio_logs(args.logs_directory, args.workers, watch=True, on_update=on_update,
+                                 idle_s=args.watch_idle)
+        print(format_store_table(watch_table(state)))
+        return
+
+    # Pack a run dir into one compact archive, nothing else to do w/ it
+    if args.archive:
+        bytes_in, bytes_out = archive_run(args.logs_directory, args.archive, args.workers, args.recursive,
+                                          cache=args.cache, cache_max_bytes=args.cache_max_mb << 20)
+        print(f"{bytes_in / 1048576:.1f} MB -> {bytes_out / 1048576:.2f} MB "
+              f"({bytes_out / max(bytes_in, 1):.1%}) [{args.archive}]")
+        return
+
+    # Process... the... logs... or reuse a store parsed earlier
+    if args.load_store:
+        store = load_saved_store(args.load_store)
+    else:
+        store = build_metric_store(args.logs_directory, workers=args.workers, recursive=args.recursive,
+                                   cache=args.cache, cache_max_bytes=args.cache_max_mb << 20)
+    if args.save_store:
+        save_metric_store(store, args.save_store)
+    if args.db:
+        conn = open_results_db(args.db)
+        try:
+            results_db_load(conn, store)
+        finally:
+            conn.close()
+
+    # Charts from the parsed store, unchanged inputs keep their existing file
+    if args.plot:
+        kinds = PLOT_KINDS if args.plot == 'all' else args.plot.split(',')
+        unknown = set(kinds) - set(PLOT_KINDS)
+        if unknown:
+            raise SystemExit(f"ERROR: unknown chart kind in --plot: {', '.join(sorted(unknown))}")
+        rows = store_filter(store, **_parse_where(args.where))
+        # Direction-less names resolve per mode, each mode charted must have its column
+        resolved = {_plot_metric(args.plot_metric, mode) for mode in np.unique(rows['mode']).tolist() or ['read']}
+        if not resolved <= set(STORE_METRICS):
+            both = tuple(metric[5:] for metric in STORE_METRICS
+                         if metric.startswith('read_') and f"write_{metric[5:]}" in STORE_METRICS)
+            raise SystemExit(f"ERROR: unknown metric in --plot-metric: {args.plot_metric}, "
+                             f"one of: {', '.join(STORE_METRICS + both)}")
+        specs = plot_specs(rows, kinds, args.plot_metric, interval_logs=args.interval_log)
+        written, skipped, elapsed = render_charts(specs, args.plot_out, args.workers)
+        print(f"{written} charts rendered, {skipped} unchanged, {elapsed:.2f}s -> [{args.plot_out}]")
+        return
+
+    # Slice & group instead of the baseline report, eg: p99 read lat by iodepth
+    if args.query:
+        if args.query not in STORE_METRICS:
+            raise SystemExit(f"ERROR: unknown metric in --query: {args.query}, one of: {', '.join(STORE_METRICS)}")
+        rows = store_filter(store, **_parse_where(args.where))
+        print(format_store_table(store_groupby(rows, _parse_by(args.by, QUERY_BY), args.query, args.agg)))
+        return
+    if args.lat_pct:
+        rows = store_filter(store, **_parse_where(args.where))
+        by = _parse_by(args.by, QUERY_BY)
+        print(format_store_table(store_latency_percentiles(rows, by, f"{args.lat_pct}_lat_hist")))
+        return
+
+    baseline = None
+    if args.baseline:
+        baseline = load_baseline_store(args.baseline, args.workers, args.recursive, args.cache,
+                                       args.cache_max_mb << 20)
+
+    # Sectioned html/pdf report, only sections whose inputs changed are re-rendered
+    if args.report_html:
+        built, reused, regressions, elapsed = build_report(store, args.report_html, baseline, thresholds,
+                                                           args.workers, args.pdf)
+        print(f"{built} sections built, {reused} unchanged, {elapsed:.2f}s -> [{args.report_html}/index.html]")
+        if regressions:
+            print(f"{regressions} regressions vs baseline [{args.baseline}]")
+            raise SystemExit(1)
+        return
+
+    # Baseline run set given, gate on the statistical comparison instead of static values
+    if baseline is not None:
+        by = _parse_by(args.by, REGRESS_BY)
+        report = regression_report(baseline, store, by, thresholds=thresholds)
+        if not len(report):
+            raise SystemExit(f"ERROR: no {','.join(by)} cell is in both the baseline & this run, nothing to gate on")
+        with open("perfio-storbench.regress-report.out", "w") as out:
+            out.write(format_store_table(report) + "\n")
+        flagged = report[report['verdict'] == 'regression']
+        print(format_store_table(flagged) if len(flagged) else "No significant regressions")
+        print(f"{len(flagged)} regressions in {len(report)} cells, see report in [perfio-storbench.regress-report.out]")
+        if len(flagged):
+            raise SystemExit(1)
+        return
+
+    aggregated_metrics = {metric: store[metric].tolist() for metric in AGGREGATE_METRICS}
 
     # Evaluate aggregated metrics, otherwise ignore
     test_stats = {}
@@ -195,27 +3511,29 @@ def main():
 	'write_latency_stddev':0      # TBD ...
     }
 
-    # STDDEV Threshold for failures
-    stddev_threshold = 50  # TODO: expand functionality for variable STDDEV w/ test criterias
-
-    # Generate comparisons
+    # Generate comparisons, per metric class thresholds (REGRESS_CLASSES, --threshold)
     # TODO: account for additional workflows
-    comparison_results = compare_to_baseline(test_stats, baseline_stats, stddev_threshold)
+    comparison_results = compare_to_baseline(test_stats, baseline_stats, thresholds=thresholds)
 
     #
-    # TODO: pull the PDF report generator code from RFC1918
-    # TODO: hook to fio-plot for generating graphs from the logs & include in report
-    # TODO: grab db_conn lib, avoid MySQL's stupid locked-dir upload requirement in 8.x or add eval check before SQL exec
-    # TODO: use ANSI SQL so that ClickHouse works without alterations to query
     # TODO: option flag to push report elsewhere via 'rclone', eg S3 or B2 bucket, others
     with open("perfio-storbench.comp-report.out", "w") as report:
         for metric, result in comparison_results.items():
             line = (f"{metric}: Test Avg = {result['test_avg']:.2f}, "
                     f"Test STDDEV = {result['test_stddev']:.2f}, "
                     f"Baseline = {result['baseline']}, "
+                    f"Change = {'n/a' if result['change'] is None else format(result['change'], '+.2%')}, "
                     f"Flagged = {result['flagged']}\n")
             report.write(line)
 
+        # Tail latency of the merged population across every job & file
+        for hist in STORE_HISTS:
+            merged = store_latency_percentiles(store, [], hist)
+            if not len(merged) or not merged['ios'][0]:
+                continue
+            pcts = ", ".join(f"{name} = {merged[name][0]:.2f}" for name in merged.dtype.names[2:])
+            report.write(f"{hist.replace('_hist', '_pct')}: {pcts}\n")
+
     print("Evaluation complete, see report in [perfio-storbench.comp-report.out]")
 
 if __name__ == "__main__":
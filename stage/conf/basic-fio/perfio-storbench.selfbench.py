@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+'''
+[───────────────────────────────────────────────────────────────────────────────]
+[ Purpose    ─» Analyzer self-benchmark & synthetic fio result generator
+[ Filename   ─» perfio-storbench.selfbench.py
+[ Project    ─» PerfIO-StorBench
+[ Author     ─» Eva Winterschön
+[ License    ─» BSD-6-Clause
+[ Date-INIT  ─» 2024-0802
+[ Date-RMOD  ─» 2024-1110
+[ Version    ─» 0.4.6
+[───────────────────────────────────────────────────────────────────────────────]
+[ Requires
+[ ╰───────────» python3
+[           ╰─» numpy
+[           ╰─» perfio-storbench.analyze.py (same dir)
+[───────────────────────────────────────────────────────────────────────────────]
+[ References
+[ ╰───────────» ⌄unten⌄
+[ • fio JSON ─» [Output](https://fio.readthedocs.io/en/latest/fio_doc.html#json-output)
+[ • fio Logs ─» [Log File Formats](https://fio.readthedocs.io/en/latest/fio_doc.html#log-file-formats)
+[───────────────────────────────────────────────────────────────────────────────]
+'''
+# Erforderlich Modules
+import argparse
+import importlib.util
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+
+# Analyzer is a hyphenated script, load it by path; registered in sys.modules so
+# its process pool can pickle the worker functions
+ANALYZER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perfio-storbench.analyze.py')
+ANALYZER_NAME = 'perfio_storbench_analyze'
+
+# Synthetic workload space, same naming as the batch & bench-fio layouts
+GEN_MODES = ('randread', 'randwrite', 'read', 'write', 'randrw')
+GEN_BLOCK_SIZES = ('4k', '64k', '1m')
+GEN_IODEPTHS = (1, 4, 16, 64)
+GEN_NUMJOBS = (1, 4, 16)
+GEN_ENGINES = ('libaio', 'io_uring', 'posixaio')
+GEN_PERCENTILES = ('1.000000', '5.000000', '10.000000', '20.000000', '30.000000', '40.000000',
+                   '50.000000', '60.000000', '70.000000', '80.000000', '90.000000', '95.000000',
+                   '99.000000', '99.500000', '99.900000', '99.950000', '99.990000')
+GEN_FIO_VERSION = 'fio-3.36'
+GEN_SEED = 20240802
+GEN_RUNTIME_MS = 300000
+# Bump when generated paths or docs change, baselines of another version aren't comparable
+GEN_VERSION = 2
+
+BENCH_SCALES = (10, 1000)
+BENCH_STAGES = ('ingest', 'legacy_load', 'aggregate', 'compare', 'report', 'interval')
+# Stage slower than its saved baseline by more than this fails the run
+BENCH_TOLERANCE = 0.20
+# ...and by more than this many seconds, sub-ms stages are all noise
+BENCH_MIN_DELTA_S = 0.05
+# Best of N per stage
+BENCH_REPEAT = 3
+BENCH_INTERVAL_ROWS = 1000000
+
+def load_analyzer():
+    """
+    PROC: import perfio-storbench.analyze.py as a module
+    RET: module
+    """
+    if ANALYZER_NAME in sys.modules:
+        return sys.modules[ANALYZER_NAME]
+    spec = importlib.util.spec_from_file_location(ANALYZER_NAME, ANALYZER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[ANALYZER_NAME] = module
+    spec.loader.exec_module(module)
+    return module
+
+def _gen_lat(rng, mean_ns, n_ios):
+    """
+    PROC: fio style latency block, lognormal so the percentile tail looks real
+    RET: dict
+    """
+    sigma = 0.6
+    mu = np.log(mean_ns) - sigma ** 2 / 2
+    pcts = np.exp(mu + sigma * np.sqrt(2) * _erfinv(2 * np.array([float(p) for p in GEN_PERCENTILES]) / 100 - 1))
+    # fio reports percentiles on its histogram bucket edges, integers in ns
+    return {
+        'min': int(mean_ns * 0.2),
+        'max': int(pcts[-1] * 3),
+        'mean': float(mean_ns),
+        'stddev': float(mean_ns * np.sqrt(np.exp(sigma ** 2) - 1)),
+        'N': int(n_ios),
+        'percentile': {p: int(v) for p, v in zip(GEN_PERCENTILES, pcts)},
+    }
+
+def _erfinv(y):
+    """
+    PROC: inverse error function, Winitzki's approximation is plenty for synthetic data
+    RET: array
+    """
+    a = 0.147
+    ln = np.log(1 - y ** 2)
+    first = 2 / (np.pi * a) + ln / 2
+    return np.sign(y) * np.sqrt(np.sqrt(first ** 2 - ln / a) - first)
+
+def _gen_dir(rng, active, bs_bytes, iodepth, numjobs, runtime_ms):
+    """
+    PROC: one read/write/trim direction block of a fio job
+    RET: dict
+    """
+    if not active:
+        return {'io_bytes': 0, 'io_kbytes': 0, 'bw_bytes': 0, 'bw': 0, 'iops': 0.0, 'runtime': 0,
+                'total_ios': 0, 'short_ios': 0, 'drop_ios': 0,
+                'slat_ns': {'min': 0, 'max': 0, 'mean': 0.0, 'stddev': 0.0, 'N': 0},
+                'clat_ns': {'min': 0, 'max': 0, 'mean': 0.0, 'stddev': 0.0, 'N': 0},
+                'lat_ns': {'min': 0, 'max': 0, 'mean': 0.0, 'stddev': 0.0, 'N': 0},
+                'bw_min': 0, 'bw_max': 0, 'bw_agg': 0.0, 'bw_mean': 0.0, 'bw_dev': 0.0, 'bw_samples': 0,
+                'iops_min': 0, 'iops_max': 0, 'iops_mean': 0.0, 'iops_stddev': 0.0, 'iops_samples': 0}
+    outstanding = iodepth * numjobs
+    # Little's law on a device w/ ~80us service time & a throughput ceiling
+    iops = min(outstanding / 80e-6, 2.5e9 / bs_bytes, 900000.0) * rng.uniform(0.9, 1.1)
+    lat_ns = outstanding / iops * 1e9
+    total_ios = int(iops * runtime_ms / 1000)
+    io_bytes = total_ios * bs_bytes
+    bw_kb = int(io_bytes / 1024 / (runtime_ms / 1000))
+    clat = _gen_lat(rng, lat_ns * 0.97, total_ios)
+    return {
+        'io_bytes': io_bytes,
+        'io_kbytes': io_bytes >> 10,
+        'bw_bytes': bw_kb * 1024,
+        'bw': bw_kb,
+        'iops': float(iops),
+        'runtime': runtime_ms,
+        'total_ios': total_ios,
+        'short_ios': 0,
+        'drop_ios': 0,
+        'slat_ns': {'min': 300, 'max': 90000, 'mean': lat_ns * 0.03, 'stddev': lat_ns * 0.01, 'N': total_ios},
+        'clat_ns': clat,
+        'lat_ns': {k: clat[k] for k in ('min', 'max', 'mean', 'stddev', 'N')},
+        'bw_min': int(bw_kb * 0.8),
+        'bw_max': int(bw_kb * 1.2),
+        'bw_agg': 100.0,
+        'bw_mean': float(bw_kb),
+        'bw_dev': bw_kb * 0.05,
+        'bw_samples': runtime_ms // 500,
+        'iops_min': int(iops * 0.8),
+        'iops_max': int(iops * 1.2),
+        'iops_mean': float(iops),
+        'iops_stddev': iops * 0.05,
+        'iops_samples': runtime_ms // 500,
+    }
+
+def gen_job(rng, jobname, mode, bs, iodepth, numjobs, engine, target, runtime_ms=GEN_RUNTIME_MS):
+    """
+    PROC: one fio job entry w/ job options, per direction stats & percentile blocks
+    RET: dict
+    """
+    an = load_analyzer()
+    bs_bytes = an.parse_fio_size(bs)
+    reads = mode in ('randread', 'read', 'randrw', 'rw', 'readwrite')
+    writes = mode in ('randwrite', 'write', 'randrw', 'rw', 'readwrite')
+    return {
+        'jobname': jobname,
+        'groupid': 0,
+        'error': 0,
+        'eta': 0,
+        'elapsed': runtime_ms // 1000 + 1,
+        'job options': {
+            'name': jobname,
+            'filename': target,
+            'rw': mode,
+            'bs': bs,
+            'iodepth': str(iodepth),
+            'numjobs': str(numjobs),
+            'ioengine': engine,
+            'direct': '1',
+            'runtime': str(runtime_ms // 1000),
+            'time_based': '',
+        },
+        'read': _gen_dir(rng, reads, bs_bytes, iodepth, numjobs, runtime_ms),
+        'write': _gen_dir(rng, writes, bs_bytes, iodepth, numjobs, runtime_ms),
+        'trim': _gen_dir(rng, False, bs_bytes, iodepth, numjobs, runtime_ms),
+        'sync': {'total_ios': 0, 'lat_ns': {'min': 0, 'max': 0, 'mean': 0.0, 'stddev': 0.0, 'N': 0}},
+        'job_runtime': runtime_ms,
+        'usr_cpu': float(rng.uniform(1, 20)),
+        'sys_cpu': float(rng.uniform(5, 40)),
+        'ctx': int(rng.integers(1000, 10 ** 7)),
+        'majf': 0,
+        'minf': int(rng.integers(10, 1000)),
+        'iodepth_level': {'1': 0.1, '2': 0.1, '4': 0.1, '8': 0.1, '16': 0.1, '32': 0.1, '>=64': 99.4},
+        'latency_us': {k: 0.0 for k in ('2', '4', '10', '20', '50', '100', '250', '500', '750', '1000')},
+        'latency_ms': {k: 0.0 for k in ('2', '4', '10', '20', '50', '100', '250', '500', '750', '1000', '2000', '>=2000')},
+    }
+
+def _scale_job(job, fraction, elapsed_ms):
+    """
+    PROC: cumulative counters of a job part way through, for --status-interval snapshots
+    RET: dict
+    """
+    part = json.loads(json.dumps(job))
+    part['job_runtime'] = elapsed_ms
+    for direction in ('read', 'write', 'trim'):
+        io = part[direction]
+        for key in ('io_bytes', 'io_kbytes', 'total_ios'):
+            io[key] = int(io[key] * fraction)
+        io['runtime'] = elapsed_ms if io['runtime'] else 0
+        for lat in ('clat_ns', 'lat_ns', 'slat_ns'):
+            io[lat]['N'] = io['total_ios']
+    return part
+
+def gen_doc(jobs, timestamp_ms, global_options=None):
+    """
+    PROC: top level fio json document
+    RET: dict
+    """
+    return {
+        'fio version': GEN_FIO_VERSION,
+        'timestamp': timestamp_ms // 1000,
+        'timestamp_ms': timestamp_ms,
+        'time': time.strftime('%a %b %d %H:%M:%S %Y', time.gmtime(timestamp_ms // 1000)),
+        'global options': global_options or {'group_reporting': '1', 'clocksource': 'cpu'},
+        'jobs': jobs,
+        'disk_util': [{'name': 'nvme0n1', 'read_ios': 0, 'write_ios': 0, 'util': 99.5}],
+    }
+
+def gen_fio_logs(out_dir, files, layout='bench', snapshots=1, jobs_per_file=1, seed=GEN_SEED):
+    """
+    PROC: write synthetic fio json results
+
+    PARAMS:
+    - files: how many result files
+    - layout: 'bench' -> <target>-<engine>/<bs>/<mode>-<qd>-<nj>.json (bench-fio)
+              'batch' -> perfio.<host>.<job>.log.json (perfio-storbench.batch.sh)
+    - snapshots: >1 writes that many cumulative --status-interval docs per file,
+                 the last one is the final summary
+    - jobs_per_file: job entries per document (group_reporting off)
+
+    RET: list of file paths, all distinct
+    """
+    rng = np.random.default_rng(seed)
+    paths = []
+    start_ms = 1730000000000
+    for index in range(files):
+        mode = GEN_MODES[index % len(GEN_MODES)]
+        bs = GEN_BLOCK_SIZES[(index // len(GEN_MODES)) % len(GEN_BLOCK_SIZES)]
+        iodepth = GEN_IODEPTHS[(index // 15) % len(GEN_IODEPTHS)]
+        numjobs = GEN_NUMJOBS[(index // 60) % len(GEN_NUMJOBS)]
+        engine = GEN_ENGINES[(index // 180) % len(GEN_ENGINES)]
+        rep = index // 540
+        target = f"/dev/nvme{rep % 4}n1"
+        if layout == 'bench':
+            # Engines & repeats past the grid land under their own target dirs, file names
+            # stay bench-fio's & never collide
+            path = os.path.join(out_dir, f"nvme{rep}n1-{engine}", bs, f"{mode}-{iodepth}-{numjobs}.json")
+            jobname = mode
+        else:
+            jobname = f"perfio_{mode}_{bs}_qd{iodepth}_nj{numjobs}_{index}"
+            path = os.path.join(out_dir, f"perfio.selfbench.{jobname}.log.json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        jobs = [gen_job(rng, jobname, mode, bs, iodepth, numjobs, engine, target)
+                for _ in range(jobs_per_file)]
+        ts_ms = start_ms + index * (GEN_RUNTIME_MS + 5000)
+        with open(path, 'w') as f:
+            for snap in range(1, snapshots + 1):
+                fraction = snap / snapshots
+                elapsed = int(GEN_RUNTIME_MS * fraction)
+                doc_jobs = jobs if snap == snapshots else [_scale_job(job, fraction, elapsed) for job in jobs]
+                f.write(json.dumps(gen_doc(doc_jobs, ts_ms - GEN_RUNTIME_MS + elapsed), indent=2))
+                f.write('\n')
+        paths.append(path)
+    return paths
+
+def gen_interval_log(path, rows, kind='lat', seed=GEN_SEED):
+    """
+    PROC: fio write_{bw,lat,iops}_log style file, 'msec, value, ddir, bs, offset, prio'
+    RET: path
+    """
+    rng = np.random.default_rng(seed)
+    t_ms = np.sort(rng.integers(0, GEN_RUNTIME_MS, rows))
+    if kind == 'lat':
+        values = rng.lognormal(np.log(80000), 0.6, rows).astype(np.int64)
+    elif kind == 'bw':
+        values = rng.normal(1500000, 50000, rows).astype(np.int64)
+    else:
+        values = rng.normal(350000, 10000, rows).astype(np.int64)
+    ddir = rng.integers(0, 2, rows)
+    offset = rng.integers(0, 1 << 30, rows) * 4096
+    table = np.column_stack([t_ms, values, ddir, np.full(rows, 4096), offset, np.zeros(rows, dtype=np.int64)])
+    np.savetxt(path, table, fmt='%d', delimiter=', ')
+    return path
+
+def _dir_bytes(paths):
+    """
+    PROC: total size of files
+    RET: int
+    """
+    return sum(os.path.getsize(path) for path in paths)
+
+def _run_stage(func):
+    """
+    PROC: run one stage in a forked child so its peak RSS is its own, the child
+          reports wall time back over a pipe & the parent reaps it w/ wait4
+    RET: (seconds, peak rss KiB)
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        code = 0
+        try:
+            start = time.perf_counter()
+            func()
+            os.write(write_fd, repr(time.perf_counter() - start).encode())
+        except BaseException as err:
+            os.write(write_fd, f"ERROR {err!r}".encode())
+            code = 1
+        finally:
+            os.close(write_fd)
+            os._exit(code)
+    os.close(write_fd)
+    with os.fdopen(read_fd, 'rb') as pipe:
+        message = pipe.read().decode()
+    _, status, rusage = os.wait4(pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0 or message.startswith('ERROR'):
+        raise SystemExit(f"ERROR: stage failed: {message}")
+    return float(message), rusage.ru_maxrss
+
+def bench_scale(work_dir, files, workers=1, snapshots=1, jobs_per_file=1, repeat=BENCH_REPEAT):
+    """
+    PROC: generate one data set & time every analyzer stage on it
+
+    PARAMS:
+    - work_dir: scratch dir, the data set is written below it
+    - files: synthetic result files
+    - workers: analyzer parse pool size
+    - repeat: runs per stage, the fastest one is kept
+
+    RET: list of result dicts {'scale', 'stage', 'seconds', 'files_s', 'mb_s', 'rss_kb'}
+    """
+    an = load_analyzer()
+    data_dir = os.path.join(work_dir, f"scale-{files}")
+    shutil.rmtree(data_dir, ignore_errors=True)
+    # Rates are per distinct file on disk, the same set the store ingest globs
+    paths = list(dict.fromkeys(gen_fio_logs(data_dir, files, 'bench', snapshots, jobs_per_file)))
+    nbytes = _dir_bytes(paths)
+    interval_path = os.path.join(work_dir, 'perfio_lat.1.log')
+    if not os.path.exists(interval_path):
+        gen_interval_log(interval_path, BENCH_INTERVAL_ROWS)
+    store_path = os.path.join(work_dir, f"scale-{files}.npy")
+
+    def ingest():
+        store = an.build_metric_store(data_dir, workers=workers, recursive=True)
+        an.save_metric_store(store, store_path)
+
+    def legacy_load():
+        # the per-file path the original loop took, load + extract per job
+        for path in paths:
+            for job in an.load_fio_json(path).get('jobs', []):
+                an.extract_job_metrics(job)
+
+    def aggregate():
+        store = an.load_metric_store(store_path, mmap=False)
+        for metric in an.AGGREGATE_METRICS:
+            an.compute_statistics(store[metric])
+        an.store_groupby(store, ['mode', 'bs', 'iodepth', 'numjobs'], 'read_iops', 'p99')
+        an.store_latency_percentiles(store, ['mode', 'bs'], 'read_lat_hist')
+
+    def compare():
+        store = an.load_metric_store(store_path, mmap=False)
+        test_stats = {metric: an.compute_statistics(store[metric]) for metric in an.AGGREGATE_METRICS}
+        an.compare_to_baseline(test_stats, {metric: 1.0 for metric in an.AGGREGATE_METRICS})
+        candidate = store.copy()
+        candidate['read_iops'] *= 0.9
+        an.regression_report(store, candidate, ['mode', 'bs', 'iodepth'])
+
+    def report():
+        # the whole default cli path, report written into the scratch dir
+        os.chdir(work_dir)
+        with open(os.devnull, 'w') as devnull:
+            sys.stdout = devnull
+            an.main([data_dir, '--recursive', '--workers', str(workers)])
+
+    def interval():
+        an.load_fio_interval_log(interval_path, workers=workers)
+
+    stages = {'ingest': (ingest, len(paths), nbytes),
+              'legacy_load': (legacy_load, len(paths), nbytes),
+              'aggregate': (aggregate, len(paths), 0),
+              'compare': (compare, len(paths), 0),
+              'report': (report, len(paths), nbytes),
+              'interval': (interval, 0, os.path.getsize(interval_path))}
+    results = []
+    for stage in BENCH_STAGES:
+        func, nfiles, size = stages[stage]
+        runs = [_run_stage(func) for _ in range(max(repeat, 1))]
+        seconds = min(run[0] for run in runs)
+        rss_kb = max(run[1] for run in runs)
+        results.append({
+            'scale': files,
+            'stage': stage,
+            'seconds': round(seconds, 4),
+            'files_s': round(nfiles / seconds, 1) if nfiles and seconds else 0.0,
+            'mb_s': round(size / 1048576 / seconds, 1) if size and seconds else 0.0,
+            'rss_kb': rss_kb,
+        })
+    shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+def compare_to_saved(results, baseline_path, tolerance=BENCH_TOLERANCE, min_delta_s=BENCH_MIN_DELTA_S):
+    """
+    PROC: flag stages slower than a saved baseline run by more than tolerance & min_delta_s
+    RET: list of (scale, stage, baseline seconds, seconds, change)
+    """
+    with open(baseline_path, 'r') as f:
+        saved = json.load(f)
+    if saved.get('gen_version', 1) != GEN_VERSION:
+        raise SystemExit(f"ERROR: {baseline_path} was made from another data generator "
+                         f"(v{saved.get('gen_version', 1)}, now v{GEN_VERSION}), re-save the baseline")
+    saved = {(row['scale'], row['stage']): row for row in saved['results']}
+    slower = []
+    for row in results:
+        base = saved.get((row['scale'], row['stage']))
+        if not base or not base['seconds']:
+            continue
+        change = (row['seconds'] - base['seconds']) / base['seconds']
+        if change > tolerance and row['seconds'] - base['seconds'] > min_delta_s:
+            slower.append((row['scale'], row['stage'], base['seconds'], row['seconds'], change))
+    return slower
+
+def format_results(results):
+    """
+    PROC: aligned text table of bench results
+    RET: str
+    """
+    names = ('scale', 'stage', 'seconds', 'files_s', 'mb_s', 'rss_kb')
+    cells = [[str(row[name]) for name in names] for row in results]
+    widths = [max([len(n)] + [len(c[i]) for c in cells]) for i, n in enumerate(names)]
+    lines = ["  ".join(n.ljust(w) for n, w in zip(names, widths)).rstrip()]
+    lines += ["  ".join(c.ljust(w) for c, w in zip(cell, widths)).rstrip() for cell in cells]
+    return "\n".join(lines)
+
+def parse_args(argv=None):
+    """
+    PROC: basic options parser workflow
+    RET: argparse namespace
+    """
+    parser = argparse.ArgumentParser(description='PerfIO-StorBench analyzer self-benchmark & synthetic data.')
+
+    parser.add_argument('--scale',
+                        type=str,
+                        default=','.join(str(s) for s in BENCH_SCALES),
+                        help='Comma list of result file counts to bench, eg: 10,1000,100000. [default: %(default)s]')
+
+    parser.add_argument('--workers',
+                        '-w',
+                        type=int,
+                        default=1,
+                        help='Analyzer parse processes. [default: 1]')
+
+    parser.add_argument('--snapshots',
+                        type=int,
+                        default=1,
+                        help='--status-interval docs per synthetic file. [default: 1]')
+
+    parser.add_argument('--jobs-per-file',
+                        type=int,
+                        default=1,
+                        help='Job entries per synthetic doc. [default: 1]')
+
+    parser.add_argument('--repeat',
+                        type=int,
+                        default=BENCH_REPEAT,
+                        help='Runs per stage, fastest is kept. [default: %(default)s]')
+
+    parser.add_argument('--save-baseline',
+                        type=str,
+                        default=None,
+                        help='Write results as a json baseline. [default: unset]')
+
+    parser.add_argument('--baseline',
+                        type=str,
+                        default=None,
+                        help='Saved baseline to compare against, exit 1 when a stage is slower. [default: unset]')
+
+    parser.add_argument('--tolerance',
+                        type=float,
+                        default=BENCH_TOLERANCE,
+                        help='Allowed slowdown vs --baseline, fraction. [default: %(default)s]')
+
+    parser.add_argument('--generate',
+                        type=str,
+                        default=None,
+                        help='Only write a synthetic data set to this dir & exit. [default: unset]')
+
+    parser.add_argument('--layout',
+                        type=str,
+                        choices=('bench', 'batch'),
+                        default='bench',
+                        help='Synthetic file layout for --generate. [default: bench]')
+
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    scales = [int(s) for s in args.scale.split(',') if s]
+
+    if args.generate:
+        paths = gen_fio_logs(args.generate, scales[-1], args.layout, args.snapshots, args.jobs_per_file)
+        gen_interval_log(os.path.join(args.generate, 'perfio_lat.1.log'), BENCH_INTERVAL_ROWS)
+        print(f"{len(paths)} files, {_dir_bytes(paths) / 1048576:.1f} MB -> {args.generate}")
+        return
+
+    load_analyzer()
+    results = []
+    work_dir = tempfile.mkdtemp(prefix='perfio-selfbench.')
+    try:
+        for files in scales:
+            results += bench_scale(work_dir, files, args.workers, args.snapshots, args.jobs_per_file,
+                                   args.repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print(format_results(results))
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({'host': os.uname().nodename, 'gen_version': GEN_VERSION, 'python': sys.version.split()[0],
+                       'numpy': np.__version__, 'workers': args.workers, 'results': results}, f, indent=1)
+    if args.baseline:
+        slower = compare_to_saved(results, args.baseline, args.tolerance)
+        for scale, stage, base, now, change in slower:
+            print(f"SLOWER: scale {scale} {stage}: {base:.4f}s -> {now:.4f}s ({change:+.0%})")
+        if slower:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
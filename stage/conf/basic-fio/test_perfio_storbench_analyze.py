@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+'''
+[───────────────────────────────────────────────────────────────────────────────]
+[ Purpose    ─» Behaviour tests for perfio-storbench.analyze.py
+[ Filename   ─» test_perfio_storbench_analyze.py
+[ Project    ─» PerfIO-StorBench
+[───────────────────────────────────────────────────────────────────────────────]
+[ Requires
+[ ╰───────────» python3
+[           ╰─» numpy, pytest
+[           ╰─» perfio-storbench.{analyze,selfbench}.py (same dir)
+[───────────────────────────────────────────────────────────────────────────────]
+[ Usage
+[ ╰───────────» python3 -m pytest -q   (from this dir)
+[───────────────────────────────────────────────────────────────────────────────]
+'''
+# Erforderlich Modules
+import importlib.util
+import json
+import os
+import numpy as np
+import pytest
+
+SELFBENCH_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perfio-storbench.selfbench.py')
+
+
+def _load_selfbench():
+    ''' selfbench is a hyphenated script too, load it by path '''
+    spec = importlib.util.spec_from_file_location('perfio_storbench_selfbench', SELFBENCH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+sb = _load_selfbench()
+an = sb.load_analyzer()
+
+
+@pytest.fixture
+def bench_dir(tmp_path):
+    ''' 15 bench-fio style logs, 2 jobs each, one cell per (mode, bs) '''
+    sb.gen_fio_logs(str(tmp_path), 15, jobs_per_file=2)
+    return str(tmp_path)
+
+
+# ── store ingest ─────────────────────────────────────────────────────────────────
+
+def test_store_one_row_per_job(bench_dir):
+    store = an.build_metric_store(bench_dir, recursive=True)
+    assert len(store) == 30
+    assert set(store['mode']) == set(sb.GEN_MODES)
+    assert set(store['bs']) == {an.parse_fio_size(bs) for bs in sb.GEN_BLOCK_SIZES}
+    # bench layout: <target>-<engine>/<bs>/<mode>-<qd>-<nj>.json, run is the bs dir
+    assert set(store['run']) == set(sb.GEN_BLOCK_SIZES)
+    assert (store['target'] == '/dev/nvme0n1').all()
+    assert (store['read_iops'][store['mode'] == 'randwrite'] == 0).all()
+    assert (store['read_iops'][store['mode'] == 'randread'] > 0).all()
+
+
+def test_store_not_recursive_skips_subdirs(bench_dir):
+    assert len(an.build_metric_store(bench_dir)) == 0
+
+
+def test_store_same_for_any_worker_count(bench_dir):
+    serial = an.build_metric_store(bench_dir, recursive=True)
+    pooled = an.build_metric_store(bench_dir, recursive=True, workers=2)
+    assert np.array_equal(serial, pooled)
+
+
+def test_store_parse_cache_hit_matches_parse(bench_dir, tmp_path_factory):
+    cache = str(tmp_path_factory.mktemp('cache'))
+    cold = an.build_metric_store(bench_dir, recursive=True, cache=cache)
+    warm = an.build_metric_store(bench_dir, recursive=True, cache=cache)
+    assert np.array_equal(cold, an.build_metric_store(bench_dir, recursive=True))
+    assert np.array_equal(cold, warm)
+
+
+# ── results db ───────────────────────────────────────────────────────────────────
+
+def test_results_db_reload_replaces_rows(bench_dir, tmp_path_factory):
+    store = an.build_metric_store(bench_dir, recursive=True)
+    conn = an.open_results_db(str(tmp_path_factory.mktemp('db') / 'results.db'))
+    try:
+        assert an.results_db_load(conn, store) == len(store)
+        assert an.results_db_load(conn, store) == len(store)
+        assert conn.execute('SELECT COUNT(*) FROM job_metrics').fetchone()[0] == len(store)
+        assert conn.execute('SELECT COUNT(*) FROM targets').fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+def test_results_db_keeps_other_targets(tmp_path):
+    sb.gen_fio_logs(str(tmp_path / 'a'), 15)
+    sb.gen_fio_logs(str(tmp_path / 'b'), 15, seed=sb.GEN_SEED + 1)
+    first = an.build_metric_store(str(tmp_path / 'a'), recursive=True)
+    second = an.build_metric_store(str(tmp_path / 'b'), recursive=True)
+    second['target'] = '/dev/nvme1n1'
+    conn = an.open_results_db(str(tmp_path / 'results.db'))
+    try:
+        an.results_db_load(conn, first)
+        an.results_db_load(conn, second)
+        an.results_db_load(conn, first)
+        assert conn.execute('SELECT COUNT(*) FROM job_metrics').fetchone()[0] == 30
+    finally:
+        conn.close()
+
+
+# ── regression ───────────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def cell_store(tmp_path):
+    ''' 5 jobs per (mode, bs) cell so the rank test has samples to work with '''
+    sb.gen_fio_logs(str(tmp_path), 15, jobs_per_file=5)
+    return an.build_metric_store(str(tmp_path), recursive=True)
+
+
+def test_regression_same_runs_all_ok(cell_store):
+    report = an.regression_report(cell_store, cell_store.copy(), ['mode', 'bs'], metrics=['read_iops'])
+    assert len(report)
+    assert (report['verdict'] == 'ok').all()
+
+
+def test_regression_flags_slower_candidate(cell_store):
+    cand = cell_store.copy()
+    cand['read_iops'] *= 0.7
+    report = an.regression_report(cell_store, cand, ['mode', 'bs'], metrics=['read_iops'])
+    reads = report[report['base_median'] > 0]
+    assert len(reads)
+    assert (reads['verdict'] == 'regression').all()
+    assert np.allclose(reads['change_pct'], -30.0)
+    # Worst first
+    assert report['verdict'][0] == 'regression'
+
+
+def test_regression_faster_candidate_is_improvement(cell_store):
+    cand = cell_store.copy()
+    cand['clat_mean'] *= 0.5
+    report = an.regression_report(cell_store, cand, ['mode', 'bs'], metrics=['clat_mean'])
+    reads = report[report['base_median'] > 0]
+    assert len(reads)
+    assert (reads['verdict'] == 'improvement').all()
+
+
+def test_compare_to_baseline_class_thresholds():
+    test_stats = {'read_bw': (80.0, 1.0), 'clat_mean': (104.0, 1.0), 'write_bw': (100.0, 0.0)}
+    baseline = {'read_bw': 100.0, 'clat_mean': 100.0}
+    result = an.compare_to_baseline(test_stats, baseline)
+    assert result['read_bw']['flagged']
+    assert not result['clat_mean']['flagged']
+    # No baseline value, nothing to compare against
+    assert result['write_bw']['change'] is None and not result['write_bw']['flagged']
+    tight = an.compare_to_baseline(test_stats, baseline, thresholds={'latency': 0.01})
+    assert tight['clat_mean']['flagged']
+
+
+# ── streaming decoder ────────────────────────────────────────────────────────────
+
+def _docs(path):
+    return list(an.iter_fio_json(path))
+
+
+def test_iter_fio_json_status_interval_snapshots(tmp_path):
+    path, = sb.gen_fio_logs(str(tmp_path), 1, snapshots=3)
+    docs = _docs(path)
+    assert len(docs) == 3
+    ios = [doc['jobs'][0]['read']['total_ios'] for doc in docs]
+    assert ios == sorted(ios) and ios[0] < ios[-1]
+    # Last snapshot is the summary load_fio_json keeps
+    assert an.load_fio_json(path)['timestamp_ms'] == docs[-1]['timestamp_ms']
+
+
+def test_iter_fio_json_small_chunks(tmp_path):
+    path, = sb.gen_fio_logs(str(tmp_path), 1, snapshots=3)
+    assert list(an.iter_fio_json(path, chunk_size=64)) == _docs(path)
+
+
+def test_iter_fio_json_skips_chatter_and_truncated_tail(tmp_path, capsys):
+    path, = sb.gen_fio_logs(str(tmp_path), 1, snapshots=2)
+    with open(path) as f:
+        text = f.read()
+    first = text.index('\n{') + 1
+    mixed = tmp_path / 'mixed.json'
+    mixed.write_text('fio: note {engine} option ignored\n' + text[:first]
+                     + 'fio: pending {jobs}\n' + text[first:] + text[:len(text) // 3])
+    docs = _docs(str(mixed))
+    assert [doc['timestamp_ms'] for doc in docs] == [doc['timestamp_ms'] for doc in _docs(path)]
+    assert 'truncated JSON' in capsys.readouterr().err
+
+
+def test_iter_fio_json_projects_fields(tmp_path):
+    path, = sb.gen_fio_logs(str(tmp_path), 1)
+    doc, = _docs(path)
+    assert set(doc) <= set(an.FIO_SNAPSHOT_FIELDS)
+    with open(path) as f:
+        assert 'disk_util' in json.load(f)
+
+
+# ── interval logs ────────────────────────────────────────────────────────────────
+
+def test_interval_log_partial_last_line(tmp_path, capsys):
+    path = sb.gen_interval_log(str(tmp_path / 'job_lat.1.log'), 1000)
+    whole = an.load_fio_interval_log(path)
+    assert len(whole) == 1000
+    with open(path, 'ab') as f:
+        f.write(b'300001, 12')
+    assert np.array_equal(an.load_fio_interval_log(path), whole)
+    assert 'incomplete last line' in capsys.readouterr().err
+
+
+def test_interval_log_bad_line_reports_offset(tmp_path):
+    path = tmp_path / 'job_bw.1.log'
+    path.write_text('10, 100, 0, 4096, 0, 0\n20, 200, 0\n30, 300, 0, 4096, 0, 0\n')
+    with pytest.raises(ValueError, match='at byte 23'):
+        an.load_fio_interval_log(str(path))
+
+
+def test_interval_series_drops_empty_periods():
+    log = np.zeros(4, dtype=an._interval_dtype(an.INTERVAL_LOG_COLUMNS))
+    log['t_ms'] = [0, 500, 2500, 2600]
+    log['value'] = [10, 30, 50, 70]
+    t_ms, values = an.interval_series(log, period_ms=1000, combine='mean')
+    assert t_ms.tolist() == [0, 2000]
+    assert values.tolist() == [20.0, 60.0]
+
+
+# ── cli ──────────────────────────────────────────────────────────────────────────
+
+def test_gate_missing_baseline_fails(bench_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit, match='baseline not found'):
+        an.main([bench_dir, '-r', '--baseline', str(tmp_path / 'no' / 'such' / 'dir')])
+
+
+def test_gate_empty_baseline_fails(bench_dir, tmp_path_factory, monkeypatch):
+    empty = tmp_path_factory.mktemp('empty')
+    monkeypatch.chdir(empty)
+    with pytest.raises(SystemExit, match='no fio jobs'):
+        an.main([bench_dir, '-r', '--baseline', str(empty)])
+
+
+def test_gate_no_shared_cell_fails(bench_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    other = tmp_path / 'other'
+    sb.gen_fio_logs(str(other), 15, jobs_per_file=2)
+    store = an.build_metric_store(str(other), recursive=True)
+    store['target'] = '/dev/nvme9n1'
+    an.save_metric_store(store, str(tmp_path / 'base.npy'))
+    with pytest.raises(SystemExit, match='nothing to gate on'):
+        an.main([bench_dir, '-r', '--baseline', str(tmp_path / 'base.npy')])
+
+
+def test_gate_archive_found_by_magic(bench_dir, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    archive = str(tmp_path / 'r1.pioarc')
+    an.main([bench_dir, '-r', '--archive', archive])
+    assert an.is_archive(archive)
+    an.main([bench_dir, '-r', '--baseline', archive])
+    assert 'No significant regressions' in capsys.readouterr().out
+
+
+def test_plot_default_metric(bench_dir, tmp_path_factory, capsys):
+    pytest.importorskip('matplotlib')
+    out = str(tmp_path_factory.mktemp('charts'))
+    an.main([bench_dir, '-r', '--plot', 'qd2d', '--plot-out', out])
+    assert '15 charts rendered' in capsys.readouterr().out
+    with pytest.raises(SystemExit, match='unknown metric in --plot-metric: latency_mean'):
+        an.main([bench_dir, '-r', '--plot', 'qd2d', '--plot-out', out, '--plot-metric', 'latency_mean'])
+
+
+# ── watch ────────────────────────────────────────────────────────────────────────
+
+def test_watch_folds_logs_closed_just_before_the_watch(tmp_path):
+    # Fresh copies: their close events came before the watch, they fold once settled
+    paths = sb.gen_fio_logs(str(tmp_path), 3, layout='batch')
+    seen = []
+    state = an.watch_fio_logs(str(tmp_path), an.watch_state(), idle_s=2.0, poll_s=0.1, settle_s=0.5,
+                              on_update=lambda state, path, rows, touched: seen.append(path))
+    assert sorted(seen) == sorted(paths)
+    assert state['total']['count'] == 3
+
+
+def test_query_unknown_metric_fails(bench_dir):
+    with pytest.raises(SystemExit, match='unknown metric in --query: read_lat_mean'):
+        an.main([bench_dir, '-r', '--query', 'read_lat_mean'])
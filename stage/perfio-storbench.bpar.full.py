@@ -25,13 +25,23 @@
 [───────────────────────────────────────────────────────────────────────────────]
 '''
 # Erforderlich Modules
+# asyncio, concurrent.futures, configparser, http.server, jinja2, psutil & subprocess are
+# imported by the functions that use them, most runs never touch most of them
 import argparse
-import jinja2
+import collections
+import hashlib
+import importlib.util
+import itertools
+import json
+import operator
 import os
-import psutil
-import shutil
-import subprocess
+import queue
+import re
+import socket
+import signal
 import sys
+import threading
+import time
 
 # Validate src-layout import adjustment
 if not __package__:
@@ -43,48 +53,979 @@ if not __package__:
     package_source_path = os.path.dirname(os.path.dirname(__file__))
     sys.path.insert(0, package_source_path)
 
+# Live monitor, rolling figures over this many status-interval snapshots
+MONITOR_WINDOW = 6
+MONITOR_STATUS_INTERVAL = 5
+MONITOR_READ = 1 << 16
+MONITOR_POLL_S = 0.5
+# Following a file w/o a pid to watch, give up after this much silence
+MONITOR_IDLE_S = 60
+# SIGINT lets fio write its final summary, escalate if it takes longer than this
+MONITOR_STOP_S = 30
+MONITOR_COND_RE = re.compile(r'^\s*(\w+)\s*(<=|>=|<|>)\s*([-+0-9.eE]+)\s*$')
+MONITOR_COND_OPS = {'<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge}
+MONITOR_FIGURES = ('bw', 'iops', 'lat_mean_ns', 'clat_p99_ns', 'bw_drop', 'iops_drop')
+
+# Scheduler, one fio run per job section, concurrent across targets
+SCHED_WORKERS = 4
+# stonewall=1 always waits for every earlier job, like fio; the scope is for jobs
+# w/o it: 'target' waits for earlier jobs on the same target (what the exclusive
+# target lock already gives), 'global' for every earlier job, ie: a serial run
+SCHED_STONEWALL = ('target', 'global')
+# Job options naming what a section does I/O against, first hit wins
+SCHED_TARGET_OPTS = ('filename', 'directory', 'filename_format')
+SCHED_LOG_DIR = 'log'
+
+# Execution, bytes per pipe read & rusage fields kept per run
+EXEC_PIPE_READ = 1 << 16
+EXEC_RUSAGE_FIELDS = ('ru_utime', 'ru_stime', 'ru_maxrss', 'ru_minflt', 'ru_majflt',
+                      'ru_inblock', 'ru_oublock', 'ru_nvcsw', 'ru_nivcsw')
+
+# Renderer, one jinja2 env per template dir, compiled templates cached by jinja2
+J2_ENVIRONMENTS = {}
+# Sweep matrix axes -> template vars of perfio-storbench.bpar.full.ini.j2
+J2_MATRIX_VARS = {
+    'engine': 'BENCH_IO_ENGINE',
+    'mode': 'BENCH_MODE_LIST_CHARS',
+    'iodepth': 'BENCH_IO_DEPTH_LIST',
+    'numjobs': 'BENCH_IO_JOBS_LIST',
+    'bs': 'BENCH_BLOCK_SIZE_LIST',
+    'target': 'BENCH_TARGET',
+}
+J2_MANIFEST = '.render-manifest.json'
+J2_RENDER_OUT = 'rendered'
+
+# Sweep planner, defaults mirror perfio-storbench.bpar.full.ini.j2
+PLAN_MATRIX = {
+    'engine': ['posixaio'],
+    'mode': ['randread', 'randwrite', 'rw', 'write'],
+    'iodepth': [1, 2, 4, 8, 16, 32, 64],
+    'numjobs': [1, 2, 4, 8, 16, 32, 64],
+    'bs': ['4k'],
+    'target': ['/dev/null'],
+}
+PLAN_RUNTIME_S = 300
+# fio start, layout & cache invalidation per run, on top of runtime
+PLAN_OVERHEAD_S = 5
+# Saturation: least outstanding I/O (iodepth x numjobs) reaching this share of peak iops
+PLAN_PLATEAU = 0.95
+PLAN_OUTPUT = 'output'
+PLAN_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# OpenMetrics exporter, scrapes are handed the last pre-rendered page, the monitor &
+# the host sampler swap in a new one, so neither side ever waits on the other
+EXPORT_BIND = '127.0.0.1'
+EXPORT_PORT = 9464
+EXPORT_HOST_S = 5.0
+EXPORT_PREFIX = 'perfio'
+EXPORT_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+EXPORT_PINFO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'proc', 'pinfo.py')
+# /proc/diskstats columns after the name, (metric, column, sectors -> bytes)
+EXPORT_DISK_COUNTERS = (('disk_read_ios', 0, False), ('disk_read_bytes', 2, True),
+                        ('disk_write_ios', 4, False), ('disk_written_bytes', 6, True),
+                        ('disk_io_time_seconds', 9, False))
+EXPORT_CPU_MODES = ('user', 'nice', 'system', 'idle', 'iowait', 'irq', 'softirq', 'steal')
+EXPORT_QUANTILES = (('0.5', '50.000000'), ('0.9', '90.000000'), ('0.99', '99.000000'), ('0.999', '99.900000'))
+
+
+def _exec_pump(pipe, sink):
+    ''' copy a child pipe into sink chunk by chunk, nothing accumulates here '''
+    write = sink if callable(sink) else sink.write
+    with pipe:
+        for chunk in iter(lambda: pipe.read1(EXEC_PIPE_READ), b''):
+            write(chunk)
+
+
 # @decoratorSoSchönen
-def proc_vollstreckerin():
+def proc_vollstreckerin(exec_cmd, exec_opt=None, stdout=None, stderr=None, env=None, cwd=None):
     '''
     [───────────────────────────────────────────────────────────────────────────]
     [ Artikel   ─» proc_vollstreckerin || proc_exec
     [ Arbeite   ─» execute cmd via subprocess, provide result
+    [              no shell, output streamed, rusage of the child tree kept
     [ Antworter ─» resp/res tuple from subprocess module
     [───────────────────────────────────────────────────────────────────────────]
     [ Eingabe
-    [ • exec_cmd ─» command to execute
-    [ • exec_opt ─» command options
-    [ •  ─»
+    [ • exec_cmd ─» command to execute, argv list
+    [ • exec_opt ─» command options, appended to exec_cmd
+    [ • stdout   ─» None inherits, subprocess.DEVNULL drops, a callable(bytes)
+    [               or binary file gets each chunk as it arrives
+    [ • stderr   ─» same as stdout
+    [ • env, cwd ─» as for subprocess.Popen
     [───────────────────────────────────────────────────────────────────────────]
     [ Antwort
-    [ • ret_exec_code ─» execution return code
+    [ • ret_exec_code ─» execution return code, -N when killed by signal N
     [ • ret_exec_zeit ─» execution time total
-    [ •  ─»
+    [ • ret_exec_usage ─» dict from os.wait4 rusage: utime/stime (s, cpu time
+    [                    of the child & every descendant it reaped, eg: fio
+    [                    job processes), maxrss_kb, page faults, block i/o,
+    [                    nvcsw/nivcsw context switches & cpu_pct of wall time
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    import subprocess
+    exec_cmd = list(exec_cmd) + list(exec_opt or [])
+    pumped = {}
+    for name, sink in (('stdout', stdout), ('stderr', stderr)):
+        if sink is None or isinstance(sink, int):
+            pumped[name] = (sink, None)
+        else:
+            pumped[name] = (subprocess.PIPE, sink)
+
+    start = time.monotonic()
+    proc = subprocess.Popen(exec_cmd,
+                            stdout=pumped['stdout'][0],
+                            stderr=pumped['stderr'][0],
+                            env=env,
+                            cwd=cwd,
+                            )
+    pumps = []
+    for name, (_, sink) in pumped.items():
+        if sink is not None:
+            pump = threading.Thread(target=_exec_pump, args=(getattr(proc, name), sink), daemon=True)
+            pump.start()
+            pumps.append(pump)
+
+    # wait4 instead of proc.wait() to get the rusage of this child alone
+    _, status, rusage = os.wait4(proc.pid, 0)
+    ret_exec_zeit = time.monotonic() - start
+    proc.returncode = ret_exec_code = os.waitstatus_to_exitcode(status)
+    for pump in pumps:
+        pump.join()
+
+    usage = {field[3:]: getattr(rusage, field) for field in EXEC_RUSAGE_FIELDS}
+    usage['maxrss_kb'] = usage.pop('maxrss')
+    usage['cpu_pct'] = round(100.0 * (rusage.ru_utime + rusage.ru_stime) / ret_exec_zeit, 1) if ret_exec_zeit else 0.0
+    return ret_exec_code, ret_exec_zeit, usage
+
+
+# @decoratorSoSchönen
+def fio_job_sections(fio_file, jobs=None):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» fio_job_sections
+    [ Arbeite   ─» read a fio job file into schedulable jobs
+    [ Antworter ─» list of job dicts, in file (or jobs list) order
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • fio_file ─» fio job file, eg: conf/basic-fio/fio.defs/perfio.fio
+    [ • jobs     ─» section names to keep, or a jobs list file of [name] lines
+    [              like fio.jobs/perfio.raw.jobs, None for every section
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Antwort
+    [ • jobs ─» {'name', 'targets', 'stonewall', 'options'}, global options
+    [           folded in, targets are the files/dirs/devices touched
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    import configparser
+    parser = configparser.ConfigParser(allow_no_value=True, interpolation=None, strict=False,
+                                       comment_prefixes=('#', ';'), inline_comment_prefixes=None)
+    parser.optionxform = str
+    with open(fio_file, 'r') as f:
+        parser.read_file(f)
+
+    if isinstance(jobs, str):
+        with open(jobs, 'r') as f:
+            jobs = [line.strip().strip('[]') for line in f if line.strip()]
+    names = jobs if jobs is not None else [name for name in parser.sections() if name != 'global']
+    global_opts = dict(parser.items('global')) if parser.has_section('global') else {}
+
+    sections = []
+    for name in names:
+        if not parser.has_section(name):
+            raise SystemExit(f"ERROR: job [{name}] not in {fio_file}")
+        options = dict(global_opts, **dict(parser.items(name)))
+        targets = ()
+        for opt in SCHED_TARGET_OPTS:
+            if options.get(opt):
+                # fio separates multiple files w/ ':', '\:' escapes it
+                targets = tuple(t.replace('\\:', ':') for t in re.split(r'(?<!\\):', options[opt]) if t)
+                break
+        stonewall = options.get('stonewall', '0')
+        sections.append({
+            'name': name,
+            'targets': targets or (name,),
+            'stonewall': stonewall is None or stonewall.strip() not in ('0', ''),
+            'options': options,
+        })
+    return sections
+
+
+# @decoratorSoSchönen
+def sched_dependencies(jobs, stonewall='target'):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» sched_dependencies
+    [ Arbeite   ─» which earlier jobs each job has to wait for
+    [ Antworter ─» list of sets of job indexes
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • jobs      ─» from fio_job_sections()
+    [ • stonewall ─» 'target' or 'global' scope, see SCHED_STONEWALL
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Antwort
+    [ • deps ─» each target is exclusive & keeps its FIFO order, so a job waits
+    [           for the previous job of every target it touches; a stonewall=1
+    [           job, or any job under a 'global' scope, waits for all jobs
+    [           queued before it
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    last_on = {}
+    deps = []
+    for index, job in enumerate(jobs):
+        if job['stonewall'] or stonewall == 'global':
+            wait = set(range(index))
+        else:
+            wait = {last_on[t] for t in job['targets'] if t in last_on}
+        deps.append(wait)
+        for target in job['targets']:
+            last_on[target] = index
+    return deps
+
+
+# @decoratorSoSchönen
+def sched_waves(jobs, deps):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» sched_waves
+    [ Arbeite   ─» group jobs that could all run at once, for a dry run
+    [ Antworter ─» list of lists of job names
     [───────────────────────────────────────────────────────────────────────────]
     '''
+    level = []
+    for wait in deps:
+        level.append(1 + max((level[d] for d in wait), default=-1))
+    waves = [[] for _ in range(max(level, default=-1) + 1)]
+    for index, wave in enumerate(level):
+        waves[wave].append(jobs[index]['name'])
+    return waves
+
+
+def sched_sweep(fio_file):
+    ''' resume key of a job file, its path & content hash; an edited file is a new sweep '''
+    with open(fio_file, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:16]
+    return f"{os.path.abspath(fio_file)}@{digest}"
+
+
+def _sched_entries(resume_log):
+    ''' completion log entries, a torn last line from an interrupted write is skipped '''
+    entries = []
+    if not resume_log or not os.path.exists(resume_log):
+        return entries
+    with open(resume_log, 'r') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
 
 
 # @decoratorSoSchönen
-def proc_manager():
+def sched_completed(resume_log, sweep=None):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» sched_completed
+    [ Arbeite   ─» job names of a sweep that already finished cleanly per the
+    [              completion log
+    [ Antworter ─» set of job names
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    return {entry['job'] for entry in _sched_entries(resume_log)
+            if entry.get('sweep') == sweep and entry.get('ret_exec_code') == 0}
+
+
+def sched_forget(resume_log, sweep=None):
+    ''' drop a sweep's entries from the completion log, the file goes once it's empty '''
+    if not resume_log or not os.path.exists(resume_log):
+        return
+    keep = [entry for entry in _sched_entries(resume_log) if entry.get('sweep') != sweep]
+    if not keep:
+        os.unlink(resume_log)
+        return
+    with open(f"{resume_log}.tmp", 'w') as f:
+        f.writelines(json.dumps(entry) + '\n' for entry in keep)
+    os.replace(f"{resume_log}.tmp", resume_log)
+
+
+# @decoratorSoSchönen
+def fio_runner(fio_file, log_dir=SCHED_LOG_DIR, fio_bin='fio'):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» fio_runner
+    [ Arbeite   ─» build the default runner, one fio --section run per job w/
+    [              the same options perfio-storbench.batch.sh passes
+    [ Antworter ─» runner(job) -> (ret_exec_code, ret_exec_zeit, ret_exec_usage)
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    import subprocess
+    host = socket.gethostname()
+
+    def runner(job):
+        exec_opt = ['--output-format=json',
+                    f"--status-interval={MONITOR_STATUS_INTERVAL}",
+                    f"--output={log_dir}/perfio.{host}.{job['name']}.log.json",
+                    f"--section={job['name']}",
+                    fio_file]
+        return proc_vollstreckerin([fio_bin], exec_opt, stdout=subprocess.DEVNULL)
+
+    return runner
+
+
+# @decoratorSoSchönen
+def proc_manager(jobs, runner, workers=SCHED_WORKERS, stonewall='target', resume_log=None, results=None,
+                 sweep=None):
     '''
     [───────────────────────────────────────────────────────────────────────────]
     [ Artikel   ─» proc_manager
     [ Arbeite   ─» manages threads, workers, queues, pub-sub, database
-    [ Antworter ─» response(s)
+    [              runs jobs on a bounded pool, each target exclusive, honoring
+    [              stonewall, every completion appended to the resume log
+    [ Antworter ─» completion entries
     [───────────────────────────────────────────────────────────────────────────]
     [ Eingabe
-    [ • input-var ─» desc
-    [ •  ─»
+    [ • jobs       ─» from fio_job_sections()
+    [ • runner     ─» callable(job) -> (ret_exec_code, ret_exec_zeit[, usage])
+    [ • workers    ─» max jobs in flight
+    [ • stonewall  ─» scope, see SCHED_STONEWALL
+    [ • resume_log ─» jsonl completion log, jobs of this sweep already done
+    [                 cleanly are skipped; once every job is clean the sweep's
+    [                 entries are dropped so the next run starts over
+    [ • results    ─» queue.Queue, each entry is also published there as it lands
+    [ • sweep      ─» resume key, see sched_sweep()
     [───────────────────────────────────────────────────────────────────────────]
     [ Antwort
-    [ • ret-var ─» desc
-    [ •  ─»
+    [ • entries ─» {'job', 'sweep', 'targets', 'ret_exec_code', 'ret_exec_zeit', 'ts'}
+    [              + 'usage' when the runner reports it (see proc_vollstreckerin)
+    [              in completion order, skipped jobs not included
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    import concurrent.futures
+    deps = sched_dependencies(jobs, stonewall)
+    done = sched_completed(resume_log, sweep)
+    pending = {i for i, job in enumerate(jobs) if job['name'] not in done}
+    finished = set(range(len(jobs))) - pending
+    results = results if results is not None else queue.Queue()
+    entries = []
+
+    log = open(resume_log, 'a') if resume_log else None
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            running = {}
+            while pending or running:
+                for index in sorted(pending):
+                    if len(running) >= workers:
+                        break
+                    if deps[index] <= finished:
+                        pending.discard(index)
+                        running[pool.submit(runner, jobs[index])] = index
+
+                landed, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in landed:
+                    index = running.pop(future)
+                    finished.add(index)
+                    try:
+                        ret_exec_code, ret_exec_zeit, *usage = future.result()
+                    except Exception as err:
+                        print(f"ERROR: job [{jobs[index]['name']}]: {err}", file=sys.stderr)
+                        ret_exec_code, ret_exec_zeit, usage = None, 0.0, []
+                    entry = {
+                        'job': jobs[index]['name'],
+                        'sweep': sweep,
+                        'targets': list(jobs[index]['targets']),
+                        'ret_exec_code': ret_exec_code,
+                        'ret_exec_zeit': round(ret_exec_zeit, 3),
+                        'ts': time.time(),
+                    }
+                    if usage:
+                        entry['usage'] = usage[0]
+                    if log:
+                        log.write(json.dumps(entry) + '\n')
+                        log.flush()
+                    entries.append(entry)
+                    results.put(entry)
+    finally:
+        if log:
+            log.close()
+    if resume_log and all(entry['ret_exec_code'] == 0 for entry in entries):
+        sched_forget(resume_log, sweep)
+    return entries
+
+
+# @decoratorSoSchönen
+def fio_json_feed(buf, decoder=json.JSONDecoder()):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» fio_json_feed
+    [ Arbeite   ─» decode every complete json doc at the front of a stream buffer
+    [ Antworter ─» (docs, rest)
     [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • buf ─» text read so far, fio --status-interval emits back-to-back docs
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Antwort
+    [ • docs ─» decoded snapshots, in order
+    [ • rest ─» undecoded tail (partial doc), feed it back w/ the next read;
+    [           text that can't be a doc (fio chatter) is skipped, not kept
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    docs = []
+    pos = 0
+    while True:
+        start = buf.find('{', pos)
+        if start < 0:
+            return docs, ''
+        try:
+            doc, pos = decoder.raw_decode(buf, start)
+        except ValueError:
+            # Partial doc, or a '{' in fio chatter: once a later line opens a doc the
+            # candidate can't be partial any more, drop it & go on from there
+            resume = buf.find('\n{', start + 1)
+            if resume < 0:
+                return docs, buf[start:]
+            pos = resume + 1
+            continue
+        docs.append(doc)
+
+
+# @decoratorSoSchönen
+def monitor_conditions(items):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» monitor_conditions
+    [ Arbeite   ─» parse abort conditions, eg: clat_p99_ns>5e6, bw_drop>0.5
+    [ Antworter ─» list of (text, figure, op, limit)
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • items ─» condition strings, figure names from MONITOR_FIGURES
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    conditions = []
+    for item in items or []:
+        match = MONITOR_COND_RE.match(item)
+        if not match or match.group(1) not in MONITOR_FIGURES:
+            raise SystemExit(f"ERROR: bad abort condition {item!r}, "
+                             f"want <figure><op><number> w/ figure in {', '.join(MONITOR_FIGURES)}")
+        figure, op, limit = match.groups()
+        conditions.append((item.strip(), figure, MONITOR_COND_OPS[op], float(limit)))
+    return conditions
+
+
+def monitor_bins(snap):
+    ''' cumulative clat_ns.bins (json+ only) per (job, ddir), same named jobs summed '''
+    bins = {}
+    for job in snap.get('jobs', []):
+        for direction in ('read', 'write', 'trim'):
+            counts = job.get(direction, {}).get('clat_ns', {}).get('bins')
+            if counts:
+                into = bins.setdefault((job.get('jobname', ''), direction), collections.Counter())
+                into.update({int(value): count for value, count in counts.items()})
+    return bins
+
+
+def monitor_quantiles(old, new, quantiles):
+    ''' ns quantiles of the I/Os completed between two cumulative bin counts, None w/o any '''
+    window = sorted((value, count - old.get(value, 0)) for value, count in new.items())
+    total = sum(count for _, count in window)
+    if total <= 0:
+        return None
+    result = []
+    for quantile in quantiles:
+        seen = 0
+        for value, count in window:
+            seen += count
+            if seen >= quantile * total:
+                break
+        result.append(value)
+    return result
+
+
+# @decoratorSoSchönen
+def monitor_update(state, snap):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» monitor_update
+    [ Arbeite   ─» fold one cumulative snapshot into the rolling window
+    [ Antworter ─» figures dict, None until two snapshots have been seen
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • state ─» dict kept by the caller, starts empty
+    [ • snap  ─» decoded fio json snapshot
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Antwort
+    [ • figures ─» rolling means of bw (B/s), iops, lat_mean_ns, clat_p99_ns &
+    [             bw/iops drop vs the best rolling mean so far; w/ json+ bins
+    [             'clat_window' {(job, ddir): ns per EXPORT_QUANTILES} & the
+    [             p99 cover the window's I/Os only, else fio's p99 since start
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    io_bytes = ios = lat_sum = clat_p99 = 0.0
+    for job in snap.get('jobs', []):
+        for direction in ('read', 'write', 'trim'):
+            io = job.get(direction, {})
+            io_bytes += io.get('io_bytes', 0)
+            ios += io.get('total_ios', 0)
+            lat_sum += io.get('lat_ns', {}).get('mean', 0) * io.get('total_ios', 0)
+            pct = io.get('clat_ns', {}).get('percentile', {})
+            clat_p99 = max(clat_p99, pct.get('99.000000', 0))
+    now = (snap.get('timestamp_ms', 0), io_bytes, ios, lat_sum)
+
+    prev = state.get('prev')
+    state['prev'] = now
+    window = state.setdefault('window', collections.deque(maxlen=MONITOR_WINDOW))
+    # Bins at each window edge, the oldest is where the window starts
+    edges = state.setdefault('bins', collections.deque(maxlen=MONITOR_WINDOW + 1))
+    if prev is None or now[0] <= prev[0]:
+        if prev is None:
+            edges.append(monitor_bins(snap))
+        return None
+    edges.append(monitor_bins(snap))
+
+    dt = (now[0] - prev[0]) / 1000.0
+    d_ios = now[2] - prev[2]
+    window.append(((now[1] - prev[1]) / dt, d_ios / dt, (now[3] - prev[3]) / d_ios if d_ios > 0 else 0.0))
+
+    bw, iops, lat = (sum(col) / len(window) for col in zip(*window))
+    if len(window) == window.maxlen:
+        state['peak_bw'] = max(state.get('peak_bw', 0.0), bw)
+        state['peak_iops'] = max(state.get('peak_iops', 0.0), iops)
+    peak_bw = state.get('peak_bw', 0.0)
+    peak_iops = state.get('peak_iops', 0.0)
+    clat_window = {}
+    for key, counts in edges[-1].items():
+        values = monitor_quantiles(edges[0].get(key, {}), counts, [float(q) for q, _ in EXPORT_QUANTILES])
+        if values is not None:
+            clat_window[key] = values
+    if clat_window:
+        p99 = [q for q, _ in EXPORT_QUANTILES].index('0.99')
+        clat_p99 = max(values[p99] for values in clat_window.values())
+    return {
+        'bw': bw,
+        'iops': iops,
+        'lat_mean_ns': lat,
+        'clat_p99_ns': clat_p99,
+        'clat_window': clat_window,
+        'bw_drop': 1.0 - bw / peak_bw if peak_bw else 0.0,
+        'iops_drop': 1.0 - iops / peak_iops if peak_iops else 0.0,
+        'samples': len(window),
+    }
+
+
+# @decoratorSoSchönen
+def monitor_check(figures, conditions):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» monitor_check
+    [ Arbeite   ─» test abort conditions, only once the window is full
+    [ Antworter ─» list of tripped condition strings
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    if not figures or figures['samples'] < MONITOR_WINDOW:
+        return []
+    return [text for text, figure, op, limit in conditions if op(figures[figure], limit)]
+
+
+async def _monitor_pipe(stream):
+    ''' yield text chunks from an asyncio stream until EOF '''
+    while True:
+        chunk = await stream.read(MONITOR_READ)
+        if not chunk:
+            return
+        yield chunk.decode('utf-8', 'replace')
+
+
+async def _monitor_follow(path, alive):
+    ''' yield text appended to path, tail -f style, until alive() is false & EOF;
+        a truncated or replaced file is read again from its start '''
+    import asyncio
+    import codecs
+    while not os.path.exists(path):
+        if not alive():
+            return
+        await asyncio.sleep(MONITOR_POLL_S)
+    idle = 0.0
+    f = open(path, 'rb')
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    try:
+        while True:
+            chunk = f.read(MONITOR_READ)
+            if chunk:
+                idle = 0.0
+                yield decoder.decode(chunk)
+                continue
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                st = None
+            if st is not None and st.st_ino != os.fstat(f.fileno()).st_ino:
+                f.close()
+                f = open(path, 'rb')
+                decoder.reset()
+                continue
+            if st is not None and st.st_size < f.tell():
+                f.seek(0)
+                decoder.reset()
+                continue
+            if not alive():
+                return
+            await asyncio.sleep(MONITOR_POLL_S)
+            idle += MONITOR_POLL_S
+            if alive is _monitor_forever and idle >= MONITOR_IDLE_S:
+                return
+    finally:
+        f.close()
+
+
+def _monitor_forever():
+    return True
+
+
+async def _monitor_stop(proc=None, pid=None):
+    ''' SIGINT first so fio writes its summary, then terminate & kill '''
+    import asyncio
+    import psutil
+    if proc is not None:
+        if proc.returncode is None:
+            proc.send_signal(signal.SIGINT)
+            try:
+                await asyncio.wait_for(proc.wait(), MONITOR_STOP_S)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+    elif pid is not None and psutil.pid_exists(pid):
+        os.kill(pid, signal.SIGINT)
+
+
+# @decoratorSoSchönen
+async def proc_monitor(fio_cmd=None, attach=None, conditions=(), pid=None, emit=print, exporter=None):
     '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» proc_monitor
+    [ Arbeite   ─» launch fio (or attach to its output) & watch it live, abort
+    [              early once a condition trips
+    [ Antworter ─» (ret_exec_code, tripped, figures, final)
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • fio_cmd    ─» fio argv, json+ output & --status-interval added if missing,
+    [                 w/ --output=<file> that file is followed instead of stdout
+    [ • attach     ─» '-' for stdin, or a file/fifo another fio is writing
+    [ • conditions ─» from monitor_conditions()
+    [ • pid        ─» attach only, fio pid to signal on abort & to detect the end
+    [ • emit       ─» status line sink
+    [ • exporter   ─» from export_start(), figures published to it per snapshot
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Antwort
+    [ • ret_exec_code ─» fio exit code, None when attached
+    [ • tripped       ─» conditions that aborted the run, empty if it ran out
+    [ • figures       ─» last rolling figures
+    [ • final         ─» last fio doc read, its end-of-run summary when fio got
+    [                    to write one (also after an abort)
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    import asyncio
+    import psutil
+    import subprocess
+    proc = None
+    if fio_cmd:
+        fio_cmd = list(fio_cmd)
+        if not any(arg.startswith('--output-format') for arg in fio_cmd):
+            # json+ adds the clat bins the window percentiles come from
+            fio_cmd.insert(1, '--output-format=json+')
+        if not any(arg.startswith('--status-interval') for arg in fio_cmd):
+            fio_cmd.insert(1, f"--status-interval={MONITOR_STATUS_INTERVAL}")
+        output = [arg.split('=', 1)[1] for arg in fio_cmd if arg.startswith('--output=')]
+        if output and os.path.exists(output[-1]):
+            # A previous run's docs aren't this run's, only follow what this fio writes
+            os.unlink(output[-1])
+        proc = await asyncio.create_subprocess_exec(
+            *fio_cmd,
+            stdout=subprocess.DEVNULL if output else subprocess.PIPE,
+        )
+        if output:
+            source = _monitor_follow(output[-1], lambda: proc.returncode is None)
+        else:
+            source = _monitor_pipe(proc.stdout)
+    elif attach == '-':
+        stream = asyncio.StreamReader()
+        loop = asyncio.get_running_loop()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(stream), sys.stdin)
+        source = _monitor_pipe(stream)
+    else:
+        alive = (lambda: psutil.pid_exists(pid)) if pid else _monitor_forever
+        source = _monitor_follow(attach, alive)
+
+    state = {}
+    figures = None
+    final = None
+    tripped = []
+    stopping = None
+    buf = ''
+    async for chunk in source:
+        docs, buf = fio_json_feed(buf + chunk)
+        for snap in docs:
+            final = snap
+            update = monitor_update(state, snap)
+            if update is None:
+                continue
+            figures = update
+            if exporter is not None:
+                export_fio(exporter, figures, snap)
+            if tripped:
+                continue
+            emit(f"MON: bw={figures['bw'] / 1048576:.1f}MiB/s iops={figures['iops']:.0f} "
+                 f"lat_mean={figures['lat_mean_ns'] / 1000:.1f}us "
+                 f"clat_p99={figures['clat_p99_ns'] / 1000:.1f}us "
+                 f"bw_drop={figures['bw_drop']:.0%}")
+            tripped = monitor_check(figures, conditions)
+            if tripped:
+                emit(f"ABORT: {', '.join(tripped)}")
+                # fio answers the SIGINT w/ its summary down the same pipe/file, so keep
+                # reading until it exits, else a full pipe blocks it & the summary is lost
+                stopping = asyncio.ensure_future(_monitor_stop(proc, pid))
+        if tripped and proc is None and pid is None:
+            break
+
+    if stopping is not None:
+        await stopping
+    if proc is not None:
+        await proc.wait()
+        return proc.returncode, tripped, figures, final
+    return None, tripped, figures, final
+
+
+def _export_label(value):
+    ''' OpenMetrics label value escaping '''
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _export_family(lines, name, kind, help_text, samples):
+    ''' append one metric family, samples are (suffix, labels dict, value) '''
+    full = f"{EXPORT_PREFIX}_{name}"
+    lines.append(f"# TYPE {full} {kind}")
+    lines.append(f"# HELP {full} {help_text}")
+    for suffix, labels, value in samples:
+        label_text = ','.join(f'{key}="{_export_label(val)}"' for key, val in labels.items())
+        lines.append(f"{full}{suffix}{{{label_text}}} {value!r}" if label_text else f"{full}{suffix} {value!r}")
+
+
+# @decoratorSoSchönen
+def export_fio_render(figures, snap):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» export_fio_render
+    [ Arbeite   ─» fio figures & the latest status snapshot as OpenMetrics text
+    [ Antworter ─» str, metric families w/o the closing # EOF
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • figures ─» rolling figures from monitor_update()
+    [ • snap    ─» decoded fio json snapshot the figures came from
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    jobs = snap.get('jobs', [])
+    lines = []
+    # Same named jobs (numjobs clones w/o group_reporting) share a label set, one sample each
+    info = sorted({(job.get('jobname', ''), job.get('job options', {}).get('rw', '')) for job in jobs})
+    _export_family(lines, 'fio_job', 'info', 'fio job currently reporting',
+                   [('_info', {'job': name, 'rw': rw}, 1) for name, rw in info])
+    _export_family(lines, 'fio_bw_bytes_per_second', 'gauge', 'rolling bandwidth over the monitor window',
+                   [('', {}, float(figures['bw']))])
+    _export_family(lines, 'fio_iops', 'gauge', 'rolling iops over the monitor window',
+                   [('', {}, float(figures['iops']))])
+    _export_family(lines, 'fio_lat_mean_seconds', 'gauge', 'rolling mean completion latency',
+                   [('', {}, figures['lat_mean_ns'] / 1e9)])
+    _export_family(lines, 'fio_bw_drop_ratio', 'gauge', 'bandwidth drop vs the best rolling mean so far',
+                   [('', {}, float(figures['bw_drop']))])
+
+    window = [('', {'job': job, 'ddir': direction, 'quantile': quantile}, value / 1e9)
+              for (job, direction), values in sorted(figures.get('clat_window', {}).items())
+              for (quantile, _), value in zip(EXPORT_QUANTILES, values)]
+    # Counters summed per (job, ddir) like monitor_bins(); percentiles from the summed
+    # bins, w/o json+ bins the worst clone's
+    totals = {}
+    for job in jobs:
+        for direction in ('read', 'write', 'trim'):
+            io = job.get(direction, {})
+            if not io.get('total_ios'):
+                continue
+            into = totals.setdefault((job.get('jobname', ''), direction), {'io_bytes': 0, 'total_ios': 0, 'pct': {}})
+            into['io_bytes'] += int(io.get('io_bytes', 0))
+            into['total_ios'] += int(io.get('total_ios', 0))
+            for key, value in io.get('clat_ns', {}).get('percentile', {}).items():
+                into['pct'][key] = max(value, into['pct'].get(key, 0))
+    bins = monitor_bins(snap)
+    io_bytes = []
+    ios = []
+    quantiles = []
+    for (name, direction), total in sorted(totals.items()):
+        labels = {'job': name, 'ddir': direction}
+        io_bytes.append(('_total', labels, total['io_bytes']))
+        ios.append(('_total', labels, total['total_ios']))
+        values = monitor_quantiles({}, bins[(name, direction)], [float(q) for q, _ in EXPORT_QUANTILES]) \
+            if (name, direction) in bins else None
+        for index, (quantile, key) in enumerate(EXPORT_QUANTILES):
+            value = values[index] if values else total['pct'].get(key)
+            if value is not None:
+                quantiles.append(('', dict(labels, quantile=quantile), value / 1e9))
+    _export_family(lines, 'fio_io_bytes', 'counter', 'bytes transferred so far', io_bytes)
+    _export_family(lines, 'fio_ios', 'counter', 'I/Os completed so far', ios)
+    _export_family(lines, 'fio_clat_seconds', 'gauge',
+                   'completion latency percentiles over the monitor window, needs fio json+ output', window)
+    _export_family(lines, 'fio_clat_since_start_seconds', 'gauge', 'completion latency percentiles since job start',
+                   quantiles)
+    return '\n'.join(lines) + '\n'
+
+
+def _export_pinfo():
+    ''' proc/pinfo.py as a module, its /proc readers feed the host metrics '''
+    if 'pinfo' not in sys.modules:
+        spec = importlib.util.spec_from_file_location('pinfo', EXPORT_PINFO)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['pinfo'] = module
+        spec.loader.exec_module(module)
+    return sys.modules['pinfo']
 
 
 # @decoratorSoSchönen
-def func_j2_render(file_j2=None,file_wr=None):
+def export_host_render(sampler):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» export_host_render
+    [ Arbeite   ─» one pinfo sample (pread on held /proc fds) as OpenMetrics
+    [ Antworter ─» str, metric families w/o the closing # EOF
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • sampler ─» from pinfo.open_sampler(), its record layout decodes the sample
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    import numpy as np
+    pinfo = _export_pinfo()
+    pinfo.take_sample(sampler)
+    record = np.array(sampler['last'], dtype=np.int64).view(sampler['ring'].dtype)[0]
+    clk_tck = os.sysconf('SC_CLK_TCK')
+    lines = []
+
+    for name, column, sectors in EXPORT_DISK_COUNTERS:
+        scale = 512 if sectors else (1 / 1000.0 if name.endswith('_seconds') else 1)
+        _export_family(lines, name, 'counter', f"/proc/diskstats column {column + 4}",
+                       [('_total', {'device': disk}, int(record['disk'][i][column]) * scale)
+                        for i, disk in enumerate(sampler['disks'])])
+    _export_family(lines, 'disk_io_in_flight', 'gauge', 'I/Os currently in flight',
+                   [('', {'device': disk}, int(record['disk'][i][8])) for i, disk in enumerate(sampler['disks'])])
+    _export_family(lines, 'cpu_seconds', 'counter', 'cpu time by mode, all cpus',
+                   [('_total', {'mode': mode}, int(ticks) / clk_tck)
+                    for mode, ticks in zip(EXPORT_CPU_MODES, record['cpu'])])
+    _export_family(lines, 'context_switches', 'counter', 'context switches, all cpus',
+                   [('_total', {}, int(record['sys'][0]))])
+    _export_family(lines, 'procs_running', 'gauge', 'runnable tasks', [('', {}, int(record['sys'][2]))])
+    _export_family(lines, 'procs_blocked', 'gauge', 'tasks blocked on I/O', [('', {}, int(record['sys'][3]))])
+    _export_family(lines, 'pressure_io_stalled_seconds', 'counter', 'PSI io stall time',
+                   [('_total', {'kind': kind}, int(usec) / 1e6) for kind, usec in zip(('some', 'full'), record['psi_io'])])
+    _export_family(lines, 'load1', 'gauge', '1 minute load average',
+                   [('', {}, float(pinfo.get_loadavg().split()[0]))])
+    return '\n'.join(lines) + '\n'
+
+
+def _export_publish(exporter):
+    ''' swap in a freshly rendered page, one reference assignment '''
+    exporter['page'] = (exporter['fio'] + exporter['host'] + '# EOF\n').encode()
+
+
+def _export_host_loop(exporter, sampler, interval_s):
+    ''' refresh the host families every interval_s until stopped '''
+    pinfo = _export_pinfo()
+    try:
+        while not exporter['stop'].is_set():
+            exporter['host'] = export_host_render(sampler)
+            _export_publish(exporter)
+            exporter['stop'].wait(interval_s)
+    finally:
+        pinfo.close_sampler(sampler)
+
+
+# @decoratorSoSchönen
+def export_start(bind=EXPORT_BIND, port=EXPORT_PORT, interval_s=EXPORT_HOST_S, devices=None):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» export_start
+    [ Arbeite   ─» serve OpenMetrics on http://bind:port/metrics from daemon
+    [              threads, host counters refreshed every interval_s
+    [ Antworter ─» exporter dict, export_fio() updates it, export_stop() ends it
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • port    ─» 0 picks a free one, see exporter['port']
+    [ • devices ─» disk names to export, default whole non-loop disks
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    import http.server
+
+    class _ExportHandler(http.server.BaseHTTPRequestHandler):
+        ''' GET /metrics hands out the pre-rendered page, nothing is computed here '''
+
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            page = self.server.exporter['page']
+            self.send_response(200)
+            self.send_header('Content-Type', EXPORT_CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, *args):
+            pass
+
+    pinfo = _export_pinfo()
+    exporter = {'fio': '', 'host': '', 'page': b'# EOF\n', 'stop': threading.Event()}
+    server = http.server.ThreadingHTTPServer((bind, port), _ExportHandler)
+    server.daemon_threads = True
+    server.exporter = exporter
+    sampler = pinfo.open_sampler('export', os.devnull, devices=devices, ring=16)
+    exporter['host'] = export_host_render(sampler)
+    _export_publish(exporter)
+    exporter.update(server=server, port=server.server_address[1], threads=[
+        threading.Thread(target=server.serve_forever, name='export-http', daemon=True),
+        threading.Thread(target=_export_host_loop, args=(exporter, sampler, interval_s), name='export-host', daemon=True),
+    ])
+    for thread in exporter['threads']:
+        thread.start()
+    return exporter
+
+
+def export_fio(exporter, figures, snap):
+    ''' monitor hook, re-render the fio families & publish '''
+    exporter['fio'] = export_fio_render(figures, snap)
+    _export_publish(exporter)
+
+
+def export_stop(exporter):
+    ''' stop serving & sampling '''
+    exporter['stop'].set()
+    exporter['server'].shutdown()
+    exporter['server'].server_close()
+
+# @decoratorSoSchönen
+def func_j2_environment(searchpath="./"):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» func_j2_environment
+    [ Arbeite   ─» one jinja2 Environment per template dir for the process,
+    [              templates compile once & stay cached (no reload stat calls)
+    [ Antworter ─» jinja2.Environment
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    import jinja2
+    searchpath = os.path.abspath(searchpath)
+    j2_env = J2_ENVIRONMENTS.get(searchpath)
+    if j2_env is None:
+        j2_loader = jinja2.FileSystemLoader(searchpath=searchpath)
+        j2_env = jinja2.Environment(loader=j2_loader, auto_reload=False, keep_trailing_newline=True)
+        J2_ENVIRONMENTS[searchpath] = j2_env
+    return j2_env
+
+
+# @decoratorSoSchönen
+def func_j2_render(file_j2=None,file_wr=None,j2_vars=None):
     '''
     [───────────────────────────────────────────────────────────────────────────]
     [ Artikel   ─» func_j2_render
@@ -93,7 +1034,8 @@ def func_j2_render(file_j2=None,file_wr=None):
     [───────────────────────────────────────────────────────────────────────────]
     [ Eingabe
     [ • file_j2 ─» filename for incoming template
-    [ • file_wr ─» filename for render output
+    [ • file_wr ─» filename for render output, None prints it
+    [ • j2_vars ─» template variables, eg: {'BENCH_IO_ENGINE': 'io_uring'}
     [───────────────────────────────────────────────────────────────────────────]
     [ Antwort
     [ • resp_code ─» return the execit code from rendering process
@@ -102,52 +1044,580 @@ def func_j2_render(file_j2=None,file_wr=None):
     [ https://jinja.palletsprojects.com/en/stable/api/#jinja2.FileSystemLoader
     [───────────────────────────────────────────────────────────────────────────]
     '''
+    import jinja2
+    start = time.monotonic()
+    try:
+        template = func_j2_environment(os.path.dirname(file_j2) or "./").get_template(os.path.basename(file_j2))
+        outputText = template.render(j2_vars or {})
+    except jinja2.TemplateError as err:
+        print('ERROR:', err, file=sys.stderr)
+        return 1, time.monotonic() - start
+
+    if file_wr:
+        with open(file_wr, 'w') as f:
+            f.write(outputText)
+    else:
+        print(outputText)
+    return 0, time.monotonic() - start
+
+
+# @decoratorSoSchönen
+def func_j2_matrix(file_j2, matrix, out_dir=J2_RENDER_OUT, j2_vars=None):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» func_j2_matrix
+    [ Arbeite   ─» render one file per point of a parameter sweep matrix in one
+    [              pass, skipping outputs whose template & vars are unchanged
+    [ Antworter ─» render stats
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • file_j2 ─» template, eg: conf/bench-fio/perfio-storbench.bpar.full.ini.j2
+    [ • matrix  ─» {axis: [values]}, axis from J2_MATRIX_VARS or a raw
+    [              template var name, expanded as a cartesian product
+    [ • out_dir ─» output dir, holds J2_MANIFEST of input digests
+    [ • j2_vars ─» fixed template vars for every output
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Antwort
+    [ • resp_written ─» outputs (re)rendered
+    [ • resp_skipped ─» outputs left alone, inputs unchanged
+    [ • resp_time    ─» return the total time required for rendering
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    start = time.monotonic()
+    j2_env = func_j2_environment(os.path.dirname(file_j2) or "./")
+    name_j2 = os.path.basename(file_j2)
+    template = j2_env.get_template(name_j2)
+    source, _, _ = j2_env.loader.get_source(j2_env, name_j2)
+    template_digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
 
-    j2_loader = jinja2.FileSystemLoader(searchpath="./")
-    j2_env = jinja2.Environment(loader=j2_loader)
-    template = templateEnv.get_template(file_j2)
-    outputText = template.render()
+    stem, ext = os.path.splitext(name_j2[:-3] if name_j2.endswith('.j2') else name_j2)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, J2_MANIFEST)
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
 
-    print(outputText)
+    axes = list(matrix)
+    resp_written = resp_skipped = 0
+    for point in itertools.product(*(matrix[axis] for axis in axes)):
+        point_vars = dict(j2_vars or {})
+        point_vars.update((J2_MATRIX_VARS.get(axis, axis), str(value)) for axis, value in zip(axes, point))
+        # eg: perfio-storbench.bpar.full.engine-io_uring.mode-randread.iodepth-32.ini
+        label = '.'.join(f"{axis}-{re.sub(r'[^A-Za-z0-9_-]+', '_', str(value)).strip('_')}"
+                         for axis, value in zip(axes, point))
+        name_wr = f"{stem}.{label}{ext}" if label else f"{stem}{ext}"
+        digest = hashlib.sha256((template_digest + json.dumps(point_vars, sort_keys=True)).encode('utf-8')).hexdigest()
 
+        file_wr = os.path.join(out_dir, name_wr)
+        if manifest.get(name_wr) == digest and os.path.exists(file_wr):
+            resp_skipped += 1
+            continue
+        with open(file_wr, 'w') as f:
+            f.write(template.render(point_vars))
+        manifest[name_wr] = digest
+        resp_written += 1
 
+    if resp_written:
+        with open(manifest_path + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(manifest_path + '.tmp', manifest_path)
+    return resp_written, resp_skipped, time.monotonic() - start
 
-if __name__ == '__main__':
-    ''' DEBUG: echo args if passed to script '''
-    print(sys.argv)
+
+# @decoratorSoSchönen
+def parse_duration(text):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» parse_duration
+    [ Arbeite   ─» fio style duration to seconds, eg: 300, 300s, 30m, 16h
+    [ Antworter ─» seconds, float
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    text = str(text).strip().lower()
+    unit = text[-1] if text and text[-1] in PLAN_DURATION_UNITS else 's'
+    try:
+        return float(text.rstrip(''.join(PLAN_DURATION_UNITS))) * PLAN_DURATION_UNITS[unit]
+    except ValueError:
+        raise SystemExit(f"ERROR: bad duration {text!r}, eg: 300s, 30m, 16h")
+
+
+def plan_matrix(matrix):
+    ''' PLAN_MATRIX w/ the given axes on top, every axis needs at least one value '''
+    matrix = dict(PLAN_MATRIX, **matrix)
+    empty = [axis for axis, values in matrix.items() if not values]
+    if empty:
+        raise SystemExit(f"ERROR: empty --matrix axis: {', '.join(empty)}")
+    return matrix
+
+
+# @decoratorSoSchönen
+def plan_estimate(matrix, runtime_s=PLAN_RUNTIME_S, overhead_s=PLAN_OVERHEAD_S, workers=1):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» plan_estimate
+    [ Arbeite   ─» wall time of the full grid before anything runs
+    [ Antworter ─» (points, seconds)
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • matrix  ─» {axis: [values]}, axes as PLAN_MATRIX
+    [ • workers ─» targets run concurrently by the scheduler, one job each
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    matrix = plan_matrix(matrix)
+    points = 1
+    for values in matrix.values():
+        points *= len(values)
+    targets = len(matrix['target'])
+    waves = -(-targets // max(1, min(workers, targets)))
+    return points, points // targets * waves * (runtime_s + overhead_s)
+
+
+# @decoratorSoSchönen
+def plan_knee(sampled):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» plan_knee
+    [ Arbeite   ─» locate the interesting points of one iodepth x numjobs plane
+    [ Antworter ─» dict of (iodepth, numjobs) keys
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • sampled ─» {(iodepth, numjobs): {'iops', 'bw', 'lat_mean_ns'}}
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Antwort
+    [ • best       ─» highest iops
+    [ • saturation ─» least outstanding I/O w/in PLAN_PLATEAU of the best
+    [ • knee       ─» highest iops per latency, past it added queueing buys
+    [                 latency faster than throughput
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    if not sampled:
+        return {}
+    best = max(sampled, key=lambda k: sampled[k]['iops'])
+    peak = sampled[best]['iops']
+    plateau = [k for k in sampled if sampled[k]['iops'] >= PLAN_PLATEAU * peak]
+    saturation = min(plateau, key=lambda k: (k[0] * k[1], k))
+    knee = max(sampled, key=lambda k: sampled[k]['iops'] / max(sampled[k]['lat_mean_ns'], 1.0))
+    return {'best': best, 'saturation': saturation, 'knee': knee}
+
+
+# @decoratorSoSchönen
+def plan_adaptive(iodepths, numjobs, measure, budget_runs):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» plan_adaptive
+    [ Arbeite   ─» sample an iodepth x numjobs plane coarse first (every other
+    [              value, ends kept), then refine around the plateau & knee
+    [              until nothing new is next to them or the budget is spent
+    [ Antworter ─» (sampled, knee)
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • iodepths, numjobs ─» sorted axis values
+    [ • measure           ─» callable(iodepth, numjobs) -> figures dict or None
+    [ • budget_runs       ─» max fio runs for this plane
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Antwort
+    [ • sampled ─» {(iodepth, numjobs): figures}
+    [ • knee    ─» plan_knee(sampled)
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    sampled = {}
+    tried = set()
+
+    def coarse(values):
+        if not values:
+            return []
+        keep = list(range(0, len(values), 2))
+        return keep if keep[-1] == len(values) - 1 else keep + [len(values) - 1]
+
+    # Coarse pass, smallest total depth first so a tight budget still spans the plane
+    queue_ij = sorted(((i, j) for i in coarse(iodepths) for j in coarse(numjobs)),
+                      key=lambda ij: (iodepths[ij[0]] * numjobs[ij[1]], ij))
+    while queue_ij and len(tried) < budget_runs:
+        for i, j in queue_ij:
+            if len(tried) >= budget_runs:
+                break
+            tried.add((i, j))
+            figures = measure(iodepths[i], numjobs[j])
+            if figures:
+                sampled[(iodepths[i], numjobs[j])] = figures
+
+        knee = plan_knee(sampled)
+        focus = {(iodepths.index(qd), numjobs.index(nj)) for qd, nj in knee.values()}
+        queue_ij = sorted({(fi + di, fj + dj)
+                           for fi, fj in focus
+                           for di in (-1, 0, 1) for dj in (-1, 0, 1)
+                           if 0 <= fi + di < len(iodepths) and 0 <= fj + dj < len(numjobs)} - tried,
+                          key=lambda ij: min(abs(ij[0] - fi) + abs(ij[1] - fj) for fi, fj in focus))
+    return sampled, plan_knee(sampled)
+
+
+# @decoratorSoSchönen
+def fio_measure(point, out_dir=PLAN_OUTPUT, runtime_s=PLAN_RUNTIME_S, fio_bin='fio', fio_opt=None):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» fio_measure
+    [ Arbeite   ─» run one sweep point & read back its figures, the log lands
+    [              in bench-fio layout: <out>/<target>-<engine>/<bs>/<mode>-<qd>-<nj>.json
+    [ Antworter ─» figures dict, None on failure
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • point   ─» {'engine', 'mode', 'iodepth', 'numjobs', 'bs', 'target'}
+    [ • fio_opt ─» extra fio options, eg: ['--direct=1']
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    import subprocess
+    # Engine is a plan axis too, w/o it in the path the engines overwrite each other's logs
+    log_dir = os.path.join(out_dir, f"{os.path.basename(point['target'].rstrip('/'))}-{point['engine']}",
+                           str(point['bs']))
+    os.makedirs(log_dir, exist_ok=True)
+    log_file = os.path.join(log_dir, f"{point['mode']}-{point['iodepth']}-{point['numjobs']}.json")
+    exec_opt = [f"--name={point['mode']}",
+                f"--filename={point['target']}",
+                f"--ioengine={point['engine']}",
+                f"--rw={point['mode']}",
+                f"--bs={point['bs']}",
+                f"--iodepth={point['iodepth']}",
+                f"--numjobs={point['numjobs']}",
+                f"--runtime={int(runtime_s)}",
+                '--time_based',
+                '--group_reporting',
+                '--output-format=json',
+                f"--output={log_file}"] + list(fio_opt or [])
+    ret_exec_code, _, _ = proc_vollstreckerin([fio_bin], exec_opt, stdout=subprocess.DEVNULL)
+    if ret_exec_code != 0 or not os.path.exists(log_file):
+        print(f"WARN: fio failed ({ret_exec_code}) for {log_file}", file=sys.stderr)
+        return None
+
+    with open(log_file, 'r') as f:
+        docs, _ = fio_json_feed(f.read())
+    figures = {'iops': 0.0, 'bw': 0.0, 'lat_mean_ns': 0.0}
+    ios = 0
+    for job in (docs[-1].get('jobs', []) if docs else []):
+        for direction in ('read', 'write', 'trim'):
+            io = job.get(direction, {})
+            figures['iops'] += io.get('iops', 0)
+            figures['bw'] += io.get('bw_bytes', io.get('bw', 0) * 1024)
+            figures['lat_mean_ns'] += io.get('lat_ns', {}).get('mean', 0) * io.get('total_ios', 0)
+            ios += io.get('total_ios', 0)
+    figures['lat_mean_ns'] = figures['lat_mean_ns'] / ios if ios else 0.0
+    return figures
+
+
+# @decoratorSoSchönen
+def proc_planner(matrix, budget_s, measure, runtime_s=PLAN_RUNTIME_S, overhead_s=PLAN_OVERHEAD_S,
+                 workers=1, emit=print):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» proc_planner
+    [ Arbeite   ─» split a time budget over every engine/mode/bs/target plane &
+    [              run plan_adaptive() on each, targets concurrently (each one
+    [              exclusive, same as the scheduler)
+    [ Antworter ─» list of per-plane summaries
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • matrix   ─» {axis: [values]}, missing axes from PLAN_MATRIX
+    [ • budget_s ─» total seconds allowed, None runs the full grid; too small
+    [               for one run per plane is an error, never an overrun
+    [ • measure  ─» callable(point) -> figures, eg: fio_measure
+    [ • workers  ─» targets measured at once
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Antwort
+    [ • summaries ─» {'engine', 'mode', 'bs', 'target', 'runs', 'best',
+    [                 'saturation', 'knee', 'figures'}
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    import concurrent.futures
+    matrix = plan_matrix(matrix)
+    iodepths = sorted(int(v) for v in matrix['iodepth'])
+    numjobs = sorted(int(v) for v in matrix['numjobs'])
+    planes = list(itertools.product(matrix['engine'], matrix['mode'], matrix['bs'], matrix['target']))
+    targets = len(matrix['target'])
+    lanes = max(1, min(workers, targets))
+    per_run = runtime_s + overhead_s
+    full = len(iodepths) * len(numjobs)
+    # A lane runs its targets' planes back to back, the busiest lane has to fit the budget
+    lane_planes = -(-targets // lanes) * (len(planes) // targets)
+    budget_runs = full if budget_s is None else int(budget_s // per_run) // lane_planes
+    if not budget_runs:
+        raise SystemExit(f"ERROR: budget {budget_s:.0f}s fits {int(budget_s // per_run)} runs of {per_run:.0f}s "
+                         f"per lane, its {lane_planes} planes need at least {lane_planes * per_run:.0f}s")
+    budget_runs = min(budget_runs, full)
+
+    def run_target(target):
+        summaries = []
+        for engine, mode, bs, plane_target in planes:
+            if plane_target != target:
+                continue
+            point = {'engine': engine, 'mode': mode, 'bs': bs, 'target': target}
+            sampled, knee = plan_adaptive(iodepths, numjobs,
+                                          lambda qd, nj: measure(dict(point, iodepth=qd, numjobs=nj)),
+                                          budget_runs)
+            summary = dict(point, runs=len(sampled), **{k: list(v) for k, v in knee.items()})
+            summary['figures'] = {k: sampled[v] for k, v in knee.items()}
+            summaries.append(summary)
+            emit(f"{engine} {mode} {bs} {target}: {len(sampled)}/{full} runs, "
+                 f"best={summary.get('best')} saturation={summary.get('saturation')} knee={summary.get('knee')}")
+        return summaries
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=lanes) as pool:
+        return [summary for per_target in pool.map(run_target, matrix['target']) for summary in per_target]
+
+
+def _parse_assignments(items, split=False):
+    ''' ['k=v', ...] cli values to a dict, w/ split the value is a comma list '''
+    assigned = {}
+    for item in items or []:
+        key, sep, value = item.partition('=')
+        if not sep or not key:
+            raise SystemExit(f"ERROR: expected KEY=VALUE, got {item!r}")
+        assigned[key.strip()] = [v.strip() for v in value.split(',') if v.strip()] if split else value
+    return assigned
+
+
+def parse_args(argv=None):
+    ''' cli options, w/o any the preflight below is all that runs '''
+    parser = argparse.ArgumentParser(description='PerfIO-StorBench: bench, plot, analyze, report')
+
+    parser.add_argument('--monitor',
+                        action='store_true',
+                        help='Run fio_cmd (or --attach) & watch its status-interval snapshots live. [default: off]')
+
+    parser.add_argument('--attach',
+                        type=str,
+                        default=None,
+                        help="Monitor an already running fio: '-' for stdin or its --output file. [default: unset]")
+
+    parser.add_argument('--attach-pid',
+                        type=int,
+                        default=None,
+                        help='Pid of the attached fio, signalled on abort. [default: unset]')
+
+    parser.add_argument('--export',
+                        type=str,
+                        default=None,
+                        help=f"Serve OpenMetrics at [BIND:]PORT/metrics, live fio figures w/ --monitor plus host counters; alone it serves host counters until Ctrl-C, eg: --export {EXPORT_PORT}. [default: unset]")
+
+    parser.add_argument('--abort',
+                        action='append',
+                        default=[],
+                        help=f"Abort condition, repeatable, eg: clat_p99_ns>5e6, bw_drop>0.5; figures: {', '.join(MONITOR_FIGURES)}. [default: none]")
+
+    parser.add_argument('--schedule',
+                        type=str,
+                        default=None,
+                        help='fio job file to run section by section through the scheduler. [default: unset]')
+
+    parser.add_argument('--fresh',
+                        action='store_true',
+                        help='Run every --schedule job again, ignoring the completion log of an interrupted sweep. [default: off]')
+
+    parser.add_argument('--jobs',
+                        type=str,
+                        default=None,
+                        help='Jobs list file of [section] lines, eg: fio.jobs/perfio.raw.jobs. [default: every section]')
+
+    parser.add_argument('--workers',
+                        type=int,
+                        default=SCHED_WORKERS,
+                        help='Max fio jobs running at once. [default: %(default)s]')
+
+    parser.add_argument('--stonewall',
+                        choices=SCHED_STONEWALL,
+                        default='target',
+                        help='Wait scope of jobs w/o stonewall=1, which always waits for every earlier job. '
+                             '[default: %(default)s]')
+
+    parser.add_argument('--log-dir',
+                        type=str,
+                        default=os.environ.get('PERFIO_LOG_DIR', SCHED_LOG_DIR),
+                        help='Where fio json logs & the completion log go, PERFIO_LOG_DIR overrides the default. [default: %(default)s]')
+
+    parser.add_argument('--dry-run',
+                        action='store_true',
+                        help='Print the schedule waves or the sweep estimate & exit. [default: off]')
+
+    parser.add_argument('--plan',
+                        action='store_true',
+                        help='Adaptive iodepth x numjobs sweep over the --matrix axes. [default: off]')
+
+    parser.add_argument('--budget',
+                        type=str,
+                        default=None,
+                        help='Wall time allowed for --plan, eg: 90m, 8h. [default: full grid]')
+
+    parser.add_argument('--runtime',
+                        type=str,
+                        default=str(PLAN_RUNTIME_S),
+                        help='fio runtime per sweep point. [default: %(default)s]')
+
+    parser.add_argument('--plan-out',
+                        type=str,
+                        default=PLAN_OUTPUT,
+                        help='Output dir, bench-fio layout <target>-<engine>/<bs>/<mode>-<qd>-<nj>.json. [default: %(default)s]')
+
+    parser.add_argument('--render',
+                        type=str,
+                        default=None,
+                        help='jinja2 template to render across the --matrix sweep. [default: unset]')
+
+    parser.add_argument('--matrix',
+                        action='append',
+                        default=[],
+                        help=f"Sweep axis, repeatable, AXIS=v1,v2; axes: {', '.join(J2_MATRIX_VARS)} or any template var. [default: none]")
+
+    parser.add_argument('--set',
+                        action='append',
+                        default=[],
+                        help='Fixed template var for every output, repeatable, VAR=value. [default: none]')
+
+    parser.add_argument('--render-out',
+                        type=str,
+                        default=J2_RENDER_OUT,
+                        help='Directory for rendered files. [default: %(default)s]')
+
+    parser.add_argument('fio_cmd',
+                        nargs=argparse.REMAINDER,
+                        help='fio command line to launch, after --')
+
+    args = parser.parse_args(argv)
+    if args.fio_cmd and args.fio_cmd[0] == '--':
+        args.fio_cmd = args.fio_cmd[1:]
+    return args
+
+
+# @decoratorSoSchönen
+def main(argv=None):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» main
+    [ Arbeite   ─» run whichever mode the cli options ask for, the preflight
+    [              when none do; perfio.py calls this for run & render
+    [ Antworter ─» None, modes end via sys.exit w/ their exit code
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • argv ─» cli options, None reads sys.argv
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    args = parse_args(argv)
+
+    exporter = None
+    if args.export:
+        export_bind, _, export_port = args.export.rpartition(':')
+        exporter = export_start(export_bind or EXPORT_BIND, int(export_port))
+        print(f"exporting on http://{export_bind or EXPORT_BIND}:{exporter['port']}/metrics")
+
+    if args.monitor:
+        import asyncio
+        if not args.fio_cmd and not args.attach:
+            raise SystemExit("ERROR: --monitor needs a fio command after -- or --attach")
+        ret_exec_code, tripped, figures, final = asyncio.run(
+            proc_monitor(args.fio_cmd, args.attach, monitor_conditions(args.abort), args.attach_pid,
+                         exporter=exporter))
+        # fio's stdout was ours in pipe mode, hand its summary on like fio would have
+        if args.fio_cmd and final is not None \
+                and not any(arg.startswith('--output=') for arg in args.fio_cmd):
+            print(json.dumps(final, indent=2))
+        sys.exit(2 if tripped else (ret_exec_code or 0))
+
+    if exporter is not None:
+        try:
+            exporter['stop'].wait()
+        except KeyboardInterrupt:
+            export_stop(exporter)
+        sys.exit(0)
+
+    if args.render:
+        resp_written, resp_skipped, resp_time = func_j2_matrix(args.render,
+                                                               _parse_assignments(args.matrix, split=True),
+                                                               args.render_out,
+                                                               _parse_assignments(args.set))
+        print(f"rendered {resp_written}, unchanged {resp_skipped}, {resp_time:.3f}s -> {args.render_out}")
+        sys.exit(0)
+
+    if args.plan:
+        matrix = _parse_assignments(args.matrix, split=True)
+        runtime_s = parse_duration(args.runtime)
+        budget_s = parse_duration(args.budget) if args.budget else None
+        points, full_s = plan_estimate(matrix, runtime_s, PLAN_OVERHEAD_S, args.workers)
+        print(f"full grid: {points} points, {full_s / 3600:.1f}h w/ {args.workers} concurrent targets")
+        if budget_s:
+            lanes = max(1, min(args.workers, len(plan_matrix(matrix)['target'])))
+            print(f"budget: {budget_s / 3600:.1f}h, ~{int(budget_s // (runtime_s + PLAN_OVERHEAD_S)) * lanes} runs")
+        if args.dry_run:
+            sys.exit(0)
+        summaries = proc_planner(matrix, budget_s,
+                                 lambda point: fio_measure(point, args.plan_out, runtime_s),
+                                 runtime_s, PLAN_OVERHEAD_S, args.workers)
+        with open(os.path.join(args.plan_out, 'perfio.plan.jsonl'), 'a') as f:
+            for summary in summaries:
+                f.write(json.dumps(summary) + '\n')
+        sys.exit(0)
+
+    if args.schedule:
+        jobs = fio_job_sections(args.schedule, args.jobs)
+        if args.dry_run:
+            for wave, names in enumerate(sched_waves(jobs, sched_dependencies(jobs, args.stonewall))):
+                print(f"wave {wave}: {' '.join(names)}")
+            sys.exit(0)
+        os.makedirs(args.log_dir, exist_ok=True)
+        resume_log = os.path.join(args.log_dir, f"perfio.{socket.gethostname()}.sched.jsonl")
+        sweep = sched_sweep(args.schedule)
+        if args.fresh:
+            sched_forget(resume_log, sweep)
+        skipped = sched_completed(resume_log, sweep)
+        if skipped:
+            print(f"resuming [{args.schedule}], {len(skipped)} jobs already done per [{resume_log}], --fresh reruns them")
+        entries = proc_manager(jobs, fio_runner(args.schedule, args.log_dir), args.workers, args.stonewall, resume_log,
+                               sweep=sweep)
+        for entry in entries:
+            usage = entry.get('usage', {})
+            print(f"{entry['job']}: returncode={entry['ret_exec_code']} zeit={entry['ret_exec_zeit']}s "
+                  f"cpu={usage.get('cpu_pct', 0)}% maxrss={usage.get('maxrss_kb', 0)}KB "
+                  f"nivcsw={usage.get('nivcsw', 0)}")
+        sys.exit(max([abs(e['ret_exec_code']) if e['ret_exec_code'] is not None else 1 for e in entries] or [0]))
 
     '''
     Since we're not building an exec object'ifier, we'll use dirty arg-seq tedium
     '''
     preflight_bin = "date"
-    preflight_opt = "+'%Y.%m.%d %H:%M:%S UTC%z'"
-    preflight_cmd = [("%s" %preflight_bin),("%s" %preflight_opt)]
+    preflight_opt = "+%Y.%m.%d %H:%M:%S UTC%z"
+    preflight_out = bytearray()
+    preflight_err = bytearray()
 
     try:
-        completed = subprocess.run(preflight_cmd,
-                                   shell=True,
-                                   stdout=subprocess.PIPE,
-                                   stderr=subprocess.PIPE,
-                                   )
-    except subprocess.CalledProcessError as err:
+        ret_exec_code, ret_exec_zeit, ret_exec_usage = proc_vollstreckerin([preflight_bin],
+                                                                           [preflight_opt],
+                                                                           stdout=preflight_out.extend,
+                                                                           stderr=preflight_err.extend,
+                                                                           )
+    except OSError as err:
         print('ERROR:', err)
 
     else:
-        print('returncode:', completed.returncode)
+        print('returncode:', ret_exec_code)
         print('DEBUG: {} bytes in stdout: {!r}'.format(
-            len(completed.stdout),
-            completed.stdout.decode('utf-8'))
+            len(preflight_out),
+            preflight_out.decode('utf-8'))
             )
         print('DEBUG: {} bytes in stderr: {!r}'.format(
-            len(completed.stderr),
-            completed.stderr.decode('utf-8'))
+            len(preflight_err),
+            preflight_err.decode('utf-8'))
             )
+        print('DEBUG: zeit {:.4f}s, usage {}'.format(ret_exec_zeit, ret_exec_usage))
 
 
     #jinja2 --outfile
     #perfio-storbench.bench-fio.baseline-validate.j2conv.ini perfio-storbench.bench-fio.baseline-validate.ini.j2
 
 
+if __name__ == '__main__':
+    ''' DEBUG: echo args if passed to script '''
+    print(sys.argv)
+    main()
+
+
 '''
 [───────────────────────────────────────────────────────────────────────────────]
 [ docstring formatting elements copy/paste
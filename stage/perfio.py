@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+'''
+[───────────────────────────────────────────────────────────────────────────────]
+[ Purpose    ─» Unified PerfIO-StorBench cli: render, run, analyze, compare,
+[               plot, sysinfo; each subcommand imports only what it needs
+[ Filename   ─» perfio.py
+[ Project    ─» PerfIO-StorBench
+[ Author     ─» Eva Winterschön
+[ License    ─» BSD-6-Clause
+[ Date-INIT  ─» 2024-0802
+[ Date-RMOD  ─» 2024-1110
+[ Version    ─» 0.4.6
+[───────────────────────────────────────────────────────────────────────────────]
+[ Requires
+[ ╰───────────» python3
+[           ╰─» whatever the subcommand's script requires, loaded on first use
+[───────────────────────────────────────────────────────────────────────────────]
+[ Usage
+[ ╰───────────» ln -s $PWD/stage/perfio.py ~/.local/bin/perfio
+[           ╰─» perfio analyze log -r --report-html output.report
+[           ╰─» perfio daemon &  export PERFIO_DAEMON=$(perfio daemon --path)
+[           ╰─» perfio bench --repeat 10 --baseline perfio.startup.json
+[───────────────────────────────────────────────────────────────────────────────]
+[ References
+[ ╰───────────» ⌄unten⌄
+[ • PEP-008  ─» [PEP-8 Style Guide](https://peps.python.org/pep-0008/)
+[ • PEP-257  ─» [Docstrings Ref](https://peps.python.org/pep-0257/)
+[ • PEP-324  ─» [SubProcess Module](https://peps.python.org/pep-0324/)
+[ • Doc-Sig  ─» [Py Docs](https://www.python.org/community/sigs/current/doc-sig/)
+[───────────────────────────────────────────────────────────────────────────────]
+'''
+# Erforderlich Modules
+# Startup is the whole point here, everything else is imported by the function using it
+import os
+import sys
+
+# Validate src-layout import adjustment
+if not __package__:
+    '''
+    Check if using 'src-layout' hierarchy method of app development, if so then
+    adjust import path to ensure functionality if called via 'src/package'
+    https://packaging.python.org/en/latest/discussions/src-layout-vs-flat-layout/
+    '''
+    package_source_path = os.path.dirname(os.path.dirname(__file__))
+    sys.path.insert(0, package_source_path)
+
+# Scripts behind the subcommands, key -> (sys.modules name, path under stage/)
+PERFIO_HOME = os.path.dirname(os.path.realpath(__file__))
+PERFIO_SCRIPTS = {
+    'bpar': ('perfio_storbench_bpar', 'perfio-storbench.bpar.full.py'),
+    'analyze': ('perfio_storbench_analyze', os.path.join('conf', 'basic-fio', 'perfio-storbench.analyze.py')),
+    'pinfo': ('pinfo', os.path.join('proc', 'pinfo.py')),
+}
+
+# Daemon: scripts & heavy modules imported once up front, every request runs in a fork of it
+PERFIO_DAEMON_ENV = 'PERFIO_DAEMON'
+PERFIO_DAEMON_SOCKET = os.path.join(os.environ.get('XDG_RUNTIME_DIR') or '/tmp', f"perfio-{os.getuid()}.sock")
+PERFIO_DAEMON_PRELOAD = ('analyze', 'bpar')
+PERFIO_DAEMON_IMPORTS = ('asyncio', 'concurrent.futures', 'configparser', 'http.server', 'jinja2', 'psutil',
+                         'sqlite3', 'subprocess')
+PERFIO_DAEMON_BACKLOG = 64
+PERFIO_DAEMON_READ = 1 << 16
+
+# Startup benchmark, every subcommand's --help in a fresh interpreter
+PERFIO_BENCH_REPEAT = 5
+PERFIO_BENCH_ARGS = {'sysinfo': ['sample', '--help']}
+PERFIO_BENCH_TOLERANCE = 0.20
+# Below this a change is noise, whatever the ratio
+PERFIO_BENCH_MIN_DELTA_MS = 10.0
+PERFIO_BENCH_MIN_DELTA_KB = 2048
+
+
+def perfio_load(name):
+    ''' one of PERFIO_SCRIPTS as a module, executed on first use & kept in sys.modules '''
+    module_name, script = PERFIO_SCRIPTS[name]
+    if module_name not in sys.modules:
+        import importlib.util
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(PERFIO_HOME, script))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[module_name]
+
+
+def cmd_render(argv):
+    ''' perfio render TEMPLATE --matrix AXIS=v1,v2 ... ─» bpar --render '''
+    return perfio_load('bpar').main(argv if argv[:1] and argv[0].startswith('-') else ['--render'] + argv)
+
+
+def cmd_run(argv):
+    ''' perfio run --schedule|--plan|--monitor ... ─» bpar '''
+    return perfio_load('bpar').main(argv)
+
+
+def cmd_analyze(argv):
+    ''' perfio analyze [LOGS] ... ─» the analyzer as is '''
+    return perfio_load('analyze').main(argv)
+
+
+def cmd_compare(argv):
+    ''' perfio compare BASELINE RUN ... gates RUN on BASELINE, anything else (eg: --diff) passes through '''
+    if len(argv) >= 2 and not argv[0].startswith('-') and not argv[1].startswith('-'):
+        argv = [argv[1], '--baseline', argv[0]] + argv[2:]
+    return perfio_load('analyze').main(argv)
+
+
+def cmd_plot(argv):
+    ''' perfio plot [LOGS] ... ─» analyzer --plot, every chart kind unless --plot is given '''
+    if not any(arg == '--plot' or arg.startswith('--plot=') for arg in argv):
+        argv = ['--plot', 'all'] + argv
+    return perfio_load('analyze').main(argv)
+
+
+def cmd_sysinfo(argv):
+    ''' perfio sysinfo PID | sample ... | tree PID ─» proc/pinfo.py, it only has a __main__ '''
+    import runpy
+    module_name, script = PERFIO_SCRIPTS['pinfo']
+    sys.argv = [module_name] + argv
+    runpy.run_path(os.path.join(PERFIO_HOME, script), run_name='__main__')
+
+
+def _exit_code(err):
+    ''' SystemExit to an exit status the way the interpreter does it, messages go to stderr '''
+    if err.code is None:
+        return 0
+    if isinstance(err.code, int):
+        return err.code
+    print(err.code, file=sys.stderr)
+    return 1
+
+
+# @decoratorSoSchönen
+def daemon_call(path, argv):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» daemon_call
+    [ Arbeite   ─» hand argv, cwd, env & our stdin/stdout/stderr fds to the
+    [              daemon, wait for the forked run to finish; Ctrl-C is
+    [              forwarded to it as SIGINT
+    [ Antworter ─» exit status, None when no daemon answers (run in-process)
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • path ─» daemon socket, eg: $PERFIO_DAEMON
+    [ • argv ─» subcommand & its options
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    import json
+    import signal
+    import socket
+
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(path)
+    except OSError:
+        conn.close()
+        return None
+
+    with conn:
+        request = json.dumps({'argv': argv, 'cwd': os.getcwd(), 'env': dict(os.environ)}).encode() + b'\n'
+        socket.send_fds(conn, [request], [0, 1, 2])
+        reader = conn.makefile('rb')
+        started = reader.readline()
+        if not started:
+            return None
+        pid = json.loads(started)['pid']
+        while True:
+            try:
+                done = reader.readline()
+                break
+            except KeyboardInterrupt:
+                os.kill(pid, signal.SIGINT)
+    return json.loads(done)['exit'] if done else 1
+
+
+def _daemon_recv(conn):
+    ''' one request line & the three fds sent along w/ it '''
+    import json
+    import socket
+    buf, fds, _, _ = socket.recv_fds(conn, PERFIO_DAEMON_READ, 3)
+    while buf and not buf.endswith(b'\n'):
+        chunk = conn.recv(PERFIO_DAEMON_READ)
+        if not chunk:
+            break
+        buf += chunk
+    return (json.loads(buf) if buf.endswith(b'\n') else None), fds
+
+
+def _daemon_child(conn, request, fds):
+    ''' forked per request: take over the client's fds, cwd & env, run it, report the exit status '''
+    import json
+    import signal
+    import traceback
+
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    sys.stdout.reconfigure(line_buffering=os.isatty(1))
+    os.chdir(request['cwd'])
+    os.environ.clear()
+    os.environ.update(request['env'])
+    sys.argv = [sys.argv[0]] + request['argv']
+    conn.sendall(json.dumps({'pid': os.getpid()}).encode() + b'\n')
+
+    try:
+        code = perfio_dispatch(request['argv']) or 0
+    except SystemExit as err:
+        code = _exit_code(err)
+    except KeyboardInterrupt:
+        code = 130
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    conn.sendall(json.dumps({'exit': code}).encode() + b'\n')
+
+
+# @decoratorSoSchönen
+def daemon_serve(path=PERFIO_DAEMON_SOCKET, preload=PERFIO_DAEMON_PRELOAD):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» daemon_serve
+    [ Arbeite   ─» import the scripts & heavy modules once, then serve runs on
+    [              a unix socket (0600, same uid only), each one in a fork so
+    [              no state leaks between them & copy-on-write shares imports
+    [ Antworter ─» None, returns on --stop, SIGTERM or Ctrl-C
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • path    ─» socket path, clients find it in $PERFIO_DAEMON
+    [ • preload ─» PERFIO_SCRIPTS keys to import up front
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    import importlib
+    import json
+    import signal
+    import socket
+    import struct
+
+    for name in preload:
+        perfio_load(name)
+    for name in PERFIO_DAEMON_IMPORTS:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        raise SystemExit(f"ERROR: a daemon already serves {path}")
+    except (FileNotFoundError, ConnectionRefusedError):
+        if os.path.exists(path):
+            os.unlink(path)
+    finally:
+        probe.close()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(umask)
+    server.listen(PERFIO_DAEMON_BACKLOG)
+
+    # Finished runs are reaped by the kernel, each child puts SIGCHLD back for its own subprocesses
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"perfio daemon {os.getpid()} serving {path}", file=sys.stderr)
+    creds = struct.Struct('3i')
+    try:
+        while True:
+            conn, _ = server.accept()
+            _, uid, _ = creds.unpack(conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, creds.size))
+            if uid != os.getuid():
+                conn.close()
+                continue
+            request, fds = _daemon_recv(conn)
+            if request is None or request.get('stop'):
+                for fd in fds:
+                    os.close(fd)
+                conn.close()
+                if request is None:
+                    continue
+                break
+            sys.stdout.flush()
+            sys.stderr.flush()
+            if os.fork() == 0:
+                server.close()
+                try:
+                    _daemon_child(conn, request, fds)
+                finally:
+                    os._exit(0)
+            for fd in fds:
+                os.close(fd)
+            conn.close()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.unlink(path)
+
+
+def daemon_stop(path=PERFIO_DAEMON_SOCKET):
+    ''' ask the daemon at path to exit, False when none is listening '''
+    import json
+    import socket
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(path)
+    except OSError:
+        return False
+    with conn:
+        conn.sendall(json.dumps({'stop': True}).encode() + b'\n')
+        conn.recv(1)
+    return True
+
+
+def cmd_daemon(argv):
+    ''' perfio daemon [--socket PATH] [--stop|--path] '''
+    import argparse
+    parser = argparse.ArgumentParser(prog='perfio daemon',
+                                     description=f"Keep the scripts imported & serve runs from forks; clients use it when ${PERFIO_DAEMON_ENV} names its socket.")
+    parser.add_argument('--socket',
+                        type=str,
+                        default=os.environ.get(PERFIO_DAEMON_ENV, PERFIO_DAEMON_SOCKET),
+                        help=f"Unix socket path, ${PERFIO_DAEMON_ENV} overrides the default. [default: %(default)s]")
+    parser.add_argument('--stop',
+                        action='store_true',
+                        help='Stop the daemon on --socket. [default: off]')
+    parser.add_argument('--path',
+                        action='store_true',
+                        help=f"Print the socket path, for export {PERFIO_DAEMON_ENV}=... [default: off]")
+    args = parser.parse_args(argv)
+
+    if args.path:
+        print(args.socket)
+        return 0
+    if args.stop:
+        if not daemon_stop(args.socket):
+            raise SystemExit(f"ERROR: no daemon on {args.socket}")
+        return 0
+    daemon_serve(args.socket)
+    return 0
+
+
+# @decoratorSoSchönen
+def perfio_bench(commands, repeat=PERFIO_BENCH_REPEAT, daemon=None):
+    '''
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Artikel   ─» perfio_bench
+    [ Arbeite   ─» time `perfio <cmd> --help` in a fresh interpreter, repeat
+    [              times each, + a bare `python -c pass` for the floor
+    [ Antworter ─» list of result dicts, in commands order
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Eingabe
+    [ • commands ─» subcommand names
+    [ • daemon   ─» socket path, runs go through that daemon instead
+    [───────────────────────────────────────────────────────────────────────────]
+    [ Antwort
+    [ • results ─» {'command', 'mode', 'ms', 'min_ms', 'rss_kb'}, ms is the
+    [              median wall time, rss_kb the max rss of the process started
+    [              (the client alone w/ a daemon)
+    [───────────────────────────────────────────────────────────────────────────]
+    '''
+    import statistics
+    import time
+
+    env = dict(os.environ)
+    env.pop(PERFIO_DAEMON_ENV, None)
+    if daemon:
+        env[PERFIO_DAEMON_ENV] = daemon
+    devnull = [(os.POSIX_SPAWN_OPEN, fd, os.devnull, os.O_RDWR, 0) for fd in (0, 1, 2)]
+
+    results = []
+    for command in ['python'] + list(commands):
+        if command == 'python':
+            argv = [sys.executable, '-c', 'pass']
+        else:
+            argv = [sys.executable, os.path.realpath(__file__), command] + PERFIO_BENCH_ARGS.get(command, ['--help'])
+        times = []
+        rss = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            pid = os.posix_spawn(sys.executable, argv, env, file_actions=devnull)
+            _, status, rusage = os.wait4(pid, 0)
+            times.append((time.perf_counter() - start) * 1000)
+            rss.append(rusage.ru_maxrss)
+            if os.waitstatus_to_exitcode(status) != 0:
+                raise SystemExit(f"ERROR: {' '.join(argv[1:])} exited {os.waitstatus_to_exitcode(status)}")
+        results.append({'command': command, 'mode': 'daemon' if daemon and command != 'python' else 'direct',
+                        'ms': round(statistics.median(times), 2), 'min_ms': round(min(times), 2),
+                        'rss_kb': max(rss)})
+    return results
+
+
+def bench_compare(results, baseline, tolerance=PERFIO_BENCH_TOLERANCE):
+    ''' results vs a saved run, a row regresses when ms or rss_kb grew past tolerance & the noise floor '''
+    saved = {(row['command'], row['mode']): row for row in baseline}
+    regressions = []
+    for row in results:
+        base = saved.get((row['command'], row['mode']))
+        if base is None:
+            continue
+        for field, floor in (('ms', PERFIO_BENCH_MIN_DELTA_MS), ('rss_kb', PERFIO_BENCH_MIN_DELTA_KB)):
+            if row[field] > base[field] * (1 + tolerance) and row[field] - base[field] > floor:
+                regressions.append(f"{row['command']} ({row['mode']}) {field}: {base[field]} -> {row[field]}")
+    return regressions
+
+
+def cmd_bench(argv):
+    ''' perfio bench [--repeat N] [--daemon] [--save PATH] [--baseline PATH] '''
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(prog='perfio bench',
+                                     description='Startup time & max RSS per subcommand, each run in a fresh interpreter.')
+    parser.add_argument('commands',
+                        nargs='*',
+                        default=[name for name in PERFIO_COMMANDS if name not in ('daemon', 'bench')],
+                        help='Subcommands to time. [default: all]')
+    parser.add_argument('--repeat',
+                        type=int,
+                        default=PERFIO_BENCH_REPEAT,
+                        help='Runs per subcommand, the median is reported. [default: %(default)s]')
+    parser.add_argument('--daemon',
+                        type=str,
+                        nargs='?',
+                        const=os.environ.get(PERFIO_DAEMON_ENV, PERFIO_DAEMON_SOCKET),
+                        default=None,
+                        help='Also time each subcommand through the daemon on this socket. [default: unset]')
+    parser.add_argument('--save',
+                        type=str,
+                        default=None,
+                        help='Write the results as json, eg: for a later --baseline. [default: unset]')
+    parser.add_argument('--baseline',
+                        type=str,
+                        default=None,
+                        help='Saved results to compare against, exit 1 on a regression. [default: unset]')
+    parser.add_argument('--tolerance',
+                        type=float,
+                        default=PERFIO_BENCH_TOLERANCE,
+                        help='Relative growth allowed vs --baseline. [default: %(default)s]')
+    args = parser.parse_args(argv)
+
+    unknown = set(args.commands) - set(PERFIO_COMMANDS)
+    if unknown:
+        raise SystemExit(f"ERROR: unknown subcommand: {', '.join(sorted(unknown))}")
+    results = perfio_bench(args.commands, args.repeat)
+    if args.daemon:
+        results += perfio_bench(args.commands, args.repeat, args.daemon)[1:]
+
+    print(f"{'command':10s} {'mode':7s} {'ms':>9s} {'min_ms':>9s} {'rss_kb':>9s}")
+    for row in results:
+        print(f"{row['command']:10s} {row['mode']:7s} {row['ms']:9.2f} {row['min_ms']:9.2f} {row['rss_kb']:9d}")
+
+    if args.save:
+        with open(args.save + '.tmp', 'w') as f:
+            json.dump(results, f, indent=1)
+        os.replace(args.save + '.tmp', args.save)
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = bench_compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION: {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+# Subcommand -> (handler, one-line help), `daemon` & `bench` always run in-process
+PERFIO_COMMANDS = {
+    'render': (cmd_render, 'render a jinja2 template across a --matrix sweep'),
+    'run': (cmd_run, 'schedule, plan or monitor fio runs'),
+    'analyze': (cmd_analyze, 'parse, aggregate & report fio json logs'),
+    'compare': (cmd_compare, 'BASELINE RUN regression gate, or --diff RUN RUN...'),
+    'plot': (cmd_plot, 'render charts from fio json logs'),
+    'sysinfo': (cmd_sysinfo, 'host & process info, sampling (proc/pinfo.py)'),
+    'daemon': (cmd_daemon, f"keep everything imported, runs go through it w/ ${PERFIO_DAEMON_ENV} set"),
+    'bench': (cmd_bench, 'startup time & RSS per subcommand'),
+}
+PERFIO_LOCAL = ('daemon', 'bench')
+
+
+def perfio_usage():
+    ''' subcommand list, no argparse needed for it '''
+    print("usage: perfio COMMAND [ARGS...]   ('perfio COMMAND --help' for its options)\n")
+    for name, (_, help_text) in PERFIO_COMMANDS.items():
+        print(f"  {name:9s} {help_text}")
+
+
+def perfio_dispatch(argv):
+    ''' run argv[0]'s handler w/ the rest, in this process '''
+    return PERFIO_COMMANDS[argv[0]][0](argv[1:])
+
+
+def main(argv=None):
+    ''' perfio entry point, through the daemon when $PERFIO_DAEMON names a live one '''
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        perfio_usage()
+        return 0
+    if argv[0] not in PERFIO_COMMANDS:
+        perfio_usage()
+        return 2
+
+    path = os.environ.get(PERFIO_DAEMON_ENV)
+    if path and argv[0] not in PERFIO_LOCAL:
+        code = daemon_call(path, argv)
+        if code is not None:
+            return code
+    return perfio_dispatch(argv)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
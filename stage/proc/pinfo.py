@@ -3,11 +3,67 @@
 import sys
 import re
 import os
+import json
+import time
+import argparse
 import psutil
-from colorama import Fore, Style
 
 PKG_NAME = "pinfo"
-PKG_VERSION = "0.1"
+PKG_VERSION = "0.2"
+
+# Sampler: sources re-read w/ pread on fds held open for the whole run; its own
+# cpu measured on a single core vm: ~0.4% of a core at 100ms & ~0.7% at 50ms w/o
+# --pid, ~0.65% & ~1% w/ 16 fio threads; each tick costs ~0.2-0.4ms whatever
+# the period (cold caches), so faster ticks blow the 1% budget, 20ms is ~1.6%
+SAMPLE_INTERVAL_MS = 100
+SAMPLE_MIN_INTERVAL_MS = 50
+SAMPLE_RING = 4096          # records held before a flush to disk
+SAMPLE_READ = 1 << 16       # pread size, grown if a source is bigger
+SAMPLE_MAGIC = b"PIOSMP01"
+SAMPLE_DISK_FIELDS = 11     # reads, merged, sectors, ms, writes, merged, sectors, ms, inflight, io_ms, weighted_ms
+SAMPLE_CPU_FIELDS = 10      # /proc/stat cpu: user nice system idle iowait irq softirq steal guest guest_nice
+SAMPLE_SYS_FIELDS = 4       # ctxt, intr total, procs_running, procs_blocked
+SAMPLE_TASK_FIELDS = 5      # pid, tid, utime, stime (ticks), last cpu
+SAMPLE_TASK_SLOTS = 64      # task columns per record, threads found later fill free ones
+SAMPLE_RESCAN_MS = 1000     # fio forks its job workers after start, look for new threads this often
+SAMPLE_SLOW_MS = 100        # /proc/interrupts & /proc/pressure/io re-read this often, not every tick
+SAMPLE_SKIP_DISKS = ("loop", "ram", "zram")
+
+# Snapshot: one record per thread of a process tree, counters diff cleanly; numpy
+# dtype fields, numpy itself is only imported by the sampler & snapshot code so
+# the one-shot report starts fast
+SNAP_FIELDS = [
+    ("pid", "i4"),
+    ("tid", "i4"),
+    ("starttime", "u8"),        # clock ticks since boot, a reused tid gets a new one
+    ("comm", "U16"),
+    ("state", "U1"),
+    ("utime", "u8"),            # clock ticks
+    ("stime", "u8"),
+    ("vcsw", "u8"),             # voluntary context switches
+    ("nvcsw", "u8"),            # involuntary, ie: preempted
+    ("read_bytes", "u8"),       # /proc/<pid>/task/<tid>/io, storage layer
+    ("write_bytes", "u8"),
+    ("rchar", "u8"),            # syscall layer, includes page cache hits
+    ("wchar", "u8"),
+    ("last_cpu", "i4"),
+    ("ncpus_allowed", "i4"),
+    ("cpus_allowed", "U32"),    # Cpus_allowed_list, eg: 0-7,16
+]
+SNAP_COUNTERS = ("utime", "stime", "vcsw", "nvcsw", "read_bytes", "write_bytes", "rchar", "wchar")
+SNAP_DELTA_FIELDS = [
+    ("pid", "i4"),
+    ("tid", "i4"),
+    ("comm", "U16"),
+    ("state", "U1"),
+    ("cpu_pct", "f4"),
+    ("vcsw", "u8"),
+    ("nvcsw", "u8"),
+    ("read_bytes", "u8"),
+    ("write_bytes", "u8"),
+    ("last_cpu", "i4"),
+]
+SNAP_BUSY_PCT = 90.0
 
 proc_stat = {
     "D": "D: Uninterruptible sleep",
@@ -21,79 +77,494 @@ proc_stat = {
     "Z": "Z: Zombie"
 }
 
+def read_proc(path):
+    with open(path) as f:
+        return f.read()
+
 def get_comm(pid):
-    f = open("/proc/{}/comm".format(pid))
-    return f.read().rstrip()
+    return read_proc("/proc/{}/comm".format(pid)).rstrip()
 
 def get_cmd(pid):
-    f = open("/proc/{}/cmdline".format(pid))
-    output = f.read().rstrip()
+    output = read_proc("/proc/{}/cmdline".format(pid)).rstrip()
     if len(output) < 1:
         return "none"
     else:
         return output
 
 def get_stat(pid):
-    stat = []
-    f = open("/proc/{}/stat".format(pid))
-    output = f.read().split()
-
-    name = ""
-    name_flag = False
-    for entry in output:
-        if name_flag:
-            if ")" in entry:
-                name_flag = False
-                name += " "
-                name += entry
-                stat.append(name)
-                continue
-            name += " "
-            name += entry
-            continue
-        if "(" in entry:
-            if ")" in entry:
-                stat.append(entry)
-                continue
-            name_flag = True
-            name += entry
-            continue
-        stat.append(entry)
-
-    return stat
+    # [pid, (comm), state, ppid, ...] w/ comm kept whole, it may hold spaces & ')'
+    head, _, tail = read_proc("/proc/{}/stat".format(pid)).rpartition(")")
+    pid_s, _, comm = head.partition(" (")
+    return [pid_s, "({})".format(comm)] + tail.split()
 
-def get_env():
-    f = open("/proc/{}/environ".format(pid))
-    output = f.read().replace("\0", "\n").rstrip()
+def get_env(pid):
+    output = read_proc("/proc/{}/environ".format(pid)).replace("\0", "\n").rstrip()
     if len(output) < 1:
         return "No output"
     else:
         return output
 
 def get_loadavg():
-    f = open("/proc/loadavg")
-    output = f.read().split()[0:3]
+    output = read_proc("/proc/loadavg").split()[0:3]
     return " ".join(output)
 
 def get_cpu_model():
-    f = open("/proc/cpuinfo")
-    for line in f:
-        if "model name" in line:
-            return line.split(":")[1].strip()
+    with open("/proc/cpuinfo") as f:
+        for line in f:
+            if "model name" in line:
+                return line.split(":")[1].strip()
 
 def get_utpime():
-    f = open("/proc/uptime")
-    output = f.read().split(" ")[0]
+    output = read_proc("/proc/uptime").split(" ")[0]
     days = float(output) / 60 / 60 / 24
     hours = float(output) / 60 / 60 % 24
     minutes = float(output) / 60 % 60
     return "{} Day(s), {} Hour(s), {} Minute(s)".format(int(days), int(hours), int(minutes))
 
 def get_kernel():
-    f = open("/proc/version")
-    output = f.read().split(" ")[2]
+    output = read_proc("/proc/version").split(" ")[2]
     return output
 
+# Sampler ----------------------------------------------------------------------
+
+def pid_alive(pid):
+    # signal 0 is one syscall, cheaper than psutil per tick
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def fio_tasks(pid):
+    # every thread of pid & its descendants, eg: fio's per-job worker processes
+    procs = [psutil.Process(pid)]
+    try:
+        procs += procs[0].children(recursive=True)
+    except psutil.Error:
+        pass
+    tasks = []
+    for proc in procs:
+        try:
+            tids = sorted(int(tid) for tid in os.listdir("/proc/{}/task".format(proc.pid)))
+        except OSError:
+            continue
+        tasks += [(proc.pid, tid) for tid in tids]
+    return tasks
+
+def sample_dtype(ndisk, ncpu, ntask):
+    import numpy as np
+    return np.dtype([
+        ("t_ns", "i8"),                                     # CLOCK_MONOTONIC
+        ("disk", "u8", (ndisk, SAMPLE_DISK_FIELDS)),
+        ("cpu", "u8", (SAMPLE_CPU_FIELDS,)),
+        ("sys", "u8", (SAMPLE_SYS_FIELDS,)),
+        ("irq", "u8", (ncpu,)),                             # interrupts per cpu, all lines summed
+        ("psi_io", "u8", (2,)),                             # some, full total stall usec
+        ("task", "i8", (ntask, SAMPLE_TASK_FIELDS)),        # pid & tid 0 == free slot
+    ])
+
+def _pread(sampler, name):
+    fd = sampler["fds"].get(name)
+    if fd is None:
+        return b""
+    size = sampler["sizes"][name]
+    data = os.pread(fd, size, 0)
+    while len(data) == size:
+        size *= 2
+        sampler["sizes"][name] = size
+        data = os.pread(fd, size, 0)
+    return data
+
+def _open_task(sampler, ptid):
+    try:
+        sampler["fds"][ptid] = os.open("/proc/{}/task/{}/stat".format(*ptid), os.O_RDONLY)
+    except OSError:
+        return False
+    sampler["sizes"][ptid] = 1024
+    return True
+
+def rescan_tasks(sampler):
+    # exited threads give their slot back, new ones take the first free slot
+    try:
+        current = set(fio_tasks(sampler["pid"]))
+    except psutil.Error:
+        return
+    tasks = sampler["tasks"]
+    for slot, ptid in enumerate(tasks):
+        if ptid is not None and ptid not in current:
+            os.close(sampler["fds"].pop(ptid))
+            del sampler["sizes"][ptid]
+            tasks[slot] = None
+    known = set(tasks)
+    for ptid in sorted(current - known):
+        if None not in tasks:
+            sampler["unsampled"].add(ptid)
+        elif _open_task(sampler, ptid):
+            tasks[tasks.index(None)] = ptid
+
+def open_sampler(job, path, pid=None, devices=None, interval_ms=SAMPLE_INTERVAL_MS, ring=SAMPLE_RING,
+                 task_slots=SAMPLE_TASK_SLOTS):
+    import numpy as np
+    fds = {}
+    for name in ("diskstats", "stat", "interrupts", "pressure/io"):
+        try:
+            fds[name] = os.open("/proc/" + name, os.O_RDONLY)
+        except OSError:
+            # eg: no PSI on older kernels, that column stays 0
+            pass
+    sampler = {"fds": fds, "sizes": dict.fromkeys(fds, SAMPLE_READ)}
+
+    lines = [line.split()[2] for line in _pread(sampler, "diskstats").decode().splitlines()]
+    if devices:
+        disks = [d for d in lines if d in devices]
+    else:
+        # whole disks only, partitions & loop/ram devices just add parse time
+        whole = set(os.listdir("/sys/block")) if os.path.isdir("/sys/block") else set(lines)
+        disks = [d for d in lines if d in whole and not d.startswith(SAMPLE_SKIP_DISKS)]
+    ncpu = len(_pread(sampler, "interrupts").split(b"\n", 1)[0].split())
+
+    tasks = [ptid for ptid in (fio_tasks(pid) if pid else []) if _open_task(sampler, ptid)]
+    nslot = max(task_slots, len(tasks)) if pid else 0
+    tasks += [None] * (nslot - len(tasks))
+
+    dtype = sample_dtype(len(disks), ncpu, nslot)
+    ring = np.zeros(ring, dtype=dtype)
+    sampler.update(
+        job=job,
+        pid=pid,
+        disks=disks,
+        disk_index={d: i for i, d in enumerate(disks)},
+        tasks=tasks,
+        ncpu=ncpu,
+        ring=ring,
+        words=ring.view(np.int64).reshape(len(ring), -1),
+        disk_names={d.encode() for d in disks},
+        disk_lines=[(lines.index(d), d.encode()) for d in disks],
+        disk_words=len(disks) * SAMPLE_DISK_FIELDS,
+        irq_at=1 + len(disks) * SAMPLE_DISK_FIELDS + SAMPLE_CPU_FIELDS + SAMPLE_SYS_FIELDS,
+        last=[0] * (dtype.itemsize // 8),
+        count=0,
+        missed=0,
+        unsampled=set(),
+        rescan_ns=SAMPLE_RESCAN_MS * 1000000,
+        rescanned=time.monotonic_ns(),
+        slow_ns=SAMPLE_SLOW_MS * 1000000,
+        slowed=0,
+        interval_ns=max(interval_ms, SAMPLE_MIN_INTERVAL_MS) * 1000000,
+        out=open(path, "wb"),
+    )
+    # Clock anchors taken back to back, monotonic t_ns -> epoch ms like fio's timestamp_ms
+    header = {
+        "job": job,
+        "pid": pid,
+        "host": os.uname().nodename,
+        "epoch_ns": time.time_ns(),
+        "monotonic_ns": time.monotonic_ns(),
+        "clk_tck": os.sysconf("SC_CLK_TCK"),
+        "interval_ms": sampler["interval_ns"] // 1000000,
+        "disks": disks,
+        "tasks": [ptid for ptid in tasks if ptid],     # at start, records carry each slot's pid & tid
+        "dtype": dtype.descr,
+    }
+    blob = json.dumps(header).encode()
+    sampler["out"].write(SAMPLE_MAGIC + len(blob).to_bytes(4, "little") + blob)
+    return sampler
+
+def take_sample(sampler):
+    # every field is 8 bytes wide, so a record is one row of int64 words & the
+    # whole sample lands w/ a single assignment instead of per-field numpy writes
+    words = [time.monotonic_ns()]
+
+    # only the wanted disks' lines are split, found by their line number at open
+    disk = []
+    lines = _pread(sampler, "diskstats").split(b"\n")
+    for at, name in sampler["disk_lines"]:
+        parts = lines[at].split(None, 3 + SAMPLE_DISK_FIELDS) if at < len(lines) else ()
+        if len(parts) > 3 and parts[2] == name:
+            disk += parts[3:3 + SAMPLE_DISK_FIELDS]
+    if len(disk) != sampler["disk_words"]:
+        # devices added or removed, look the lines up again
+        wanted = sampler["disk_names"]
+        disk = []
+        for line in lines:
+            parts = line.split(None, 3 + SAMPLE_DISK_FIELDS)
+            if len(parts) > 3 and parts[2] in wanted:
+                disk += parts[3:3 + SAMPLE_DISK_FIELDS]
+    if len(disk) != sampler["disk_words"]:
+        # device went away mid run, keep the slot layout
+        disk = sampler["last"][1:1 + sampler["disk_words"]]
+    words += map(int, disk)
+
+    stat = _pread(sampler, "stat")
+    words += map(int, stat[:stat.index(b"\n")].split()[1:1 + SAMPLE_CPU_FIELDS])
+    for key in (b"\nctxt ", b"\nintr ", b"\nprocs_running ", b"\nprocs_blocked "):
+        at = stat.find(key)
+        if at < 0:
+            words.append(0)
+            continue
+        at += len(key)
+        end = min((pos for pos in (stat.find(b" ", at), stat.find(b"\n", at)) if pos >= 0), default=len(stat))
+        words.append(int(stat[at:end] or 0))
+
+    # interrupts, psi & fio threads are refreshed every SAMPLE_SLOW_MS, records in
+    # between repeat the last values: interrupts is the priciest read, thread
+    # utime/stime only move in 1/clk_tck steps & each thread is one more pread
+    if words[0] - sampler["slowed"] >= sampler["slow_ns"]:
+        sampler["slowed"] = words[0]
+        _sample_slow(sampler, words)
+    else:
+        words += sampler["last"][sampler["irq_at"]:]
+
+    sampler["words"][sampler["count"]] = words
+    sampler["last"] = words
+    sampler["count"] += 1
+    if sampler["count"] == len(sampler["ring"]):
+        flush_sampler(sampler)
+
+def _sample_slow(sampler, words):
+    import numpy as np
+    ncpu = sampler["ncpu"]
+    irq = []
+    for line in _pread(sampler, "interrupts").split(b"\n")[1:]:
+        cols = line.split(None, ncpu + 1)[1:ncpu + 1]
+        if len(cols) == ncpu and cols[-1].isdigit():
+            irq += cols
+    words += np.array(irq, dtype=np.int64).reshape(-1, ncpu).sum(axis=0).tolist() if irq else [0] * ncpu
+
+    psi = _pread(sampler, "pressure/io").split(b"\n")
+    for line in (psi + [b"", b""])[:2]:
+        words.append(int(line.rsplit(b"total=", 1)[1]) if b"total=" in line else 0)
+
+    if sampler["pid"] and words[0] - sampler["rescanned"] >= sampler["rescan_ns"]:
+        rescan_tasks(sampler)
+        sampler["rescanned"] = words[0]
+    base = len(words)
+    for i, ptid in enumerate(sampler["tasks"]):
+        if ptid is None:
+            words += [0] * SAMPLE_TASK_FIELDS
+            continue
+        try:
+            data = _pread(sampler, ptid)
+            fields = data[data.rindex(b")") + 2:].split()
+            words += (ptid[0], ptid[1], int(fields[11]), int(fields[12]), int(fields[36]))
+        except (OSError, ValueError, IndexError):
+            # thread exited, keep its last values until the next rescan frees the slot
+            at = base + i * SAMPLE_TASK_FIELDS
+            last = sampler["last"][at:at + SAMPLE_TASK_FIELDS]
+            words += last if last[1] == ptid[1] else [ptid[0], ptid[1], 0, 0, -1]
+
+def flush_sampler(sampler):
+    if sampler["count"]:
+        sampler["out"].write(sampler["ring"][:sampler["count"]].tobytes())
+        sampler["out"].flush()
+        sampler["count"] = 0
+
+def close_sampler(sampler):
+    flush_sampler(sampler)
+    sampler["out"].close()
+    for fd in sampler["fds"].values():
+        os.close(fd)
+
+def run_sampler(sampler, duration_s=None):
+    # fixed cadence off the monotonic clock, late ticks are skipped not bunched up
+    interval = sampler["interval_ns"]
+    start = time.monotonic_ns()
+    deadline = start + duration_s * 1e9 if duration_s else None
+    tick = start
+    cpu0 = os.times()
+    samples = 0
+    try:
+        while True:
+            take_sample(sampler)
+            samples += 1
+            if sampler["pid"] and not pid_alive(sampler["pid"]):
+                break
+            tick += interval
+            now = time.monotonic_ns()
+            if now > tick:
+                skipped = (now - tick) // interval + 1
+                sampler["missed"] += skipped
+                tick += skipped * interval
+            if deadline and tick > deadline:
+                break
+            time.sleep((tick - now) / 1e9)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_sampler(sampler)
+    cpu1 = os.times()
+    wall = (time.monotonic_ns() - start) / 1e9
+    busy = (cpu1.user - cpu0.user) + (cpu1.system - cpu0.system)
+    return samples, sampler["missed"], 100.0 * busy / wall if wall else 0.0
+
+def load_samples(path):
+    # header dict + records memmap'd from the sampler file
+    import numpy as np
+    with open(path, "rb") as f:
+        if f.read(len(SAMPLE_MAGIC)) != SAMPLE_MAGIC:
+            die("Not a pinfo sample file: {}".format(path))
+        size = int.from_bytes(f.read(4), "little")
+        header = json.loads(f.read(size))
+    dtype = np.dtype([tuple(field) if len(field) == 2 else (field[0], field[1], tuple(field[2]))
+                      for field in header["dtype"]])
+    offset = len(SAMPLE_MAGIC) + 4 + size
+    nrec = (os.path.getsize(path) - offset) // dtype.itemsize
+    records = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(nrec,)) if nrec else np.zeros(0, dtype)
+    return header, records
+
+def samples_epoch_ms(header, records):
+    # same clock as fio's timestamp_ms, per-interval log t_ms + job start epoch lines up
+    return (records["t_ns"] - header["monotonic_ns"] + header["epoch_ns"]) // 1000000
+
+def sample_main(argv):
+    parser = argparse.ArgumentParser(prog="pinfo sample",
+                                     description="Sample /proc alongside a benchmark into a binary file")
+    parser.add_argument("--pid", type=int, default=None,
+                        help="fio pid, its threads & children are sampled, stops when it exits")
+    parser.add_argument("--job", type=str, default=None,
+                        help="fio job name tagged in the file [default: comm of --pid]")
+    parser.add_argument("--interval-ms", type=int, default=SAMPLE_INTERVAL_MS,
+                        help="sample period, min {}; costs ~0.4%% of a core at 100, ~0.7%% at 50 plus "
+                             "a bit per fio thread, the sampler reports its own share [default: %(default)s]".format(
+                                 SAMPLE_MIN_INTERVAL_MS))
+    parser.add_argument("--devices", type=str, default=None,
+                        help="comma list of /proc/diskstats names [default: whole disks]")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="seconds to run w/o --pid [default: until interrupted]")
+    parser.add_argument("--task-slots", type=int, default=SAMPLE_TASK_SLOTS,
+                        help="fio threads sampled at once, rescanned every {}ms [default: %(default)s]".format(
+                            SAMPLE_RESCAN_MS))
+    parser.add_argument("--out", type=str, default=None,
+                        help="output file [default: pinfo.<job>.samples]")
+    args = parser.parse_args(argv)
+
+    if args.interval_ms < SAMPLE_MIN_INTERVAL_MS:
+        print("[WARN] --interval-ms {} is below the {}ms floor, sampling every {}ms".format(
+            args.interval_ms, SAMPLE_MIN_INTERVAL_MS, SAMPLE_MIN_INTERVAL_MS))
+    if args.pid:
+        check_pid(args.pid)
+    job = args.job or (get_comm(args.pid) if args.pid else "host")
+    out = args.out or "pinfo.{}.samples".format(job)
+    devices = set(args.devices.split(",")) if args.devices else None
+    sampler = open_sampler(job, out, args.pid, devices, args.interval_ms, task_slots=args.task_slots)
+    samples, missed, cpu_pct = run_sampler(sampler, args.duration)
+    print("{} samples ({} missed ticks) -> {}, sampler cpu {:.2f}% of a core".format(samples, missed, out, cpu_pct))
+    if sampler["unsampled"]:
+        print("{} threads found w/ every task slot taken, not sampled, raise --task-slots".format(
+            len(sampler["unsampled"])))
+
+# Snapshot ---------------------------------------------------------------------
+
+def _cpu_list_count(text):
+    count = 0
+    for part in text.split(","):
+        lo, _, hi = part.partition("-")
+        if lo:
+            count += int(hi or lo) - int(lo) + 1
+    return count
+
+def _read_task(pid, tid):
+    base = "/proc/{}/task/{}/".format(pid, tid)
+    head, _, tail = read_proc(base + "stat").rpartition(")")
+    fields = tail.split()
+    status = read_proc(base + "status")
+    vcsw = int(status[status.index("voluntary_ctxt_switches:") + 24:].split(None, 1)[0])
+    nvcsw = int(status[status.index("nonvoluntary_ctxt_switches:") + 27:].split(None, 1)[0])
+    allowed = status[status.index("Cpus_allowed_list:") + 18:].split(None, 1)[0]
+    try:
+        io = read_proc(base + "io").split()
+        rchar, wchar, read_bytes, write_bytes = int(io[1]), int(io[3]), int(io[9]), int(io[11])
+    except (OSError, IndexError):
+        # io needs ptrace access, not root & not ours reads 0
+        rchar = wchar = read_bytes = write_bytes = 0
+    return (pid, tid, int(fields[19]), head.partition(" (")[2], fields[0], int(fields[11]), int(fields[12]),
+            vcsw, nvcsw, read_bytes, write_bytes, rchar, wchar, int(fields[36]), _cpu_list_count(allowed), allowed)
+
+def snapshot_tree(pid, children=True):
+    # every thread of pid (& its descendant processes) in one pass -> SNAP_FIELDS records
+    import numpy as np
+    pids = [pid]
+    if children:
+        try:
+            pids += [child.pid for child in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            pass
+    rows = []
+    for ppid in pids:
+        try:
+            tids = os.listdir("/proc/{}/task".format(ppid))
+        except OSError:
+            continue
+        for tid in tids:
+            try:
+                rows.append(_read_task(ppid, int(tid)))
+            except (OSError, ValueError, IndexError):
+                # exited between listdir & read
+                continue
+    snap = np.array(rows, dtype=SNAP_FIELDS)
+    return snap[np.argsort(snap["tid"], kind="stable")]
+
+def snapshot_delta(prev, cur, dt_s, clk_tck=None):
+    # per thread change between two snapshots, threads in both only; a tid reused by
+    # a new thread in between has another starttime so it isn't diffed against the old one
+    import numpy as np
+    clk_tck = clk_tck or os.sysconf("SC_CLK_TCK")
+    key = ["tid", "starttime"]
+    _, pi, ci = np.intersect1d(prev[key], cur[key], assume_unique=True, return_indices=True)
+    before, after = prev[pi], cur[ci]
+    delta = np.zeros(len(after), dtype=SNAP_DELTA_FIELDS)
+    for name in ("pid", "tid", "comm", "state", "last_cpu"):
+        delta[name] = after[name]
+    # signed & clamped, a counter going back (eg: io reads 0 once ptrace access goes) isn't a 2^64 jump
+    for name in ("vcsw", "nvcsw", "read_bytes", "write_bytes"):
+        delta[name] = np.maximum(after[name].astype(np.int64) - before[name].astype(np.int64), 0)
+    ticks = np.maximum((after["utime"] + after["stime"]).astype(np.int64)
+                       - (before["utime"] + before["stime"]).astype(np.int64), 0)
+    delta["cpu_pct"] = 100.0 * ticks / clk_tck / dt_s if dt_s else 0.0
+    return delta
+
+def busy_threads(delta, cpu_pct=SNAP_BUSY_PCT):
+    # CPU bound workers, the load generator not the device is the limit
+    return delta[delta["cpu_pct"] >= cpu_pct]
+
+def blocked_threads(snap):
+    # D-state, uninterruptible sleep, usually stuck in the block layer
+    return snap[snap["state"] == "D"]
+
+def tree_main(argv):
+    parser = argparse.ArgumentParser(prog="pinfo tree",
+                                     description="Per second view of every fio process & thread under a pid")
+    parser.add_argument("pid", type=int, help="fio parent pid")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between snapshots [default: %(default)s]")
+    parser.add_argument("--count", type=int, default=0, help="snapshots to take, 0 until the pid exits [default: %(default)s]")
+    args = parser.parse_args(argv)
+
+    check_pid(args.pid)
+    prev = snapshot_tree(args.pid)
+    t_prev = time.monotonic()
+    taken = 0
+    while pid_alive(args.pid) and (not args.count or taken < args.count):
+        time.sleep(args.interval)
+        cur = snapshot_tree(args.pid)
+        now = time.monotonic()
+        delta = snapshot_delta(prev, cur, now - t_prev)
+        prev, t_prev = cur, now
+        taken += 1
+
+        busy = busy_threads(delta)
+        blocked = blocked_threads(cur)
+        print("{} threads, cpu {:.0f}% total, busy(>={:.0f}%) {}, D-state {}, io r/w {}/{} KiB".format(
+            len(cur), delta["cpu_pct"].sum(), SNAP_BUSY_PCT, len(busy), len(blocked),
+            delta["read_bytes"].sum() >> 10, delta["write_bytes"].sum() >> 10))
+        for row in busy:
+            print("  busy  {:>7d} {:16s} {:5.1f}% cpu{} nvcsw {}".format(row["tid"], row["comm"], row["cpu_pct"], row["last_cpu"], row["nvcsw"]))
+        for row in blocked:
+            print("  Dstate {:>7d} {:16s} cpu{}".format(row["tid"], row["comm"], row["last_cpu"]))
+
+# Report -----------------------------------------------------------------------
+
 def get_cpu_freq():
     return int(psutil.cpu_freq().max)
 
@@ -118,6 +589,8 @@ def die(msg):
 
 def usage():
     print("USAGE: pinfo PID")
+    print("       pinfo sample [--pid PID] [--interval-ms N] ...")
+    print("       pinfo tree PID [--interval S] [--count N]")
     print("   PID    PID number of process to inspect")
     sys.exit(0)
 
@@ -131,6 +604,16 @@ def check_pid(pid):
         die("ERORR: PID does not exist, exiting!")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "sample":
+        sample_main(sys.argv[2:])
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == "tree":
+        tree_main(sys.argv[2:])
+        sys.exit(0)
+
+    # only the report wants colors
+    from colorama import Fore, Style
+
     if not is_root():
         die("You need to run this script with root rights")
 
@@ -166,4 +649,4 @@ if __name__ == "__main__":
     print("{:25s} {:25s}".format("RSS:", stat_list[23]))
     
     print("\n{}Environment Listing for PID {}{}".format(Style.BRIGHT + Fore.RED, str(pid), Style.RESET_ALL + Fore.RESET))
-    print(get_env())
+    print(get_env(pid))